@@ -12,45 +12,67 @@
 # =========================================================================
 
 import cmd
-import json
 import logging
 import os
+from typing import Optional
 
 import click
 import requests
 import tabulate
 
+import json_backend
+
 # Import the new unified Manager class and the credentials function
+from auth import get_auth_from_env
+from cassette import get_cassette_from_env
 from manager import Manager, get_manager_credentials_from_env
+from metrics import enable_cli_metrics
+from payloads import check_compression_from_env, compressed_path, open_payload, payload_path
+from session_cache import get_session_cache_from_env
 
 
 # -----------------------------------------------------------------------------
 @click.group()
-def cli():
+@click.option(
+    "--metrics", is_flag=True, help="Print API call metrics when the command completes."
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False),
+    help="Write API call metrics at exit (.prom for Prometheus text format, JSON otherwise).",
+)
+@click.pass_context
+def cli(ctx, metrics, metrics_file):
     """Command line tool for to collect application names and tunnel performances"""
-    pass
+    enable_cli_metrics(ctx, manager, metrics, metrics_file)
 
 
 # -----------------------------------------------------------------------------
 def save_json(
-    payload: dict, filename: str = "payload", directory: str = "./output/payloads/"
+    payload: dict,
+    filename: str = "payload",
+    directory: str = "./output/payloads/",
+    compact: Optional[bool] = None,
+    compression: Optional[str] = None,
 ):
     """Save json response payload to a file
 
     Args:
         payload: JSON response payload
         filename: filename for saved files (default: "payload")
+        compact: write without indentation (default: sdwan_json_compact env variable)
+        compression: "gzip" or "xz" (default: sdwan_payload_compression env variable)
     """
 
-    filename = "".join([directory, f"{filename}.json"])
+    filename = compressed_path("".join([directory, f"{filename}.json"]), compression)
 
     if not os.path.exists(directory):
         print(f"Creating folder {directory}")
         os.makedirs(directory)  # Create the directory if it doesn't exist
 
     # Dump entire payload to file
-    with open(filename, "w") as file:
-        json.dump(payload, file, indent=4)
+    with open_payload(filename, "w") as file:
+        json_backend.dump(payload, file, compact=compact)
 
 
 # -----------------------------------------------------------------------------
@@ -66,17 +88,22 @@ def app_list():
     api_path = "/device/dpi/application-mapping"
 
     # Fetch API endpoint
+    # The raw response is saved as received while applications are streamed one by one.
+    # applications_data.json can be derived offline with:
+    #   python payloads.py derive output/payloads/approute/applications_header_data.json
     try:
-        payload = manager._api_get(api_path)
-        data = payload.get("data", [])
-        save_json(payload, "applications_header_data", "output/payloads/approute/")
-        save_json(data, "applications_data", "output/payloads/approute/")
+        applications = manager.api_stream(
+            api_path,
+            save_to=payload_path(
+                "applications_header_data", "output/payloads/approute/"
+            ),
+        )
         app_headers = ["App name", "Family", "ID"]
 
         table = list()
         cli = cmd.Cmd()
 
-        for item in data:
+        for item in applications:
             tr = [item["name"], item["family"], item["appId"]]
             table.append(tr)
 
@@ -103,15 +130,14 @@ def app_list2():
 
     # Fetch API endpoint for org name
     try:
-        payload = manager._api_get(api_path)
-        data = payload.get("data", [])
-        save_json(payload, "app_header_data", "output/payloads/approute/")
-        save_json(data, "app_data", "output/payloads/approute/")
+        applications = manager.api_stream(
+            api_path, save_to=payload_path("app_header_data", "output/payloads/approute/")
+        )
 
         table = list()
         cli = cmd.Cmd()
 
-        for item in data:
+        for item in applications:
             # print(item['name'])
             table.append(item["name"] + "(" + item["family"] + ")")
 
@@ -137,16 +163,16 @@ def app_qosmos():
 
     # Fetch API endpoint
     try:
-        payload = manager._api_get(api_path)
-        data = payload.get("data", [])
-        save_json(payload, "app_qosmos_header_data", "output/payloads/approute/")
-        save_json(data, "app_qosmos_data", "output/payloads/approute/")
+        applications = manager.api_stream(
+            api_path,
+            save_to=payload_path("app_qosmos_header_data", "output/payloads/approute/"),
+        )
         app_headers = ["App name", "Family", "ID"]
 
         table = list()
         cli = cmd.Cmd()
 
-        for item in data:
+        for item in applications:
             tr = [item["name"], item["family"], item["appId"]]
             table.append(tr)
 
@@ -444,9 +470,18 @@ if __name__ == "__main__":
     )
 
     # Create session with Cisco Catalyst SD-WAN Manager
-    print("\n--- Authenticating to SD-WAN Manager ---")
+    print("\n--- SD-WAN Manager session (login on the first API call) ---")
     host, port, user, password = get_manager_credentials_from_env()
-    manager = Manager(host, port, user, password)
+    check_compression_from_env()  # Fail early on an invalid sdwan_payload_compression
+    manager = Manager(
+        host,
+        port,
+        user,
+        password,
+        session_cache=get_session_cache_from_env(),
+        auth=get_auth_from_env(),
+        cassette=get_cassette_from_env(),
+    )
 
     # Run commands
     cli.add_command(app_list)
@@ -0,0 +1,371 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Authentication strategies for Manager
+#
+# Description:
+#   SessionAuth: JSESSIONID cookie + X-XSRF-TOKEN from /client/token
+#   JWTAuth:     POST /jwt/login (20.18+), the CSRF token comes with the
+#                access token, which is refreshed before it expires
+#   TokenAuth:   pre-issued access token (e.g. API key), no login at all
+#   AutoAuth:    JWT on 20.18+ managers, session-based login otherwise
+#
+#   Example:
+#     manager = Manager(host, port, user, password, auth=JWTAuth(token_duration=3600))
+#
+#   Environment variable read by the scripts:
+#     manager_auth=auto|session|jwt
+#
+# =========================================================================
+
+import copy
+import logging
+import os
+import sys
+from typing import Optional, Tuple
+
+from jwt import AuthenticationJWT, JWTAuthenticationError
+
+logger = logging.getLogger(__name__)
+
+# First release supporting /jwt/login
+JWT_MIN_VERSION = (20, 18)
+
+# /jwt/login answers of a manager without JWT support (endpoint absent)
+JWT_UNAVAILABLE_STATUSES = (404, 405)
+
+
+# ----------------------------------------------------------
+def jwt_unavailable(error: Optional[Exception]) -> bool:
+    """
+    True when a failed /jwt/login shows that the manager has no JWT support:
+    404/405, a redirect, or a non-JSON answer such as the HTML login page that
+    older releases serve (with status 200) for unknown paths.
+    Rejected credentials (401/403) and connection errors return False.
+    """
+    response = getattr(error, "response", None)
+    if response is None or response.status_code in (401, 403):
+        return False
+    if response.status_code in JWT_UNAVAILABLE_STATUSES or response.history:
+        return True
+    if 300 <= response.status_code < 400:
+        return True
+    return "json" not in response.headers.get("Content-Type", "").lower()
+
+
+# ----------------------------------------------------------
+def version_tuple(version: Optional[str]) -> Optional[Tuple[int, ...]]:
+    """
+    Converts "20.18.1" (or "20.18.1-li") into (20, 18, 1), None if not parsable.
+    """
+    if not version:
+        return None
+    numbers = []
+    for part in version.split("."):
+        digits = ""
+        for char in part:
+            if not char.isdigit():
+                break
+            digits += char
+        if not digits:
+            break
+        numbers.append(int(digits))
+    return tuple(numbers) or None
+
+
+# ----------------------------------------------------------
+class AuthStrategy:
+    """
+    Interface of the authentication strategies used by Manager.
+    A strategy configures manager.session (cookies/headers) so that API calls are authenticated.
+    """
+
+    name = "none"
+    uses_session_cache = False  # True if the credentials can be persisted in a SessionCache
+
+    def authenticate(self, manager) -> bool:
+        """
+        Logs in and configures manager.session. Returns True on success.
+        """
+        raise NotImplementedError
+
+    def clear(self, manager):
+        """
+        Drops the credentials rejected by SD-WAN Manager.
+        """
+
+    def reauthenticate(self, manager) -> bool:
+        """
+        Called when SD-WAN Manager rejected the credentials (expired session/token).
+        """
+        self.clear(manager)
+        return self.authenticate(manager)
+
+    def before_request(self, manager):
+        """
+        Called before every API call, e.g. to refresh a token about to expire.
+        """
+
+    def close(self):
+        """
+        Releases background resources (refresh threads).
+        """
+
+    def clone(self) -> "AuthStrategy":
+        """
+        Returns a new, unauthenticated strategy with the same settings, for another
+        Manager (e.g. another cluster node). Strategies keep per-manager login state
+        and must not be shared.
+        """
+        return copy.copy(self)
+
+
+# ----------------------------------------------------------
+class SessionAuth(AuthStrategy):
+    """
+    Session-based authentication: /j_security_check then /dataservice/client/token.
+    """
+
+    name = "session"
+    uses_session_cache = True
+
+    def authenticate(self, manager) -> bool:
+        manager._authenticate_session()
+        return bool(manager.jsessionid)
+
+    def clear(self, manager):
+        manager.session.cookies.clear()
+        manager.session.headers.pop("X-XSRF-TOKEN", None)
+        manager.jsessionid = None
+        manager.token = None
+
+
+# ----------------------------------------------------------
+class JWTAuth(AuthStrategy):
+    """
+    JWT-based authentication (20.18+): a single POST /jwt/login returns the access
+    token and the CSRF token. The access token is sent as "Authorization: Bearer"
+    and refreshed with the refresh token before it expires.
+    """
+
+    name = "jwt"
+
+    def __init__(
+        self,
+        token_duration: Optional[int] = None,
+        refresh_margin: int = 120,
+        auto_refresh: bool = False,
+    ):
+        """
+        Args:
+            token_duration (int, optional): access token duration in seconds (manager default 1800).
+            refresh_margin (int): refresh the token this many seconds before it expires.
+            auto_refresh (bool): refresh from a background thread instead of on the next API call.
+        """
+        self.token_duration = token_duration
+        self.refresh_margin = refresh_margin
+        self.auto_refresh = auto_refresh
+        self.jwt: Optional[AuthenticationJWT] = None
+        self.last_error: Optional[JWTAuthenticationError] = None  # Why the last login failed
+
+    def authenticate(self, manager, probe: bool = False) -> bool:
+        """
+        Args:
+            probe (bool): failure is expected on managers older than 20.18, do not log an error.
+        """
+        if self.jwt is None:
+            self.jwt = AuthenticationJWT(
+                manager.host,
+                manager.port,
+                manager.user,
+                manager.password,
+                timeout=manager.timeout,
+                token_duration=self.token_duration,
+                refresh_margin=self.refresh_margin,
+                session=manager.session,
+            )
+            # Refreshed tokens are written straight into the session headers
+            self.jwt.header = manager.session.headers
+
+        try:
+            self.jwt.login_jwt()
+            self.last_error = None
+        except JWTAuthenticationError as e:
+            self.last_error = e
+            if probe:
+                logger.info(f"JWT login not available: {e}")
+            else:
+                logger.error(f"JWT authentication failed: {e}")
+            return False
+
+        manager.token = self.jwt.csrf_token
+        manager.session.headers.update({"Content-Type": "application/json"})
+        manager.dataservice_base_url = f"https://{manager.host}:{manager.port}/dataservice"
+        if self.auto_refresh:
+            self.jwt.start_auto_refresh()
+        return True
+
+    def reauthenticate(self, manager) -> bool:
+        if self.jwt is None or self.jwt.jwt_token is None:
+            return self.authenticate(manager)
+        try:
+            self.jwt.refresh_jwt()  # Falls back to a password login if needed
+        except JWTAuthenticationError as e:
+            logger.error(f"JWT re-authentication failed: {e}")
+            return False
+        manager.token = self.jwt.csrf_token
+        return True
+
+    def clear(self, manager):
+        manager.session.headers.pop("Authorization", None)
+        manager.session.headers.pop("X-XSRF-TOKEN", None)
+
+    def before_request(self, manager):
+        if self.jwt is None or self.auto_refresh:
+            return
+        remaining = self.jwt.seconds_until_expiry()
+        if remaining is not None and remaining <= self.refresh_margin:
+            try:
+                self.jwt.refresh_jwt()
+                manager.token = self.jwt.csrf_token
+            except JWTAuthenticationError as e:
+                # The call goes out with the current token, a rejection triggers a re-login
+                logger.error(f"JWT refresh failed: {e}")
+
+    def close(self):
+        if self.jwt is not None:
+            self.jwt.stop_auto_refresh()
+
+    def clone(self) -> "JWTAuth":
+        return JWTAuth(self.token_duration, self.refresh_margin, self.auto_refresh)
+
+
+# ----------------------------------------------------------
+class TokenAuth(AuthStrategy):
+    """
+    Pre-issued access token (JWT or API key) sent as "Authorization: Bearer".
+    No login is performed and an expired token cannot be renewed.
+    """
+
+    name = "token"
+
+    def __init__(self, token: str, csrf_token: Optional[str] = None):
+        """
+        Args:
+            token (str): access token.
+            csrf_token (str, optional): X-XSRF-TOKEN, required by most POST/PUT/DELETE calls.
+        """
+        self.token = token
+        self.csrf_token = csrf_token
+
+    def authenticate(self, manager) -> bool:
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.token}",
+        }
+        if self.csrf_token:
+            headers["X-XSRF-TOKEN"] = self.csrf_token
+        manager.session.headers.update(headers)
+        manager.token = self.csrf_token
+        manager.dataservice_base_url = f"https://{manager.host}:{manager.port}/dataservice"
+        return True
+
+    def reauthenticate(self, manager) -> bool:
+        logger.error("Pre-issued access token rejected by SD-WAN Manager.")
+        return False
+
+
+# ----------------------------------------------------------
+class AutoAuth(AuthStrategy):
+    """
+    Uses JWT on 20.18+ managers and session-based authentication otherwise.
+
+    The manager version is known when /client/about data is cached; otherwise
+    /jwt/login is tried first and older managers, which answer 404/405, a redirect
+    or their HTML login page, fall back to a session login. Any other JWT login
+    failure (e.g. 401/403 on rejected credentials) is raised as is.
+    When a session cache is configured, session-based authentication is kept,
+    since a cached JSESSIONID avoids logging in at all.
+    """
+
+    name = "auto"
+    uses_session_cache = True
+
+    def __init__(self, token_duration: Optional[int] = None, refresh_margin: int = 120):
+        self.jwt = JWTAuth(token_duration=token_duration, refresh_margin=refresh_margin)
+        self.session = SessionAuth()
+        self.selected: Optional[AuthStrategy] = None
+
+    def authenticate(self, manager) -> bool:
+        if self.selected is not None:
+            return self.selected.authenticate(manager)
+
+        version = version_tuple((manager._about_data() or {}).get("version"))
+        if manager.session_cache is not None or (
+            version is not None and version < JWT_MIN_VERSION
+        ):
+            self.selected = self.session
+        elif version is not None:
+            self.selected = self.jwt
+        else:
+            # Unknown version: try /jwt/login, older managers do not have it
+            if self.jwt.authenticate(manager, probe=True):
+                self.selected = self.jwt
+                logger.info("Using jwt authentication.")
+                return True
+            self.jwt.clear(manager)
+            error = self.jwt.last_error
+            if not jwt_unavailable(error):
+                # Rejected credentials (401/403) or unreachable manager: a session login
+                # would fail the same way, report the JWT error instead
+                logger.error(f"JWT authentication failed: {error}")
+                raise error or JWTAuthenticationError("JWT login failed")
+            self.selected = self.session
+
+        logger.info(f"Using {self.selected.name} authentication.")
+        return self.selected.authenticate(manager)
+
+    def reauthenticate(self, manager) -> bool:
+        if self.selected is None:
+            # Still running on a session restored from the session cache
+            self.session.clear(manager)
+            return self.authenticate(manager)
+        return self.selected.reauthenticate(manager)
+
+    def clear(self, manager):
+        if self.selected is not None:
+            self.selected.clear(manager)
+
+    def before_request(self, manager):
+        if self.selected is not None:
+            self.selected.before_request(manager)
+
+    def close(self):
+        self.jwt.close()
+
+    def clone(self) -> "AutoAuth":
+        return AutoAuth(self.jwt.token_duration, self.jwt.refresh_margin)
+
+
+# ----------------------------------------------------------
+def get_auth_from_env() -> AuthStrategy:
+    """
+    Builds the authentication strategy selected by the manager_auth environment variable.
+
+      manager_auth=auto      JWT on 20.18+, session-based otherwise (default)
+      manager_auth=session   JSESSIONID + X-XSRF-TOKEN
+      manager_auth=jwt       JWT (20.18+ only)
+      manager_token=<token>  use a pre-issued access token, no login
+    """
+    token = os.environ.get("manager_token")
+    if token:
+        return TokenAuth(token, os.environ.get("manager_csrf_token"))
+
+    setting = (os.environ.get("manager_auth") or "auto").lower()
+    strategies = {"auto": AutoAuth, "session": SessionAuth, "jwt": JWTAuth}
+    if setting not in strategies:
+        print(f"Invalid manager_auth value: {setting}, expected auto, session or jwt")
+        sys.exit(1)
+    return strategies[setting]()
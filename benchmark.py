@@ -0,0 +1,432 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Scale benchmarks: collection, rendering and saving
+#
+# Description:
+#   Runs the collectors against the local mock SD-WAN Manager (mock_manager.py)
+#   at several fleet sizes, or against a recorded cassette, and measures:
+#     - wall time, API request count and peak RSS of SDWANProfileTable,
+#       SDRoutingProfileTable and ConfigGroupTable
+#     - tabulate rendering time of "device.py ls" and "approute.py app-list"
+#     - save_groups disk write throughput
+#   Every scenario runs in a fresh process, so peak RSS is per scenario.
+#
+#   Results are written as JSON. Compared with a baseline, the run fails
+#   (exit code 1) when a metric regresses by more than the threshold.
+#
+#   Example:
+#     python benchmark.py run --sizes 1000,10000 --output bench.json
+#     python benchmark.py run --sizes 1000,10000 --baseline bench.json --threshold 0.2
+#     python benchmark.py run --cassette cassettes/lab --output lab.json
+#     python benchmark.py compare bench.json new.json
+#
+# =========================================================================
+
+import contextlib
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import click
+import tabulate
+
+import json_backend
+
+# Metrics where a higher value is a regression, and where a lower value is
+HIGHER_IS_WORSE = ("wall_seconds", "api_requests", "peak_rss_mb", "render_seconds")
+LOWER_IS_WORSE = ("write_mb_per_s",)
+
+# Timing differences below this are noise, whatever the relative change
+MIN_SECONDS_DELTA = 0.05
+
+SCENARIOS = [
+    "sdwan_profile_table",
+    "sdrouting_profile_table",
+    "config_group_table",
+    "device_ls",
+    "approute_app_list",
+    "save_groups",
+]
+
+
+# -----------------------------------------------------------------------------
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# -----------------------------------------------------------------------------
+def _directory_bytes(directory: str) -> int:
+    total = 0
+    for root, _, names in os.walk(directory):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in names)
+    return total
+
+
+# -----------------------------------------------------------------------------
+@contextlib.contextmanager
+def _timed_tabulate(timings: List[float]):
+    """
+    Records the time spent in tabulate.tabulate() while the block runs.
+    """
+    original = tabulate.tabulate
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            timings.append(time.perf_counter() - start)
+
+    tabulate.tabulate = timed
+    try:
+        yield
+    finally:
+        tabulate.tabulate = original
+
+
+# -----------------------------------------------------------------------------
+def _run_collector(manager, scenario: str, workdir: str) -> Dict[str, float]:
+    """
+    Runs one scenario and returns its scenario-specific measurements.
+    """
+    import approute
+    import device
+    from config_groups import (
+        ConfigGroupTable,
+        SDRoutingProfileTable,
+        SDWANProfileTable,
+        get_max_workers_from_env,
+    )
+
+    if scenario == "sdwan_profile_table":
+        SDWANProfileTable(manager, max_workers=get_max_workers_from_env())
+    elif scenario == "sdrouting_profile_table":
+        SDRoutingProfileTable(manager, max_workers=get_max_workers_from_env())
+    elif scenario == "config_group_table":
+        ConfigGroupTable(manager, max_workers=get_max_workers_from_env())
+    elif scenario in ("device_ls", "approute_app_list"):
+        module, command = (device, device.ls) if scenario == "device_ls" else (approute, approute.app_list)
+        module.manager = manager  # Set by the __main__ block of the scripts
+        timings: List[float] = []
+        with _timed_tabulate(timings):
+            command.callback()
+        return {"render_seconds": round(sum(timings), 4)}
+    elif scenario == "save_groups":
+        table = ConfigGroupTable(manager, max_workers=get_max_workers_from_env())
+        directory = os.path.join(workdir, "saved")
+        start = time.perf_counter()
+        table.save_groups(directory)
+        seconds = time.perf_counter() - start
+        written = _directory_bytes(directory)
+        return {
+            "save_seconds": round(seconds, 4),
+            "bytes_written": written,
+            "write_mb_per_s": round(written / seconds / 1e6, 2) if seconds else 0.0,
+        }
+    else:
+        raise ValueError(f"Unknown scenario {scenario}")
+    return {}
+
+
+# -----------------------------------------------------------------------------
+def run_scenario(scenario: str, target: dict) -> dict:
+    """
+    Runs one scenario (in the current process) and returns its measurements.
+
+    Args:
+        scenario (str): one of SCENARIOS.
+        target (dict): {"host", "port", "user", "password"} of a mock manager,
+            or {"cassette": directory} to replay a recording.
+    """
+    from cassette import Cassette
+    from manager import Manager
+
+    cassette = Cassette(target["cassette"], "replay") if target.get("cassette") else None
+    manager = Manager(
+        target.get("host", "127.0.0.1"),
+        target.get("port", 443),
+        target.get("user", "admin"),
+        target.get("password", "admin"),
+        cassette=cassette,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="sdwan_bench_") as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # Payloads saved by the collectors land in the scratch folder
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                extra = _run_collector(manager, scenario, workdir)
+                wall = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+            manager.close()
+
+    summary = manager.metrics.summary()
+    result = {
+        "wall_seconds": round(wall, 4),
+        "api_requests": sum(endpoint["requests"] for endpoint in summary.values()),
+        "api_errors": sum(endpoint["errors"] for endpoint in summary.values()),
+        "response_bytes": sum(endpoint["response_bytes"] for endpoint in summary.values()),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    result.update(extra)
+    return result
+
+
+# -----------------------------------------------------------------------------
+def run_isolated(scenario: str, target: dict) -> dict:
+    """
+    Runs a scenario in a fresh process, so that its peak RSS is its own.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_scenario, scenario, target).result()
+
+
+# -----------------------------------------------------------------------------
+def run_suite(
+    sizes: List[int],
+    scenarios: List[str],
+    repeat: int = 1,
+    cassette: Optional[str] = None,
+    fleet_options: Optional[dict] = None,
+    progress: Callable[[str], None] = print,
+) -> dict:
+    """
+    Runs the scenarios at every fleet size (or once against a cassette).
+
+    Returns:
+        dict: {"meta": {...}, "results": [{"scenario", "size", <metrics>}, ...]}
+    """
+    fleet_options = dict(fleet_options or {})
+    group_size = fleet_options.get("group_size", 250)
+    fleet_parameters = {k: v for k, v in fleet_options.items() if k != "group_size"}
+    results = []
+
+    def measure(scenario, size, target):
+        runs = [run_isolated(scenario, target) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run["wall_seconds"])
+        best["peak_rss_mb"] = max((run["peak_rss_mb"] or 0) for run in runs) or None
+        progress(f"  {scenario:<24} {best['wall_seconds']:8.2f}s  {best['api_requests']:6d} requests")
+        results.append({"scenario": scenario, "size": size, **best})
+
+    if cassette:
+        progress(f"Replaying cassette {cassette}")
+        for scenario in scenarios:
+            measure(scenario, "cassette", {"cassette": cassette})
+    else:
+        from mock_manager import MockManager, MockManagerServer, SyntheticFleet
+
+        for size in sizes:
+            fleet = SyntheticFleet(
+                devices=size, groups=max(1, size // group_size), **fleet_parameters
+            )
+            progress(f"Fleet of {size} devices: {fleet.to_dict()}")
+            with MockManagerServer(MockManager(fleet)) as server:
+                target = {"host": server.host, "port": server.port}
+                for scenario in scenarios:
+                    measure(scenario, size, target)
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": json_backend.backend.name,
+            "repeat": repeat,
+            "fleet": fleet_options,
+        },
+        "results": results,
+    }
+
+
+# -----------------------------------------------------------------------------
+def compare(baseline: dict, current: dict, threshold: float) -> List[dict]:
+    """
+    Returns the metrics of `current` that regressed by more than `threshold`
+    (0.2 = 20%) compared with `baseline`, for the scenarios present in both.
+    """
+    previous = {(r["scenario"], str(r["size"])): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current.get("results", []):
+        reference = previous.get((result["scenario"], str(result["size"])))
+        if reference is None:
+            continue
+        for metric in HIGHER_IS_WORSE + LOWER_IS_WORSE:
+            old, new = reference.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if metric in LOWER_IS_WORSE:
+                change = -change
+            if metric.endswith("_seconds") and abs(new - old) < MIN_SECONDS_DELTA:
+                continue
+            if change > threshold:
+                regressions.append(
+                    {
+                        "scenario": result["scenario"],
+                        "size": result["size"],
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": round(change, 3),
+                    }
+                )
+    return regressions
+
+
+# -----------------------------------------------------------------------------
+def print_results(report: dict):
+    headers = [
+        "Scenario",
+        "Size",
+        "Wall (s)",
+        "Requests",
+        "Peak RSS (MB)",
+        "Render (s)",
+        "Write (MB/s)",
+    ]
+    table = [
+        [
+            r["scenario"],
+            r["size"],
+            r["wall_seconds"],
+            r["api_requests"],
+            r["peak_rss_mb"] if r["peak_rss_mb"] is not None else "N/A",
+            r.get("render_seconds", ""),
+            r.get("write_mb_per_s", ""),
+        ]
+        for r in report["results"]
+    ]
+    print(tabulate.tabulate(table, headers, tablefmt="simple"))
+
+
+# -----------------------------------------------------------------------------
+def print_regressions(regressions: List[dict], threshold: float) -> bool:
+    """
+    Prints the regressions, returns True if there are any.
+    """
+    if not regressions:
+        print(f"\nNo regression above {threshold:.0%}.")
+        return False
+    print(f"\nRegressions above {threshold:.0%}:")
+    headers = ["Scenario", "Size", "Metric", "Baseline", "Current", "Change"]
+    table = [
+        [r["scenario"], r["size"], r["metric"], r["baseline"], r["current"], f"{r['change']:+.0%}"]
+        for r in regressions
+    ]
+    print(tabulate.tabulate(table, headers, tablefmt="simple"))
+    return True
+
+
+# -----------------------------------------------------------------------------
+def load_report(path: str) -> dict:
+    with open(path, "rb") as f:
+        return json_backend.loads(f.read())
+
+
+# -----------------------------------------------------------------------------
+@click.group()
+def cli():
+    """Scale benchmarks for the SD-WAN Manager collectors."""
+    pass
+
+
+# -----------------------------------------------------------------------------
+@click.command()
+@click.option("--sizes", default="1000,10000", show_default=True, help="Fleet sizes (devices).")
+@click.option(
+    "--scenario",
+    "scenarios",
+    multiple=True,
+    type=click.Choice(SCENARIOS),
+    help="Scenarios to run (default: all).",
+)
+@click.option("--repeat", default=1, show_default=True, help="Runs per scenario, the fastest is kept.")
+@click.option("--cassette", type=click.Path(exists=True, file_okay=False), help="Replay a cassette instead of the mock.")
+@click.option("--group-size", default=250, show_default=True, help="Devices per config group.")
+@click.option("--sdwan-profiles", default=40, show_default=True)
+@click.option("--sdrouting-profiles", default=16, show_default=True)
+@click.option("--variables", default=10, show_default=True, help="Variables per device.")
+@click.option("--applications", default=2000, show_default=True, help="Entries of the application list.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the results (JSON).")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="Results to compare with.")
+@click.option("--threshold", default=0.2, show_default=True, help="Allowed regression (0.2 = 20%).")
+def run(
+    sizes,
+    scenarios,
+    repeat,
+    cassette,
+    group_size,
+    sdwan_profiles,
+    sdrouting_profiles,
+    variables,
+    applications,
+    output,
+    baseline,
+    threshold,
+):
+    """
+    Run the benchmarks, optionally failing on regressions against a baseline.
+    """
+    report = run_suite(
+        sizes=[int(size) for size in sizes.split(",") if size.strip()],
+        scenarios=list(scenarios) or SCENARIOS,
+        repeat=repeat,
+        cassette=cassette,
+        fleet_options={
+            "group_size": group_size,
+            "sdwan_profiles": sdwan_profiles,
+            "sdrouting_profiles": sdrouting_profiles,
+            "variables_per_device": variables,
+            "applications": applications,
+        },
+    )
+    print()
+    print_results(report)
+
+    if output:
+        with open(output, "w") as f:
+            json_backend.dump(report, f, compact=False)
+        print(f"\nResults written to {output}")
+
+    if baseline:
+        regressions = compare(load_report(baseline), report, threshold)
+        if print_regressions(regressions, threshold):
+            sys.exit(1)
+
+
+# -----------------------------------------------------------------------------
+@click.command(name="compare")
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False))
+@click.argument("current", type=click.Path(exists=True, dir_okay=False))
+@click.option("--threshold", default=0.2, show_default=True, help="Allowed regression (0.2 = 20%).")
+def compare_command(baseline, current, threshold):
+    """
+    Compare two result files, exit code 1 on regressions.
+    """
+    regressions = compare(load_report(baseline), load_report(current), threshold)
+    if print_regressions(regressions, threshold):
+        sys.exit(1)
+
+
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    cli.add_command(run)
+    cli.add_command(compare_command)
+    cli()
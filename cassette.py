@@ -0,0 +1,368 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Record/replay of SD-WAN Manager API calls ("cassettes")
+#
+# Description:
+#   record: every request/response exchanged by Manager is stored in a
+#           cassette directory, one JSON file per distinct request
+#   replay: the same calls are served from the cassette, without network,
+#           optionally with the recorded (or a fixed) latency
+#
+#   Requests are normalized (host removed, query parameters and JSON keys
+#   sorted) so a cassette recorded on one manager replays against any host.
+#   Calls made under a tenant (VSessionId header) are keyed by a hash of it.
+#   Credentials are redacted: passwords, JWT/refresh/CSRF tokens, cookies.
+#   Identical requests are replayed in the order they were recorded.
+#
+#   Example:
+#     manager = Manager(host, port, user, password, cassette=Cassette("cassettes/lab", "record"))
+#
+#   Environment variables read by the scripts:
+#     sdwan_cassette=cassettes/lab       cassette directory
+#     sdwan_cassette_mode=replay         record or replay (default replay)
+#     sdwan_cassette_latency=recorded    replay delay: "recorded" or seconds (default 0)
+#
+# =========================================================================
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from email.message import Message
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+import json_backend
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "REDACTED"
+
+# Body fields holding credentials (compared in lower case)
+SECRET_FIELDS = {"j_password", "password", "token", "refresh", "refreshtoken", "csrf", "secret"}
+
+# Endpoints whose whole response body is a credential
+SECRET_BODY_PATHS = ("/dataservice/client/token",)
+
+# Response headers kept in the cassette (the body is stored decoded)
+KEPT_HEADERS = ("content-type", "set-cookie", "location", "retry-after")
+
+
+# ----------------------------------------------------------
+class CassetteMissError(requests.exceptions.RequestException):
+    """
+    Raised in replay mode for a request that is not in the cassette.
+    Not a ConnectionError, so Manager does not retry it.
+    """
+
+
+# ----------------------------------------------------------
+def _redact(value: Any) -> Any:
+    """
+    Replaces credential fields in a decoded JSON body (recursively).
+    """
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if str(k).lower() in SECRET_FIELDS else _redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+# ----------------------------------------------------------
+def _redact_cookie(header: str) -> str:
+    """
+    "JSESSIONID=abc; Path=/" -> "JSESSIONID=REDACTED; Path=/" (cookie names are kept).
+    """
+    return re.sub(r"(^|,\s*)([^=;,\s]+)=[^;,]*", rf"\1\2={REDACTED}", header)
+
+
+# ----------------------------------------------------------
+class Cassette:
+    """
+    A directory of recorded SD-WAN Manager API calls, used by Manager in record or replay mode.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        mode: str = "replay",
+        latency: Union[None, str, float] = None,
+    ):
+        """
+        Args:
+            directory (str): cassette folder (created in record mode).
+            mode (str): "record" (call SD-WAN Manager and store the exchanges)
+                or "replay" (serve them from the cassette, no network).
+            latency: replay delay per call, None for none, "recorded" for the
+                latency measured while recording, or a number of seconds.
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode '{mode}', expected record or replay")
+        if mode == "replay" and not os.path.isdir(directory):
+            raise FileNotFoundError(f"Cassette directory not found: {directory}")
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[dict]] = {}  # Recorded so far, by file name
+        self._played: Dict[str, int] = {}  # Replay position, by file name
+        self.recorded = 0
+        self.replayed = 0
+        self.missed = 0
+
+    # ----- normalization -----
+
+    def _normalize_body(self, body, content_type: str) -> Any:
+        if body is None or body == b"" or body == "":
+            return None
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", errors="replace")
+        if "json" in content_type:
+            try:
+                return _redact(json_backend.loads(body))
+            except ValueError:
+                pass
+        if "x-www-form-urlencoded" in content_type:
+            fields = [
+                (k, REDACTED if k.lower() in SECRET_FIELDS else v)
+                for k, v in parse_qsl(body, keep_blank_values=True)
+            ]
+            return urlencode(fields)
+        return body
+
+    def _normalize_request(self, request: requests.PreparedRequest) -> dict:
+        url = urlsplit(request.url)
+        query = sorted(parse_qsl(url.query, keep_blank_values=True))
+        path = url.path + ("?" + urlencode(query) if query else "")
+        content_type = request.headers.get("Content-Type", "")
+        normalized = {
+            "method": request.method,
+            "path": path,
+            "body": self._normalize_body(request.body, content_type),
+        }
+        # Same path, different tenant: keep the calls apart without storing the VSessionId
+        vsessionid = request.headers.get("VSessionId")
+        if vsessionid:
+            normalized["tenant"] = hashlib.sha256(vsessionid.encode()).hexdigest()[:12]
+        return normalized
+
+    def _filename(self, normalized: dict) -> str:
+        key = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(key.encode()).hexdigest()[:12]
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", normalized["path"].split("?")[0]).strip("_")
+        return f"{normalized['method']}_{slug[:80]}_{digest}.json"
+
+    # ----- record -----
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response, elapsed: float):
+        """
+        Stores one exchange. Reading response.content here also keeps the body
+        available to the caller, streamed or not.
+        """
+        normalized = self._normalize_request(request)
+        content_type = response.headers.get("Content-Type", "")
+        body = response.content
+        if urlsplit(request.url).path.endswith(SECRET_BODY_PATHS):
+            stored: Dict[str, Any] = {"text": REDACTED if body else ""}
+        elif "json" in content_type and body:
+            try:
+                stored = {"json": _redact(json_backend.loads(body))}
+            except ValueError:
+                stored = {"base64": base64.b64encode(body).decode()}
+        else:
+            try:
+                stored = {"text": body.decode("utf-8")}
+            except UnicodeDecodeError:
+                stored = {"base64": base64.b64encode(body).decode()}
+
+        headers = {}
+        for name in KEPT_HEADERS:
+            if name in response.headers:
+                value = response.headers[name]
+                headers[name] = _redact_cookie(value) if name == "set-cookie" else value
+
+        interaction = {
+            "request": normalized,
+            "response": {"status": response.status_code, "headers": headers, **stored},
+            "elapsed": round(elapsed, 4),
+        }
+        filename = self._filename(normalized)
+        with self._lock:
+            interactions = self._interactions.setdefault(filename, [])
+            interactions.append(interaction)
+            self._write(filename, interactions)
+            self.recorded += 1
+
+    def _write(self, filename: str, interactions: List[dict]):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, filename)
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "w") as f:
+            json_backend.dump(interactions, f, compact=False)
+        os.replace(tmp_path, path)
+
+    # ----- replay -----
+
+    def play(self, request: requests.PreparedRequest) -> dict:
+        """
+        Returns the next recorded interaction for `request` (the last one repeats).
+
+        Raises:
+            CassetteMissError: if the request was never recorded.
+        """
+        normalized = self._normalize_request(request)
+        filename = self._filename(normalized)
+        with self._lock:
+            if filename not in self._interactions:
+                path = os.path.join(self.directory, filename)
+                try:
+                    with open(path, "rb") as f:
+                        self._interactions[filename] = json_backend.loads(f.read())
+                except FileNotFoundError:
+                    self.missed += 1
+                    raise CassetteMissError(
+                        f"No recorded response for {normalized['method']} {normalized['path']} "
+                        f"in cassette {self.directory}"
+                    ) from None
+            interactions = self._interactions[filename]
+            position = self._played.get(filename, 0)
+            self._played[filename] = position + 1
+            self.replayed += 1
+        return interactions[min(position, len(interactions) - 1)]
+
+    def delay(self, interaction: dict) -> float:
+        if self.latency is None:
+            return 0.0
+        if self.latency == "recorded":
+            return interaction.get("elapsed", 0.0)
+        return float(self.latency)
+
+    def adapter(self, wrapped: HTTPAdapter) -> HTTPAdapter:
+        """
+        Returns the transport adapter to mount on the Manager session.
+
+        Args:
+            wrapped (HTTPAdapter): the real adapter, used for network calls in record mode.
+        """
+        if self.mode == "record":
+            return RecordingAdapter(self, wrapped)
+        return ReplayAdapter(self)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "missed": self.missed,
+            }
+
+
+# ----------------------------------------------------------
+class RecordingAdapter(HTTPAdapter):
+    """
+    Sends requests through the real adapter and records every exchange in the cassette.
+    """
+
+    def __init__(self, cassette: Cassette, wrapped: HTTPAdapter):
+        super().__init__()
+        self.cassette = cassette
+        self.wrapped = wrapped
+
+    def send(self, request, **kwargs):
+        start = time.monotonic()
+        response = self.wrapped.send(request, **kwargs)
+        self.cassette.record(request, response, time.monotonic() - start)
+        return response
+
+    def close(self):
+        self.wrapped.close()
+
+
+# ----------------------------------------------------------
+class _RecordedHTTPResponse:
+    """
+    Stand-in for http.client.HTTPResponse, read by requests to extract cookies.
+    """
+
+    def __init__(self, headers: Dict[str, str]):
+        self.msg = Message()
+        for name, value in headers.items():
+            self.msg[name] = value
+
+    def isclosed(self):
+        return True
+
+
+# ----------------------------------------------------------
+class ReplayAdapter(HTTPAdapter):
+    """
+    Serves requests from the cassette, no network access.
+    """
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        interaction = self.cassette.play(request)
+        delay = self.cassette.delay(interaction)
+        if delay > 0:
+            time.sleep(delay)
+
+        recorded = interaction["response"]
+        if "json" in recorded:
+            body = json_backend.dumps(recorded["json"], compact=True).encode()
+        elif "base64" in recorded:
+            body = base64.b64decode(recorded["base64"])
+        else:
+            body = recorded.get("text", "").encode()
+
+        headers = dict(recorded.get("headers", {}))
+        headers["content-length"] = str(len(body))
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=recorded["status"],
+            preload_content=False,
+            decode_content=False,
+            original_response=_RecordedHTTPResponse(headers),
+            request_method=request.method,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+
+# ----------------------------------------------------------
+def get_cassette_from_env() -> Optional[Cassette]:
+    """
+    Builds the Cassette selected by the sdwan_cassette* environment variables, if any.
+    """
+    directory = os.environ.get("sdwan_cassette")
+    if not directory:
+        return None
+    mode = (os.environ.get("sdwan_cassette_mode") or "replay").lower()
+    latency: Union[None, str, float] = os.environ.get("sdwan_cassette_latency") or None
+    try:
+        if latency not in (None, "recorded"):
+            latency = float(latency)
+        return Cassette(directory, mode, latency)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Invalid cassette settings: {e}")
+        sys.exit(1)
@@ -0,0 +1,480 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Cluster-aware Manager
+#
+# Description:
+#   Spreads read-only API calls (GET) across the nodes of an SD-WAN Manager
+#   cluster, by round-robin or least-outstanding-requests.
+#   Writes (POST/PUT/DELETE) go to the first healthy node.
+#   Nodes that fail (connection errors, 5xx) or answer too slowly are
+#   ejected for a while and health-checked before being used again.
+#   Each node has its own Manager (session), or all nodes share the JWT
+#   obtained on the first node (JWT tokens are valid on every cluster member).
+#
+# =========================================================================
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+import requests
+import tabulate
+
+from auth import AuthStrategy, JWTAuth
+from manager import Manager, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round-robin"
+LEAST_OUTSTANDING = "least-outstanding"
+
+
+# ----------------------------------------------------------
+class SharedJWTAuth(AuthStrategy):
+    """
+    Reuses the JWT of another Manager (the primary cluster node) instead of logging in.
+    The primary refreshes the token, and each node picks up the new one before its next call.
+    """
+
+    name = "shared-jwt"
+
+    def __init__(self, primary: Manager):
+        self.primary = primary
+        self._token = None
+
+    def _primary_jwt(self):
+        self.primary._ensure_authenticated()
+        return self.primary.auth.jwt
+
+    def _copy(self, manager) -> bool:
+        jwt = self._primary_jwt()
+        if jwt is None or not jwt.jwt_token:
+            return False
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {jwt.jwt_token}",
+        }
+        if jwt.csrf_token:
+            headers["X-XSRF-TOKEN"] = jwt.csrf_token
+        manager.session.headers.update(headers)
+        manager.token = jwt.csrf_token
+        self._token = jwt.jwt_token
+        return True
+
+    def authenticate(self, manager) -> bool:
+        if not self._copy(manager):
+            return False
+        manager.dataservice_base_url = f"https://{manager.host}:{manager.port}/dataservice"
+        return True
+
+    def reauthenticate(self, manager) -> bool:
+        jwt = self._primary_jwt()
+        if jwt is not None and jwt.jwt_token == self._token:
+            # The token we sent was rejected, have the primary renew it
+            if not self.primary.auth.reauthenticate(self.primary):
+                return False
+        return self._copy(manager)
+
+    def before_request(self, manager):
+        self.primary.auth.before_request(self.primary)
+        jwt = self.primary.auth.jwt
+        if jwt is not None and jwt.jwt_token != self._token:
+            self._copy(manager)
+
+    def clone(self) -> "SharedJWTAuth":
+        return SharedJWTAuth(self.primary)
+
+
+# ----------------------------------------------------------
+class ClusterNode:
+    """
+    One cluster member: its Manager, load and health state.
+    """
+
+    def __init__(self, manager: Manager):
+        self.manager = manager
+        self.address = f"{manager.host}:{manager.port}"
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.slow = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until: Optional[float] = None
+        self.latency_ewma: Optional[float] = None
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until is None or now >= self.ejected_until
+
+    def to_dict(self):
+        return {
+            "node": self.address,
+            "requests": self.requests,
+            "errors": self.errors,
+            "slow": self.slow,
+            "outstanding": self.outstanding,
+            "ejections": self.ejections,
+            "ejected": self.ejected_until is not None,
+            "latency_ewma_ms": (
+                round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None
+            ),
+        }
+
+
+# ----------------------------------------------------------
+class ClusterManager:
+    """
+    Manager-compatible client for an SD-WAN Manager cluster.
+
+    _api_get, api_stream and api_save are spread across healthy nodes and fail over
+    to another node on connection errors or 5xx responses. _api_post, _api_put and
+    _api_delete are sent to the first healthy node. Other attributes (version,
+    about(), metrics, ...) are those of the first node's Manager.
+
+    Example:
+        cluster = ClusterManager(["10.0.0.1", "10.0.0.2", "10.0.0.3"], 8443, user, password)
+        payloads = cluster.api_get_many([f"/device/counters?deviceId={ip}" for ip in ips])
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[Union[str, Tuple[str, Any]]],
+        port,
+        user,
+        password,
+        strategy: str = LEAST_OUTSTANDING,
+        share_jwt: bool = False,
+        max_failures: int = 3,
+        ejection_time: float = 30.0,
+        slow_threshold: Optional[float] = None,
+        health_check_interval: float = 10.0,
+        health_check_path: str = "/client/about",
+        **manager_options,
+    ):
+        """
+        Args:
+            nodes (list): node addresses, "host", "host:port" or (host, port).
+            port (int): default HTTPS port for nodes given without one.
+            user (str): username for authentication
+            password (str): password for authentication
+            strategy (str): "least-outstanding" (default) or "round-robin".
+            share_jwt (bool): log in once with JWT on the first node and reuse the token
+                on the other nodes (20.18+). Otherwise each node authenticates on its own.
+            max_failures (int): consecutive failures (or slow responses) before a node is ejected.
+            ejection_time (float): seconds a node stays ejected, doubled on each new
+                ejection up to 10 times the initial value.
+            slow_threshold (float, optional): responses slower than this count as failures.
+            health_check_interval (float): seconds between health checks of ejected nodes.
+            health_check_path (str): API path used for health checks.
+            **manager_options: extra Manager options (validate_certs, timeout, rate_limiter, ...).
+                retry_policy defaults to 2 attempts per node, failing over to another node instead.
+                auth may be an AuthStrategy, used as a prototype (each node gets auth.clone()),
+                or a callable returning a new strategy for each node.
+        """
+        if strategy not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ValueError(f"Unknown strategy '{strategy}'")
+        if not nodes:
+            raise ValueError("At least one cluster node is required")
+
+        manager_options.setdefault("retry_policy", RetryPolicy(max_attempts=2, backoff_max=5.0))
+        auth: Union[None, AuthStrategy, Callable[[], AuthStrategy]] = manager_options.pop("auth", None)
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.slow_threshold = slow_threshold
+        self.health_check_interval = health_check_interval
+        self.health_check_path = health_check_path
+        self.nodes: List[ClusterNode] = []
+
+        for index, node in enumerate(nodes):
+            host, node_port = self._parse_node(node, port)
+            options = dict(manager_options)
+            # Strategies keep per-node login state (session, token, host): one per node
+            if isinstance(auth, AuthStrategy):
+                options["auth"] = auth.clone()
+            elif auth is not None:
+                options["auth"] = auth()
+            if share_jwt:
+                options["auth"] = JWTAuth() if index == 0 else SharedJWTAuth(self.nodes[0].manager)
+            self.nodes.append(ClusterNode(Manager(host, node_port, user, password, **options)))
+
+        self._lock = threading.Lock()
+        self._next = 0
+        self._health_thread = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _parse_node(node, default_port) -> Tuple[str, int]:
+        """
+        Splits a node address ("host", "host:port" or (host, port)) into host and int port.
+
+        Raises:
+            ValueError: if the port is missing or not a valid port number.
+        """
+        if isinstance(node, (tuple, list)):
+            host, node_port = node[0], node[1]
+        elif node.count(":") == 1:  # host:port (IPv6 addresses have more colons)
+            host, node_port = node.split(":")
+        else:
+            host, node_port = node, default_port
+        if node_port is None:
+            raise ValueError(f"No port for cluster node {node!r} and no default port")
+        try:
+            node_port = int(node_port)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid port '{node_port}' for cluster node {node!r}") from None
+        if not 0 < node_port < 65536:
+            raise ValueError(f"Invalid port '{node_port}' for cluster node {node!r}")
+        return host, node_port
+
+    @property
+    def primary(self) -> Manager:
+        return self.nodes[0].manager
+
+    def __getattr__(self, name):
+        # Manager attributes not overridden here (version, about, metrics, ...)
+        if name == "nodes":
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    # ------------------------------------------------------
+    # Node selection and health
+    # ------------------------------------------------------
+    def _acquire(self, exclude=(), writer: bool = False) -> ClusterNode:
+        """
+        Picks a node and counts the request as outstanding on it.
+        When every node is ejected, the one whose ejection ends first is used anyway.
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [n for n in self.nodes if n not in exclude and n.is_available(now)]
+            if not candidates:
+                candidates = sorted(
+                    (n for n in self.nodes if n not in exclude),
+                    key=lambda n: n.ejected_until or 0,
+                )[:1]
+            if not candidates:
+                raise requests.exceptions.ConnectionError("No SD-WAN Manager cluster node available")
+
+            if writer:
+                node = candidates[0]
+            elif self.strategy == ROUND_ROBIN:
+                node = candidates[self._next % len(candidates)]
+                self._next += 1
+            else:
+                node = min(
+                    candidates,
+                    key=lambda n: (n.outstanding, n.latency_ewma or 0.0),
+                )
+            node.outstanding += 1
+            node.requests += 1
+            return node
+
+    def _release(self, node: ClusterNode, elapsed: Optional[float], failed: bool):
+        with self._lock:
+            node.outstanding -= 1
+            if elapsed is not None:
+                node.latency_ewma = (
+                    elapsed
+                    if node.latency_ewma is None
+                    else 0.8 * node.latency_ewma + 0.2 * elapsed
+                )
+            slow = (
+                not failed
+                and elapsed is not None
+                and self.slow_threshold is not None
+                and elapsed > self.slow_threshold
+            )
+            if failed:
+                node.errors += 1
+            if slow:
+                node.slow += 1
+            if failed or slow:
+                node.consecutive_failures += 1
+                if node.consecutive_failures >= self.max_failures:
+                    self._eject(node, "slow responses" if slow else "failures")
+            else:
+                node.consecutive_failures = 0
+                node.ejections = 0
+                node.ejected_until = None
+
+    def _eject(self, node: ClusterNode, reason: str):
+        """
+        Removes a node from rotation. Called with self._lock held.
+        """
+        duration = min(self.ejection_time * (2**node.ejections), self.ejection_time * 10)
+        node.ejections += 1
+        node.consecutive_failures = 0
+        node.ejected_until = time.monotonic() + duration
+        logger.warning(f"Ejecting cluster node {node.address} for {duration:.0f}s ({reason})")
+        self._start_health_checks()
+
+    def _start_health_checks(self):
+        if self._health_thread and self._health_thread.is_alive():
+            return
+        self._stop.clear()
+        self._health_thread = threading.Thread(
+            target=self._health_check_loop, name="sdwan-cluster-health", daemon=True
+        )
+        self._health_thread.start()
+
+    def _health_check_loop(self):
+        while not self._stop.wait(self.health_check_interval):
+            ejected = [n for n in self.nodes if n.ejected_until is not None]
+            if not ejected:
+                return  # Restarted on the next ejection
+            for node in ejected:
+                self.check_node(node)
+
+    def check_node(self, node: ClusterNode) -> bool:
+        """
+        Sends a health-check request to a node, and puts it back in rotation if it answers.
+        """
+        manager = node.manager
+        try:
+            manager._ensure_authenticated()
+            response = manager.session.get(
+                f"{manager.dataservice_base_url}{self.health_check_path}",
+                timeout=min(manager.timeout, 5),
+            )
+            healthy = response.status_code < 500 and not manager._is_login_page(response)
+        except requests.exceptions.RequestException as e:
+            logger.info(f"Health check of {node.address} failed: {e}")
+            healthy = False
+
+        with self._lock:
+            if healthy:
+                if node.ejected_until is not None:
+                    logger.warning(f"Cluster node {node.address} is healthy again")
+                node.ejected_until = None
+                node.consecutive_failures = 0
+            elif node.ejected_until is not None:
+                node.ejected_until = max(
+                    node.ejected_until, time.monotonic() + self.health_check_interval
+                )
+        return healthy
+
+    # ------------------------------------------------------
+    # API calls
+    # ------------------------------------------------------
+    @staticmethod
+    def _is_node_failure(error: Exception) -> bool:
+        """
+        Connection problems, failed logins and server errors are node failures,
+        client errors (4xx) are not.
+        """
+        response = getattr(error, "response", None)
+        if response is None:
+            return True
+        return response.status_code >= 500
+
+    def _call(self, method_name: str, *args, writer: bool = False, **kwargs):
+        """
+        Runs a Manager method on a selected node, failing over to the other nodes.
+        """
+        tried: List[ClusterNode] = []
+        while True:
+            node = self._acquire(tried, writer=writer)
+            start = time.monotonic()
+            try:
+                result = getattr(node.manager, method_name)(*args, **kwargs)
+            except requests.exceptions.RequestException as e:
+                failed = self._is_node_failure(e)
+                self._release(node, time.monotonic() - start if not failed else None, failed)
+                tried.append(node)
+                if not failed or writer or len(tried) >= len(self.nodes):
+                    raise
+                logger.warning(f"Cluster node {node.address} failed ({e}), trying another node")
+                continue
+            self._release(node, time.monotonic() - start, False)
+            return result
+
+    def _api_get(self, path: str, params: Optional[dict] = None):
+        """
+        GET on the selected node (see Manager._api_get), with failover.
+        """
+        return self._call("_api_get", path, params)
+
+    def api_save(self, path: str, filepath: str, params: Optional[dict] = None, **kwargs) -> str:
+        """
+        Streams a GET response to disk from the selected node (see Manager.api_save).
+        """
+        return self._call("api_save", path, filepath, params, **kwargs)
+
+    def api_stream(self, path: str, item_path: str = "data.item", params=None, **kwargs):
+        """
+        Streams records from the selected node (see Manager.api_stream).
+        The node is chosen when iteration starts, there is no failover once records are read.
+        """
+        node = self._acquire()
+        start = time.monotonic()
+        failed = False
+        try:
+            yield from node.manager.api_stream(path, item_path, params, **kwargs)
+        except requests.exceptions.RequestException as e:
+            failed = self._is_node_failure(e)
+            raise
+        finally:
+            self._release(node, None if failed else time.monotonic() - start, failed)
+
+    def _api_post(self, path: str, payload: Optional[dict] = None):
+        return self._call("_api_post", path, payload, writer=True)
+
+    def _api_put(self, path: str, payload: Optional[dict] = None):
+        return self._call("_api_put", path, payload, writer=True)
+
+    def _api_delete(self, path: str, params: Optional[dict] = None):
+        return self._call("_api_delete", path, params, writer=True)
+
+    def api_get_many(
+        self, paths: Sequence[str], params: Optional[dict] = None, max_workers: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Fetches many paths in parallel across the cluster.
+
+        Args:
+            paths (list): API paths.
+            params (dict, optional): query parameters sent with every path.
+            max_workers (int, optional): concurrent requests, defaults to the
+                connection pool size of all nodes together.
+
+        Returns:
+            list: results in the order of `paths`, with the exception in place of a failed call.
+        """
+        if max_workers is None:
+            max_workers = sum(node.manager.adapter._pool_maxsize for node in self.nodes)
+
+        def fetch(path):
+            try:
+                return self._api_get(path, params)
+            except requests.exceptions.RequestException as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sdwan-cluster") as pool:
+            return list(pool.map(fetch, paths))
+
+    # ------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return [node.to_dict() for node in self.nodes]
+
+    def print_stats(self):
+        stats = self.stats()
+        if stats:
+            headers = list(stats[0].keys())
+            print(tabulate.tabulate([list(s.values()) for s in stats], headers, tablefmt="simple"))
+
+    def close(self):
+        """
+        Stops health checks and closes every node's connections.
+        """
+        self._stop.set()
+        for node in self.nodes:
+            node.manager.close()
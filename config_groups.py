@@ -27,111 +27,145 @@
 #
 # =========================================================================
 
-import json
+import functools
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any, Dict, List, Optional  # Added for type hinting clarity
+from typing import Any, Callable, Dict, List, Optional, Sequence  # Added for type hinting clarity
 
 import requests
 
+import json_backend
+
 # Import the new unified Manager class and the credentials function
 from manager import Manager
+from payloads import compressed_path, open_payload
+from sync_state import SyncState
+
+# Feature profile types whose details can be fetched (policy-object is not supported yet)
+SUPPORTED_PROFILE_TYPES = ("system", "transport", "service", "cli")
 
 
 # -----------------------------------------------------------------------------
 def save_json(
-    payload: dict, filename: str = "payload", directory: str = "./output/payloads/"
+    payload: dict,
+    filename: str = "payload",
+    directory: str = "./output/payloads/",
+    compact: Optional[bool] = None,
+    compression: Optional[str] = None,
 ):
     """Save json response payload to a file
 
     Args:
         payload: JSON response payload
         filename: filename for saved files (default: "payload")
+        compact: write without indentation (default: sdwan_json_compact env variable)
+        compression: "gzip" or "xz" (default: sdwan_payload_compression env variable)
     """
 
-    filename = "".join([directory, f"{filename}.json"])
+    filename = compressed_path("".join([directory, f"{filename}.json"]), compression)
 
     if not os.path.exists(directory):
         print(f"Creating folder {directory}")
         os.makedirs(directory)  # Create the directory if it doesn't exist
 
     # Dump entire payload to file
-    with open(filename, "w") as file:
-        json.dump(payload, file, indent=4)
+    with open_payload(filename, "w") as file:
+        json_backend.dump(payload, file, compact=compact)
 
 
 # -----------------------------------------------------------------------------
-class SDRoutingFeatureProfile:
+def get_max_workers_from_env(default: int = 1) -> int:
     """
-    Helper class to fetch detailed payload for a single SD-Routing feature profile.
+    Returns the number of concurrent detail requests set by sdwan_max_workers (default 1: sequential).
     """
+    setting = os.environ.get("sdwan_max_workers")
+    try:
+        return max(1, int(setting)) if setting else default
+    except ValueError:
+        print(f"Invalid sdwan_max_workers '{setting}', using {default}")
+        return default
 
-    payload = None
 
-    def __init__(
-        self, manager, id, name, solution, type, createdby, lastupdatedby, lastupdatedon
-    ):
-        self.manager = manager
-        self.id = id
-        self.name = name
-        self.solution = solution
-        self.type = type
-        self.createdby = createdby
-        self.lastupdatedby = lastupdatedby
-        self.lastupdatedon = lastupdatedon
+# -----------------------------------------------------------------------------
+def get_lazy_profiles_from_env() -> bool:
+    """
+    True when sdwan_lazy_profiles asks for feature profile details to be fetched on first use.
+    """
+    return os.environ.get("sdwan_lazy_profiles", "").lower() in ("1", "true", "yes", "on")
 
-        url_base = "/v1/feature-profile/sd-routing/"
 
-        match self.type:
-            case "system":
-                urlp = url_base + "system/"
-            case "transport":
-                urlp = url_base + "transport/"
-            case "service":
-                urlp = url_base + "service/"
-            case "cli":
-                urlp = url_base + "cli/"
-            # case "policy-object": # This case was commented out in original, keeping it that way
-            #     urlp = url_base + "policy-object/"
-            case _:
-                print(f"{self.type} type not supported for SD-Routing feature profile")
-                return
+# -----------------------------------------------------------------------------
+def fetch_in_order(
+    function: Callable, items: Sequence, max_workers: int = 1, thread_name_prefix: str = "sdwan-fetch"
+) -> List[Any]:
+    """
+    Calls function(item) for every item, up to max_workers at a time.
 
-        # Get profile_id payload
-        # NOTE: details option has been added in 20.12
-        path = urlp + self.id
-        params = {"details": "true"}
-        print(f"Fetching details for profile ID {self.id} from {path}")
-        try:
-            self.payload = self.manager._api_get(path, params=params)
-            self.profile_name = self.payload["profileName"]
-            self.profile_type = self.payload["profileType"]
-            self.solution = self.payload["solution"]
+    Args:
+        function: called once per item, from a worker thread when max_workers > 1.
+        items: the items to process.
+        max_workers: concurrent calls (1: sequential, in the calling thread).
 
-        except requests.exceptions.RequestException as e:
-            print(f"An unexpected error occurred: {e}")
-            self.payload = None  # Indicate failure to fetch
-            if hasattr(e, "response") and e.response is not None:
-                print(f"Status: {e.response.status_code}, Response: {e.response.text}")
-            return
+    Returns:
+        list: the results in the order of `items`, whatever the completion order.
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix) as pool:
+        return list(pool.map(function, items))
 
 
 # -----------------------------------------------------------------------------
-class SDRoutingProfileTable:
-    def __init__(self, manager: Manager):
+class FeatureProfileTable:
+    """
+    Feature profiles of one solution, collected from the profile summary.
+    Subclasses set the solution and the class fetching the details of one profile.
+    """
+
+    solution = ""  # URL segment: /v1/feature-profile/<solution>/
+    label = ""  # Solution name in the messages
+    kind = ""  # Sync state kind and payload folder name
+    fetcher: Optional[Callable] = None  # Fetches the details=true payload of one profile
+
+    def __init__(
+        self,
+        manager: Manager,
+        max_workers: int = 1,
+        sync_state: Optional[SyncState] = None,
+        lazy: bool = False,
+    ):
+        """
+        Args:
+            manager (Manager): SD-WAN Manager session.
+            max_workers (int): profile details fetched concurrently (1: one after the other).
+            sync_state (SyncState, optional): incremental sync, only the profiles
+                whose summary changed since the last run are fetched.
+            lazy (bool): build the profiles from the summary only; the details of
+                each profile are fetched the first time Profile.details is read
+                (save_profiles() reads them all).
+        """
         self.manager = manager
+        self.max_workers = max_workers
+        self.sync_state = sync_state
+        self.lazy = lazy
         self.profiles_table = []  # This will store generic Profile objects
+        self.failures = []  # {"id", "name", "type", "error"} for each profile not collected
+        self.profiles_by_id: Dict[str, Profile] = {}
+        self.profiles_by_type: Dict[str, List[Profile]] = {}
+        self.payload_directory = f"output/payloads/feature_profiles/{self.kind}/"
+        self.sync_kind = f"{self.kind}_profiles"
 
-        api_path_summary = "/v1/feature-profile/sd-routing/"
+        api_path_summary = f"/v1/feature-profile/{self.solution}/"
+
+        print(f"\n--- Collecting {self.label} Feature Profiles ---")
 
         # Get list of profiles (summary)
         try:
             summary_data = self.manager._api_get(api_path_summary)
-            save_json(
-                summary_data,
-                "profiles_table",
-                "output/payloads/feature_profiles/sdrouting/",
-            )  # save payload response
+            save_json(summary_data, "profiles_table", self.payload_directory)  # save payload response
 
         except requests.exceptions.RequestException as e:
             print(f"An unexpected error occurred: {e}")
@@ -139,64 +173,150 @@ class SDRoutingProfileTable:
                 print(f"Status: {e.response.status_code}, Response: {e.response.text}")
             return
 
-        # For each summary item, fetch full details and create a Profile object
-        for item in summary_data:
-            profile_id = item["profileId"]
-            profile_name = item["profileName"]
-            profile_solution = item["solution"]
-            profile_type = item["profileType"]
-            profile_createdby = item["createdBy"]
-            profile_lastupdated = item["lastUpdatedBy"]
-            profile_lastUpdatedOn = item["lastUpdatedOn"]
-
-            # Use SDRoutingFeatureProfile to fetch the detailed payload
-            sdrouting_feature_profile_fetcher = SDRoutingFeatureProfile(
+        if self.lazy:
+            # Profiles from the summary, details fetched when first read
+            results = [self._summary_profile(item) for item in summary_data]
+        else:
+            # For each summary item, fetch full details and create a Profile object
+            # Results come back in summary order, whatever the number of workers
+            results = fetch_in_order(
+                self._fetch_profile, summary_data, self.max_workers, f"{self.kind}-profiles"
+            )
+        for item, (profile, error) in zip(summary_data, results):
+            if profile is None:
+                self.failures.append(
+                    {
+                        "id": item["profileId"],
+                        "name": item["profileName"],
+                        "type": item["profileType"],
+                        "error": error,
+                    }
+                )
+                continue
+            self.profiles_table.append(profile)
+        self.reindex()
+
+        if self.failures:
+            print(f"\n{len(self.failures)} {self.label} feature profile(s) not collected:")
+            for failure in self.failures:
+                print(f"    {failure['name']} ({failure['id']}): {failure['error']}")
+
+        if self.sync_state:
+            deleted = self.sync_state.prune(
+                self.sync_kind, [item["profileId"] for item in summary_data]
+            )
+            self.sync_state.save()
+            self.sync_state.print_report(self.sync_kind, deleted)
+
+    def _fetch_profile(self, item: dict):
+        """
+        Builds the Profile of one summary item from its details (eager mode).
+
+        Returns:
+            tuple: (Profile, None) or (None, reason of the failure).
+        """
+        full_profile_payload, error = self._fetch_details(item)
+        if full_profile_payload is None:
+            return None, error
+
+        # Now, use the full_profile_payload to create a generic Profile object
+        # The payload itself is not kept (it is saved on disk), Profile.details fetches it again
+        return (
+            Profile.from_payload(
+                full_profile_payload,
+                details_loaded=True,
+                details_loader=functools.partial(self._fetch_details, item),
+            ),
+            None,
+        )
+
+    def _summary_profile(self, item: dict):
+        """
+        Builds the Profile of one summary item without its details (lazy mode).
+        Unsupported types are reported as failures, as in eager mode.
+
+        Returns:
+            tuple: (Profile, None) or (None, reason of the failure).
+        """
+        if item["profileType"] not in SUPPORTED_PROFILE_TYPES:
+            return None, f"{item['profileType']} type not supported"
+        return (
+            Profile.from_payload(item, details_loader=functools.partial(self._fetch_details, item)),
+            None,
+        )
+
+    def _fetch_details(self, item: dict):
+        """
+        Fetches the details of one summary item and saves the payload
+        (or takes them from the sync state when the item did not change).
+
+        Returns:
+            tuple: (details payload, None) or (None, reason of the failure).
+        """
+        profile_id = item["profileId"]
+        profile_name = item["profileName"]
+
+        # Unchanged since the last sync: reuse the stored payload
+        full_profile_payload = None
+        if self.sync_state:
+            stamp = self.sync_state.stamp(self.sync_kind, item)
+            full_profile_payload = self.sync_state.lookup(self.sync_kind, profile_id, stamp)
+
+        if full_profile_payload is None:
+            # The fetcher makes the API call for details of a single profile
+            fetcher = self.fetcher(
                 self.manager,
                 profile_id,
                 profile_name,
-                profile_solution,
-                profile_type,
-                profile_createdby,
-                profile_lastupdated,
-                profile_lastUpdatedOn,
+                item["solution"],
+                item["profileType"],
+                item["createdBy"],
+                item["lastUpdatedBy"],
+                item["lastUpdatedOn"],
             )
 
-            if not sdrouting_feature_profile_fetcher.payload:
+            if not fetcher.payload:
                 print(
-                    f"Skipping profile ID {profile_id} due to unsupported type or fetch error."
+                    f"Skipping profile {profile_name} ({profile_id}) due to unsupported type or fetch error."
                 )
-                continue
+                return None, fetcher.error or "empty payload"
 
-            full_profile_payload = sdrouting_feature_profile_fetcher.payload
+            full_profile_payload = fetcher.payload
             save_json(
                 full_profile_payload,
                 f"{profile_name}",
-                "output/payloads/feature_profiles/sdrouting/",
+                self.payload_directory,
             )
+            if self.sync_state:
+                self.sync_state.store(
+                    self.sync_kind, profile_id, profile_name, stamp, full_profile_payload
+                )
 
-            # Now, use the full_profile_payload to create a generic Profile object
-            profile = Profile(
-                id=full_profile_payload.get("profileId"),
-                name=full_profile_payload.get("profileName"),
-                solution=full_profile_payload.get("solution"),
-                type=full_profile_payload.get("profileType"),
-                description=full_profile_payload.get("description"),
-                lastUpdatedBy=full_profile_payload.get("lastUpdatedBy"),
-                lastUpdatedOn=full_profile_payload.get("lastUpdatedOn"),
-                createdBy=full_profile_payload.get("createdBy"),
-                createdOn=full_profile_payload.get("createdOn"),
-                profileParcelCount=full_profile_payload.get("profileParcelCount"),
-                origin=full_profile_payload.get("origin"),
-            )
-            self.profiles_table.append(profile)
+        return full_profile_payload, None
+
+    def reindex(self):
+        """
+        Rebuilds profiles_by_id and profiles_by_type, e.g. after changing profiles_table.
+        """
+        self.profiles_by_id = {}
+        self.profiles_by_type = {}
+        for profile in self.profiles_table:
+            self.profiles_by_id[profile.id] = profile
+            self.profiles_by_type.setdefault(profile.type, []).append(profile)
+
+    def profile(self, profile_id: str) -> Optional["Profile"]:
+        return self.profiles_by_id.get(profile_id)
+
+    def profiles_of_type(self, profile_type: str) -> List["Profile"]:
+        return list(self.profiles_by_type.get(profile_type, []))
 
     def list(self):
-        print("\n--- SD-Routing Feature Profiles\n")
+        print(f"\n--- {self.label} Feature Profiles\n")
         for profile in self.profiles_table:
             profile.display()  # Use the display method of the generic Profile object
 
     def list_categories(self):
-        print("\n--- SD-Routing Feature Profiles per category\n")
+        print(f"\n--- {self.label} Feature Profiles per category\n")
 
         categories = [
             "system",
@@ -208,21 +328,121 @@ class SDRoutingProfileTable:
 
         for category_item in categories:
             print(f"\n--- Category: {category_item.upper()} ---")
-            found_in_category = False
-            for profile in self.profiles_table:
-                if profile.type == category_item:
-                    profile.display()
-                    found_in_category = True
-            if not found_in_category:
+            profiles = self.profiles_by_type.get(category_item, [])
+            for profile in profiles:
+                profile.display()
+            if not profiles:
                 print(f"    No profiles found for category '{category_item}'.")
 
-    def save_profiles(self, directory="output/feature_profiles/sdrouting"):
-        print(f"\n--- Saving SD-Routing Feature Profiles in {directory}\n")
+    def load_details(self):
+        """
+        Fetches the details of the profiles not loaded yet (lazy mode), max_workers at a time.
+        """
+        pending = [profile for profile in self.profiles_table if not profile.details_loaded]
+        if not pending:
+            return
+        fetch_in_order(
+            lambda profile: profile.details, pending, self.max_workers, f"{self.kind}-profiles"
+        )
+
+        pending_ids = {profile.id for profile in pending}
+        self.failures = [failure for failure in self.failures if failure["id"] not in pending_ids]
+        self.failures += [
+            {"id": profile.id, "name": profile.name, "type": profile.type, "error": profile.details_error}
+            for profile in pending
+            if not profile.details_loaded
+        ]
+        if self.sync_state:
+            self.sync_state.save()
+            self.sync_state.print_report(self.sync_kind)
+
+    def save_profiles(self, directory: Optional[str] = None):
+        """
+        Saves every collected profile under `directory` (default: output/feature_profiles/<kind>).
+        """
+        directory = directory or f"output/feature_profiles/{self.kind}"
+        if self.lazy:
+            self.load_details()
+        print(f"\n--- Saving {self.label} Feature Profiles in {directory}\n")
         # Use the save_to_file method of the generic Profile object
         for profile in self.profiles_table:
+            if not profile.details_loaded:
+                print(f"Skipping profile {profile.name} ({profile.id}): {profile.details_error}")
+                continue
             profile.save_to_file(directory)
 
 
+# -----------------------------------------------------------------------------
+class SDRoutingFeatureProfile:
+    """
+    Helper class to fetch detailed payload for a single SD-Routing feature profile.
+    """
+
+    payload = None
+    error = None  # Why the payload could not be fetched
+
+    def __init__(
+        self, manager, id, name, solution, type, createdby, lastupdatedby, lastupdatedon
+    ):
+        self.manager = manager
+        self.id = id
+        self.name = name
+        self.solution = solution
+        self.type = type
+        self.createdby = createdby
+        self.lastupdatedby = lastupdatedby
+        self.lastupdatedon = lastupdatedon
+
+        url_base = "/v1/feature-profile/sd-routing/"
+
+        match self.type:
+            case "system":
+                urlp = url_base + "system/"
+            case "transport":
+                urlp = url_base + "transport/"
+            case "service":
+                urlp = url_base + "service/"
+            case "cli":
+                urlp = url_base + "cli/"
+            # case "policy-object": # This case was commented out in original, keeping it that way
+            #     urlp = url_base + "policy-object/"
+            case _:
+                print(f"{self.type} type not supported for SD-Routing feature profile")
+                self.error = f"{self.type} type not supported"
+                return
+
+        # Get profile_id payload
+        # NOTE: details option has been added in 20.12
+        path = urlp + self.id
+        params = {"details": "true"}
+        print(f"Fetching details for profile ID {self.id} from {path}")
+        try:
+            self.payload = self.manager._api_get(path, params=params)
+            self.profile_name = self.payload["profileName"]
+            self.profile_type = self.payload["profileType"]
+            self.solution = self.payload["solution"]
+
+        except requests.exceptions.RequestException as e:
+            print(f"An unexpected error occurred: {e}")
+            self.payload = None  # Indicate failure to fetch
+            self.error = str(e)
+            if hasattr(e, "response") and e.response is not None:
+                print(f"Status: {e.response.status_code}, Response: {e.response.text}")
+            return
+
+
+# -----------------------------------------------------------------------------
+class SDRoutingProfileTable(FeatureProfileTable):
+    """
+    SD-Routing feature profiles (/v1/feature-profile/sd-routing/).
+    """
+
+    solution = "sd-routing"
+    label = "SD-Routing"
+    kind = "sdrouting"
+    fetcher = SDRoutingFeatureProfile
+
+
 # -----------------------------------------------------------------------------
 class SDWANFeatureProfile:
     """
@@ -230,6 +450,7 @@ class SDWANFeatureProfile:
     """
 
     payload = None
+    error = None  # Why the payload could not be fetched
 
     def __init__(
         self, manager, id, name, solution, type, createdby, lastupdatedby, lastupdatedon
@@ -260,6 +481,7 @@ class SDWANFeatureProfile:
             #     urlp = api_url + "policy-object/"
             case _:
                 print(f"{self.type} type not supported for SD-WAN feature profile")
+                self.error = f"{self.type} type not supported"
                 return
 
         # Get profile_id payload
@@ -275,118 +497,22 @@ class SDWANFeatureProfile:
         except requests.exceptions.RequestException as e:
             print(f"An unexpected error occurred: {e}")
             self.payload = None  # Indicate failure to fetch
+            self.error = str(e)
             if hasattr(e, "response") and e.response is not None:
                 print(f"Status: {e.response.status_code}, Response: {e.response.text}")
             return
 
 
 # -----------------------------------------------------------------------------
-class SDWANProfileTable:
-    def __init__(self, manager: Manager):
-        self.manager = manager
-        self.profiles_table = []  # This will now store generic Profile objects
-
-        api_path_summary = "/v1/feature-profile/sdwan/"
-
-        print("\n--- Collecting Feature Profiles ---")
-
-        # Get list of profiles (summary)
-        try:
-            summary_data = self.manager._api_get(api_path_summary)
-            save_json(
-                summary_data,
-                "profiles_table",
-                "output/payloads/feature_profiles/sdwan/",
-            )  # save payload response
-
-        except requests.exceptions.RequestException as e:
-            print(f"An unexpected error occurred: {e}")
-            if hasattr(e, "response") and e.response is not None:
-                print(f"Status: {e.response.status_code}, Response: {e.response.text}")
-            return
-
-        # For each summary item, fetch full details and create a Profile object
-        for item in summary_data:
-            profile_id = item["profileId"]
-            profile_name = item["profileName"]
-            profile_solution = item["solution"]
-            profile_type = item["profileType"]
-            profile_createdby = item["createdBy"]
-            profile_lastupdated = item["lastUpdatedBy"]
-            profile_lastUpdatedOn = item["lastUpdatedOn"]
-
-            # Use SDWANFeatureProfile to fetch the detailed payload
-            # This class makes the API call for details of a single profile
-            sdwan_feature_profile_fetcher = SDWANFeatureProfile(
-                self.manager,
-                profile_id,
-                profile_name,
-                profile_solution,
-                profile_type,
-                profile_createdby,
-                profile_lastupdated,
-                profile_lastUpdatedOn,
-            )
-            if not sdwan_feature_profile_fetcher.payload:
-                print(
-                    f"Skipping profile {profile_name} ({profile_id}) due to unsupported type or fetch error."
-                )
-                continue
-            full_profile_payload = sdwan_feature_profile_fetcher.payload
-            save_json(
-                full_profile_payload,
-                f"{profile_name}",
-                "output/payloads/feature_profiles/sdwan/",
-            )
-
-            # Now, use the full_profile_payload to create a generic Profile object
-            # Using .get() for robustness in case a key is missing in the payload
-            profile = Profile(
-                id=full_profile_payload.get("profileId"),
-                name=full_profile_payload.get("profileName"),
-                solution=full_profile_payload.get("solution"),
-                type=full_profile_payload.get("profileType"),
-                description=full_profile_payload.get("description"),
-                lastUpdatedBy=full_profile_payload.get("lastUpdatedBy"),
-                lastUpdatedOn=full_profile_payload.get("lastUpdatedOn"),
-                createdBy=full_profile_payload.get("createdBy"),
-                createdOn=full_profile_payload.get("createdOn"),
-                profileParcelCount=full_profile_payload.get("profileParcelCount"),
-                origin=full_profile_payload.get("origin"),
-            )
-            self.profiles_table.append(profile)
-
-    def list(self):
-        print("\n--- SD-WAN Feature Profiles\n")
-        for profile in self.profiles_table:
-            profile.display()  # Use the display method of the generic Profile object
-
-    def list_categories(self):
-        print("\n--- SD-WAN Feature Profiles per category\n")
-
-        categories = [
-            "system",
-            "transport",
-            "service",
-            "cli",
-            "policy-object",
-        ]
+class SDWANProfileTable(FeatureProfileTable):
+    """
+    SD-WAN feature profiles (/v1/feature-profile/sdwan/).
+    """
 
-        for category_item in categories:
-            print(f"\n--- Category: {category_item.upper()} ---")
-            found_in_category = False
-            for profile in self.profiles_table:
-                if profile.type == category_item:
-                    profile.display()
-                    found_in_category = True
-            if not found_in_category:
-                print(f"    No profiles found for category '{category_item}'.")
-
-    def save_profiles(self, directory="output/feature_profiles/sdwan"):
-        print(f"\n--- Saving SD-WAN Feature Profiles in {directory}\n")
-        # Use the save_to_file method of the generic Profile object
-        for profile in self.profiles_table:
-            profile.save_to_file(directory)
+    solution = "sdwan"
+    label = "SD-WAN"
+    kind = "sdwan"
+    fetcher = SDWANFeatureProfile
 
 
 # -----------------------------------------------------------------------------
@@ -465,13 +591,22 @@ class Device:
                 )
         # Add more details as needed
 
-    def save_to_file(self, directory="output/config_groups/associated"):
+    def save_to_file(
+        self,
+        directory="output/config_groups/associated",
+        compact: Optional[bool] = None,
+        compression: Optional[str] = None,
+    ):
         """
         Saves the Device object's data to a JSON file.
 
         Args:
             directory (str): The directory where the file will be saved.
             Defaults to 'output/config_groups/associated'.
+            compact (bool, optional): write without indentation.
+            Defaults to the sdwan_json_compact environment variable.
+            compression (str, optional): "gzip" or "xz".
+            Defaults to the sdwan_payload_compression environment variable.
         """
         if not os.path.exists(directory):
             os.makedirs(directory, exist_ok=True)
@@ -487,11 +622,11 @@ class Device:
         else:
             filename = f"{sanitized_name}.json"
 
-        filepath = os.path.join(directory, filename)
+        filepath = compressed_path(os.path.join(directory, filename), compression)
 
         try:
-            with open(filepath, "w") as f:
-                json.dump(self.to_dict(), f, indent=4)
+            with open_payload(filepath, "w") as f:
+                json_backend.dump(self.to_dict(), f, compact=compact)
             print(f"Successfully saved Device '{self.host_name}' to '{filepath}'")
         except Exception as e:
             print(f"Error saving Device '{self.host_name}' to '{filepath}': {e}")
@@ -516,6 +651,9 @@ class Profile:
         createdOn,
         profileParcelCount,
         origin,
+        details: Optional[dict] = None,
+        details_loader: Optional[Callable[[], tuple]] = None,
+        details_loaded: bool = False,
     ):
         self.id = id
         self.name = name
@@ -528,6 +666,55 @@ class Profile:
         self.createdOn = self._convert_timestamp_to_datetime(createdOn)
         self.profileParcelCount = profileParcelCount
         self.origin = origin
+        self._details = details
+        self._details_loader = details_loader  # Returns (payload, error), see details
+        self._details_lock = threading.Lock()
+        self.details_error = None
+        self.details_loaded = details_loaded or details is not None  # Details fetched successfully
+
+    @classmethod
+    def from_payload(
+        cls,
+        payload: dict,
+        details: Optional[dict] = None,
+        details_loader: Optional[Callable[[], tuple]] = None,
+        details_loaded: bool = False,
+    ) -> "Profile":
+        """
+        Builds a Profile from a summary item or a details=true payload.
+        """
+        # Using .get() for robustness in case a key is missing in the payload
+        return cls(
+            id=payload.get("profileId"),
+            name=payload.get("profileName"),
+            solution=payload.get("solution"),
+            type=payload.get("profileType"),
+            description=payload.get("description"),
+            lastUpdatedBy=payload.get("lastUpdatedBy"),
+            lastUpdatedOn=payload.get("lastUpdatedOn"),
+            createdBy=payload.get("createdBy"),
+            createdOn=payload.get("createdOn"),
+            profileParcelCount=payload.get("profileParcelCount"),
+            origin=payload.get("origin"),
+            details=details,
+            details_loader=details_loader,
+            details_loaded=details_loaded,
+        )
+
+    @property
+    def details(self) -> Optional[dict]:
+        """
+        The details=true payload of the profile, fetched the first time it is read
+        and then kept; a failed fetch is retried on the next read, with the reason
+        in details_error. Tables drop the payload once the profile is built from it
+        (eager mode), so reading it fetches it again (from the sync state if enabled).
+        """
+        if self._details is None and self._details_loader is not None:
+            with self._details_lock:
+                if self._details is None:
+                    self._details, self.details_error = self._details_loader()
+                    self.details_loaded = self.details_loaded or self._details is not None
+        return self._details
 
     def _convert_timestamp_to_datetime(self, timestamp):
         """Converts a Unix timestamp (milliseconds) to a datetime object."""
@@ -557,7 +744,12 @@ class Profile:
             "origin": self.origin,
         }
 
-    def save_to_file(self, base_directory="output/feature_profiles"):
+    def save_to_file(
+        self,
+        base_directory="output/feature_profiles",
+        compact: Optional[bool] = None,
+        compression: Optional[str] = None,
+    ):
         """
         Saves the Profile object's data to a JSON file within a subfolder
         based on its type (self.type).
@@ -565,6 +757,10 @@ class Profile:
         Args:
             base_directory (str): The base directory where type-specific subfolders
             will be created. Defaults to 'output/feature_profiles'.
+            compact (bool, optional): write without indentation.
+            Defaults to the sdwan_json_compact environment variable.
+            compression (str, optional): "gzip" or "xz".
+            Defaults to the sdwan_payload_compression environment variable.
         """
         if not self.type:
             print(
@@ -608,13 +804,11 @@ class Profile:
             filename = f"{sanitized_name}.json"
 
         # Construct the full file path
-        filepath = os.path.join(target_directory, filename)
+        filepath = compressed_path(os.path.join(target_directory, filename), compression)
 
         try:
-            with open(filepath, "w") as f:
-                json.dump(
-                    self.to_dict(), f, indent=4
-                )  # Use indent=4 for pretty-printing JSON
+            with open_payload(filepath, "w") as f:
+                json_backend.dump(self.to_dict(), f, compact=compact)
             print(f"Successfully saved Profile '{self.name}' to '{filepath}'")
         except Exception as e:
             print(f"Error saving Profile '{self.name}' to '{filepath}': {e}")
@@ -797,7 +991,12 @@ class ConfigGroup:
                 )
         return variables_list
 
-    def save_to_file(self, base_output_directory="output/config_groups"):
+    def save_to_file(
+        self,
+        base_output_directory="output/config_groups",
+        compact: Optional[bool] = None,
+        compression: Optional[str] = None,
+    ):
         """
         Saves the ConfigGroup object's data to a JSON file in a 'groups' subfolder,
         and also saves associated devices to an 'associated' subfolder within
@@ -806,6 +1005,10 @@ class ConfigGroup:
         Args:
             base_output_directory (str): The root directory for saving config group related data.
             Defaults to 'output/config_groups'.
+            compact (bool, optional): write without indentation.
+            Defaults to the sdwan_json_compact environment variable.
+            compression (str, optional): "gzip" or "xz".
+            Defaults to the sdwan_payload_compression environment variable.
         """
         # Directory for the config group JSON itself (e.g., output/config_groups/groups)
         group_json_directory = os.path.join(base_output_directory, "groups")
@@ -823,11 +1026,11 @@ class ConfigGroup:
         else:
             filename = f"{sanitized_name}.json"
 
-        filepath = os.path.join(group_json_directory, filename)
+        filepath = compressed_path(os.path.join(group_json_directory, filename), compression)
 
         try:
-            with open(filepath, "w") as f:
-                json.dump(self.to_dict(), f, indent=4)
+            with open_payload(filepath, "w") as f:
+                json_backend.dump(self.to_dict(), f, compact=compact)
             print(f"Successfully saved ConfigGroup '{self.name}' to '{filepath}'")
         except Exception as e:
             print(f"Error saving ConfigGroup '{self.name}' to '{filepath}': {e}")
@@ -847,7 +1050,7 @@ class ConfigGroup:
             )
             for device in self.devices:
                 device.save_to_file(
-                    config_group_devices_directory
+                    config_group_devices_directory, compact=compact, compression=compression
                 )  # Call the new method on Device
 
     def __repr__(self):
@@ -893,16 +1096,30 @@ class ConfigGroupTable:
         manager: Manager,
         sdwan_profiles_table: Optional["SDWANProfileTable"] = None,
         sdrouting_profiles_table: Optional["SDRoutingProfileTable"] = None,
+        max_workers: int = 1,
+        sync_state: Optional[SyncState] = None,
     ):
         """
         Initializes ConfigGroupTable and fetches config group data.
         Optionally takes SDWANProfileTable and SDRoutingProfileTable instances to save all data together.
+
+        With max_workers > 1, the device/associate and device/variables calls of all
+        groups are dispatched concurrently (at most max_workers in flight) and each
+        ConfigGroup is built as soon as both of its results are in. The table keeps
+        the order of the summary either way.
+
+        With a sync_state, these calls are only made for the groups whose summary
+        (version, lastUpdatedOn, device counts) changed since the last run.
         """
 
         self.manager = manager
         self.sdwan_profiles_table = sdwan_profiles_table
         self.sdrouting_profiles_table = sdrouting_profiles_table
+        self.max_workers = max_workers
+        self.sync_state = sync_state
         self.config_groups_objects = []
+        self.group_timings: Dict[str, dict] = {}  # Group id -> API time per call, see slowest_groups()
+        self.reindex()
 
         # API endpoint for config group summary
         api_path = "/v1/config-group/"
@@ -922,98 +1139,271 @@ class ConfigGroupTable:
             return
 
         print("\n--- Collecting Config Groups and Associated Data ---")
-        # Iterate through the raw data and create ConfigGroup objects
-        for group_dict in summary_data:  # Iterate through the summary data
-            config_group_id = group_dict.get("id")
-            config_group_name = group_dict.get("name", "Unknown Config Group")
-            number_of_devices = group_dict.get("numberOfDevices", 0)
-            detailed_devices_list_raw = []  # Will store raw device dictionaries
-            device_variables_raw = []  # Will store raw device variables (extracted from API response)
+        # One slot per summary entry, filled as the groups are assembled
+        config_groups: List[Optional[ConfigGroup]] = [None] * len(summary_data)
+        results: Dict[int, Dict[str, list]] = {}  # Summary index -> {"associate": [...], "variables": [...]}
+        jobs = []
+        for index, group_dict in enumerate(summary_data):
+            # Unchanged since the last sync: rebuild from the stored devices and variables
+            if self.sync_state and group_dict.get("id"):
+                stamp = self.sync_state.stamp("config_groups", group_dict)
+                stored = self.sync_state.lookup("config_groups", group_dict["id"], stamp)
+                if stored is not None:
+                    config_groups[index] = self._build_config_group(
+                        group_dict, stored["associate"], stored["variables"]
+                    )
+                    continue
 
             # If there are devices associated, fetch their details from the specific API
-            if number_of_devices > 0 and config_group_id:
-                # Corrected API endpoint for associated devices
-                device_api_path = f"/v1/config-group/{config_group_id}/device/associate"
-                print(
-                    f"  Fetching {number_of_devices} devices for Config Group '{config_group_name}' (ID: {config_group_id})"
-                )
-                try:
-                    # The API returns a dictionary with a 'devices' key
-                    response_data = self.manager._api_get(device_api_path)
-                    detailed_devices_list_raw = response_data.get("devices", [])
-                    save_json(
-                        detailed_devices_list_raw,
-                        f"{config_group_name}_associated_devices",
-                        "output/payloads/config_groups/associated/",
-                    )
+            if group_dict.get("numberOfDevices", 0) > 0 and group_dict.get("id"):
+                results[index] = {}
+                jobs.append((index, "associate"))
+                jobs.append((index, "variables"))
+            else:
+                config_groups[index] = self._build_config_group(group_dict, [], [])
+                self._store_group(group_dict, [], [])
 
-                except requests.exceptions.RequestException as e:
-                    print(
-                        f"Error fetching devices for Config Group '{config_group_name}' (ID: {config_group_id}): {e}"
-                    )
-                    if hasattr(e, "response") and e.response is not None:
-                        print(
-                            f"Status: {e.response.status_code}, Response: {e.response.text}"
-                        )
-                    # Keep detailed_devices_list_raw as empty if there's an error
+        pool = None
+        if self.max_workers > 1 and len(jobs) > 1:
+            pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="config-groups")
+        try:
+            if pool:
+                futures = [pool.submit(self._fetch_group_data, summary_data, job) for job in jobs]
+                completed = (future.result() for future in as_completed(futures))
+            else:
+                completed = (self._fetch_group_data(summary_data, job) for job in jobs)
 
-                # Fetch device variables for this config group
-                variables_api_path = (
-                    f"/v1/config-group/{config_group_id}/device/variables"
-                )
-                print(
-                    f"  Fetching device variables for Config Group '{config_group_name}' (ID: {config_group_id})"
+            for index, kind, data, seconds in completed:
+                group_dict = summary_data[index]
+                timing = self.group_timings.setdefault(
+                    group_dict["id"], {"name": group_dict.get("name"), "seconds": 0.0}
                 )
-                try:
-                    # This API returns a dictionary with a 'devices' key, containing the list of device variables
-                    full_variables_response = self.manager._api_get(variables_api_path)
-                    # Save the full response for debugging/inspection
-                    save_json(
-                        full_variables_response,
-                        f"{config_group_name}_device_variables_full_payload",
-                        "output/payloads/config_groups/values/",
+                timing[f"{kind}_seconds"] = round(seconds, 4)
+                timing["seconds"] = round(timing["seconds"] + seconds, 4)
+
+                results[index][kind] = data
+                if len(results[index]) == 2:
+                    group_results = results.pop(index)
+                    config_groups[index] = self._build_config_group(
+                        group_dict, group_results["associate"] or [], group_results["variables"] or []
                     )
+                    # A failed call returned None: the group is fetched again next time
+                    if None not in group_results.values():
+                        self._store_group(
+                            group_dict, group_results["associate"], group_results["variables"]
+                        )
+        finally:
+            if pool:
+                pool.shutdown()
 
-                    # Extract the actual list of device variables from the 'devices' key
-                    device_variables_raw = full_variables_response.get("devices", [])
+        self.config_groups_objects = [group for group in config_groups if group is not None]
+        self.reindex()
 
-                except requests.exceptions.RequestException as e:
-                    print(
-                        f"Error fetching device variables for Config Group '{config_group_name}' (ID: {config_group_id}): {e}"
-                    )
-                    if hasattr(e, "response") and e.response is not None:
-                        print(
-                            f"Status: {e.response.status_code}, Response: {e.response.text}"
-                        )
-                    device_variables_raw = []  # Keep empty on error
-
-            # Create the ConfigGroup object, passing profile, device, and device variable dictionaries
-            config_group = ConfigGroup(
-                id=config_group_id,
-                name=config_group_name,
-                description=group_dict.get("description"),
-                source=group_dict.get("source"),
-                solution=group_dict.get("solution"),
-                lastUpdatedBy=group_dict.get("lastUpdatedBy"),
-                lastUpdatedOn=group_dict.get("lastUpdatedOn"),
-                createdBy=group_dict.get("createdBy"),
-                createdOn=group_dict.get("createdOn"),
-                profiles_data=group_dict.get("profiles"),  # Pass the profiles dict
-                version=group_dict.get("version"),
-                state=group_dict.get("state"),
-                devices_data=detailed_devices_list_raw,  # Pass the device dictionaries
-                numberOfDevices=number_of_devices,
-                numberOfDevicesUpToDate=group_dict.get("numberOfDevicesUpToDate"),
-                origin=group_dict.get("origin"),
-                copyInfo=group_dict.get("copyInfo"),
-                originInfo=group_dict.get("originInfo"),
-                topology=group_dict.get("topology"),
-                fullConfigCli=group_dict.get("fullConfigCli"),
-                iosConfigCli=group_dict.get("iosConfigCli"),
-                versionIncrementReason=group_dict.get("versionIncrementReason"),
-                device_variables_data=device_variables_raw,  # Pass the extracted device variables list
+        if self.sync_state:
+            deleted = self.sync_state.prune(
+                "config_groups", [group_dict.get("id") for group_dict in summary_data]
+            )
+            self.sync_state.save()
+            self.sync_state.print_report("config_groups", deleted)
+
+    def _store_group(self, group_dict: dict, devices: list, variables: list):
+        if self.sync_state and group_dict.get("id"):
+            self.sync_state.store(
+                "config_groups",
+                group_dict["id"],
+                group_dict.get("name"),
+                self.sync_state.stamp("config_groups", group_dict),
+                {"associate": devices, "variables": variables},
+            )
+
+    def _fetch_group_data(self, summary_data: list, job: tuple):
+        """
+        Runs one device/associate or device/variables call of a group.
+
+        Returns:
+            tuple: (summary index, kind, list of dicts or None on error, seconds spent).
+        """
+        index, kind = job
+        group_dict = summary_data[index]
+        start = time.perf_counter()
+        if kind == "associate":
+            data = self._fetch_associated_devices(group_dict)
+        else:
+            data = self._fetch_device_variables(group_dict)
+        return index, kind, data, time.perf_counter() - start
+
+    def _fetch_associated_devices(self, group_dict: dict) -> list:
+        config_group_id = group_dict.get("id")
+        config_group_name = group_dict.get("name", "Unknown Config Group")
+        number_of_devices = group_dict.get("numberOfDevices", 0)
+
+        # Corrected API endpoint for associated devices
+        device_api_path = f"/v1/config-group/{config_group_id}/device/associate"
+        print(
+            f"  Fetching {number_of_devices} devices for Config Group '{config_group_name}' (ID: {config_group_id})"
+        )
+        try:
+            # The API returns a dictionary with a 'devices' key
+            response_data = self.manager._api_get(device_api_path)
+            detailed_devices_list_raw = response_data.get("devices", [])
+            save_json(
+                detailed_devices_list_raw,
+                f"{config_group_name}_associated_devices",
+                "output/payloads/config_groups/associated/",
+            )
+            return detailed_devices_list_raw
+
+        except requests.exceptions.RequestException as e:
+            print(
+                f"Error fetching devices for Config Group '{config_group_name}' (ID: {config_group_id}): {e}"
+            )
+            if hasattr(e, "response") and e.response is not None:
+                print(f"Status: {e.response.status_code}, Response: {e.response.text}")
+            return None  # No devices if there's an error
+
+    def _fetch_device_variables(self, group_dict: dict) -> list:
+        config_group_id = group_dict.get("id")
+        config_group_name = group_dict.get("name", "Unknown Config Group")
+
+        # Fetch device variables for this config group
+        variables_api_path = f"/v1/config-group/{config_group_id}/device/variables"
+        print(
+            f"  Fetching device variables for Config Group '{config_group_name}' (ID: {config_group_id})"
+        )
+        try:
+            # This API returns a dictionary with a 'devices' key, containing the list of device variables
+            full_variables_response = self.manager._api_get(variables_api_path)
+            # Save the full response for debugging/inspection
+            save_json(
+                full_variables_response,
+                f"{config_group_name}_device_variables_full_payload",
+                "output/payloads/config_groups/values/",
+            )
+
+            # Extract the actual list of device variables from the 'devices' key
+            return full_variables_response.get("devices", [])
+
+        except requests.exceptions.RequestException as e:
+            print(
+                f"Error fetching device variables for Config Group '{config_group_name}' (ID: {config_group_id}): {e}"
+            )
+            if hasattr(e, "response") and e.response is not None:
+                print(f"Status: {e.response.status_code}, Response: {e.response.text}")
+            return None  # Keep empty on error
+
+    def _build_config_group(
+        self, group_dict: dict, detailed_devices_list_raw: list, device_variables_raw: list
+    ) -> "ConfigGroup":
+        # Create the ConfigGroup object, passing profile, device, and device variable dictionaries
+        return ConfigGroup(
+            id=group_dict.get("id"),
+            name=group_dict.get("name", "Unknown Config Group"),
+            description=group_dict.get("description"),
+            source=group_dict.get("source"),
+            solution=group_dict.get("solution"),
+            lastUpdatedBy=group_dict.get("lastUpdatedBy"),
+            lastUpdatedOn=group_dict.get("lastUpdatedOn"),
+            createdBy=group_dict.get("createdBy"),
+            createdOn=group_dict.get("createdOn"),
+            profiles_data=group_dict.get("profiles"),  # Pass the profiles dict
+            version=group_dict.get("version"),
+            state=group_dict.get("state"),
+            devices_data=detailed_devices_list_raw,  # Pass the device dictionaries
+            numberOfDevices=group_dict.get("numberOfDevices", 0),
+            numberOfDevicesUpToDate=group_dict.get("numberOfDevicesUpToDate"),
+            origin=group_dict.get("origin"),
+            copyInfo=group_dict.get("copyInfo"),
+            originInfo=group_dict.get("originInfo"),
+            topology=group_dict.get("topology"),
+            fullConfigCli=group_dict.get("fullConfigCli"),
+            iosConfigCli=group_dict.get("iosConfigCli"),
+            versionIncrementReason=group_dict.get("versionIncrementReason"),
+            device_variables_data=device_variables_raw,  # Pass the extracted device variables list
+        )
+
+    def reindex(self):
+        """
+        Rebuilds the lookup indexes behind group_of_device(), device_by_hostname(),
+        devices_at_site(), groups_using_profile() and profiles_of_type().
+        Call it after changing config_groups_objects or the profile tables.
+        """
+        self._group_by_device_id: Dict[str, ConfigGroup] = {}
+        self._device_by_hostname: Dict[str, Device] = {}
+        self._devices_by_site_id: Dict[str, List[Device]] = {}
+        self._groups_by_profile_id: Dict[str, List[ConfigGroup]] = {}
+        self._profiles_by_type: Dict[str, List[Profile]] = {}
+
+        # Profiles of the tables first, then those only known from the groups
+        profiles = [
+            profile
+            for table in (self.sdwan_profiles_table, self.sdrouting_profiles_table)
+            if table
+            for profile in table.profiles_table
+        ]
+        for group in self.config_groups_objects:
+            for device in group.devices:
+                if device.id:
+                    self._group_by_device_id[device.id] = group
+                if device.host_name:
+                    self._device_by_hostname[device.host_name] = device
+                if device.site_id is not None:
+                    self._devices_by_site_id.setdefault(str(device.site_id), []).append(device)
+            for profile in group.profiles:
+                self._groups_by_profile_id.setdefault(profile.id, []).append(group)
+            profiles.extend(group.profiles)
+
+        seen_profile_ids = set()
+        for profile in profiles:
+            if profile.id not in seen_profile_ids:
+                seen_profile_ids.add(profile.id)
+                self._profiles_by_type.setdefault(profile.type, []).append(profile)
+
+    def group_of_device(self, device_id: str) -> Optional["ConfigGroup"]:
+        """
+        Returns the config group a device (id from device/associate) is associated with.
+        """
+        return self._group_by_device_id.get(device_id)
+
+    def device_by_hostname(self, host_name: str) -> Optional["Device"]:
+        return self._device_by_hostname.get(host_name)
+
+    def devices_at_site(self, site_id) -> List["Device"]:
+        """
+        Returns the devices of a site, site_id as a number or a string.
+        """
+        return list(self._devices_by_site_id.get(str(site_id), []))
+
+    def groups_using_profile(self, profile_id: str) -> List["ConfigGroup"]:
+        return list(self._groups_by_profile_id.get(profile_id, []))
+
+    def profiles_of_type(self, profile_type: str) -> List["Profile"]:
+        """
+        Returns the feature profiles of a type ("system", "transport", ...), from
+        the profile tables and the profiles referenced by the config groups.
+        """
+        return list(self._profiles_by_type.get(profile_type, []))
+
+    def slowest_groups(self, count: int = 5) -> List[dict]:
+        """
+        Returns the groups whose device/associate + device/variables calls took the longest.
+
+        Returns:
+            list: [{"id", "name", "seconds", "associate_seconds", "variables_seconds"}, ...]
+        """
+        timings = [{"id": group_id, **timing} for group_id, timing in self.group_timings.items()]
+        return sorted(timings, key=lambda timing: timing["seconds"], reverse=True)[:count]
+
+    def print_timings(self, count: int = 10):
+        print(f"\n--- Slowest Config Groups (API time, top {count}) ---\n")
+        slowest = self.slowest_groups(count)
+        if not slowest:
+            print("    No device data was fetched.")
+        for timing in slowest:
+            print(
+                f"    {timing['seconds']:8.3f}s  {timing['name']} (ID: {timing['id']})"
+                f"  associate {timing.get('associate_seconds', 0):.3f}s"
+                f"  variables {timing.get('variables_seconds', 0):.3f}s"
             )
-            self.config_groups_objects.append(config_group)
 
     def display(self):
         print("\n--- Displaying ConfigGroup Objects ---")
@@ -1064,11 +1454,11 @@ class ConfigGroupTable:
                 else:
                     filename = f"{sanitized_name}_variables.json"
 
-                filepath = os.path.join(directory, filename)
+                filepath = compressed_path(os.path.join(directory, filename))
 
                 try:
-                    with open(filepath, "w") as f:
-                        json.dump(variables_to_save, f, indent=4)
+                    with open_payload(filepath, "w") as f:
+                        json_backend.dump(variables_to_save, f)
                     print(
                         f"Successfully saved variables for ConfigGroup '{cg_obj.name}' to '{filepath}'"
                     )
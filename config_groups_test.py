@@ -30,11 +30,22 @@
 import logging
 
 # Import the new unified Manager class and the credentials function
-from config_groups import ConfigGroupTable, SDRoutingProfileTable, SDWANProfileTable
+from config_groups import (
+    ConfigGroupTable,
+    SDRoutingProfileTable,
+    SDWANProfileTable,
+    get_lazy_profiles_from_env,
+    get_max_workers_from_env,
+)
 
 # Import the new unified Manager class and the credentials function
+from auth import get_auth_from_env
+from cassette import get_cassette_from_env
 from manager import Manager, get_manager_credentials_from_env
+from payloads import check_compression_from_env
 from prompt import Prompt  # Ensure this import is present
+from session_cache import get_session_cache_from_env
+from sync_state import get_sync_state_from_env
 
 
 # -----------------------------------------------------------------------------
@@ -60,6 +71,26 @@ def access_groups():
     config_group_table.access_data()
 
 
+# -----------------------------------------------------------------------------
+def slowest_groups():
+    config_group_table.print_timings()
+
+
+# -----------------------------------------------------------------------------
+def find_device():
+    host_name = input("Enter device hostname : ")
+    device = config_group_table.device_by_hostname(host_name)
+    if device is None:
+        print(f"No device '{host_name}' associated with a Configuration Group")
+        return
+    config_group = config_group_table.group_of_device(device.id)
+    print(f"\n{host_name} is associated with Configuration Group '{config_group.name}'")
+    device.display()
+    print(f"\nDevices of site {device.site_id}:")
+    for site_device in config_group_table.devices_at_site(device.site_id):
+        print(f"  - {site_device.host_name} ({site_device.device_ip})")
+
+
 # -----------------------------------------------------------------------------
 def list_sdwan_profiles():
     sdwan_profiles_table.list()
@@ -99,15 +130,35 @@ if __name__ == "__main__":
         level=logging.INFO,
     )
 
-    print("\n--- Authenticating to SD-WAN Manager ---")
+    print("\n--- SD-WAN Manager session (login on the first API call) ---")
     host, port, user, password = get_manager_credentials_from_env()
-    manager = Manager(host, port, user, password)
+    check_compression_from_env()  # Fail early on an invalid sdwan_payload_compression
+    manager = Manager(
+        host,
+        port,
+        user,
+        password,
+        session_cache=get_session_cache_from_env(),
+        auth=get_auth_from_env(),
+        cassette=get_cassette_from_env(),
+    )
 
     # Collecting Config Groups and Feature Profiles from SD-WAN Manager
-    sdwan_profiles_table = SDWANProfileTable(manager)
-    sdrouting_profiles_table = SDRoutingProfileTable(manager)
+    max_workers = get_max_workers_from_env()
+    sync_state = get_sync_state_from_env(host, port, user, manager.tenant)
+    lazy = get_lazy_profiles_from_env()
+    sdwan_profiles_table = SDWANProfileTable(
+        manager, max_workers=max_workers, sync_state=sync_state, lazy=lazy
+    )
+    sdrouting_profiles_table = SDRoutingProfileTable(
+        manager, max_workers=max_workers, sync_state=sync_state, lazy=lazy
+    )
     config_group_table = ConfigGroupTable(
-        manager, sdwan_profiles_table, sdrouting_profiles_table
+        manager,
+        sdwan_profiles_table,
+        sdrouting_profiles_table,
+        max_workers=max_workers,
+        sync_state=sync_state,
     )
 
     # Menu
@@ -119,6 +170,8 @@ if __name__ == "__main__":
         "List SD-Routing Feature Profiles per category": list_sdrouting_profile_categories,
         "Save Configuration Groups to files (and all Feature Profiles)": save_groups,
         "Example: Accessing data from the first ConfigGroup object": access_groups,
+        "Show slowest Configuration Groups to collect": slowest_groups,
+        "Find the Configuration Group of a device": find_device,
         "Quit": quit,
     }
 
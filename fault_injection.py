@@ -0,0 +1,495 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Fault-injection scenarios for the collectors
+#
+# Description:
+#   Runs the collectors against the mock SD-WAN Manager (mock_manager.py)
+#   under degraded conditions and measures, for each collector, the
+#   completion time and the data completeness (collected / expected items),
+#   together with the retries and re-logins Manager needed.
+#
+#   Scenarios:
+#     baseline             no fault
+#     slow_tail            lognormal latency, median 20 ms with a multi-second tail
+#     server_errors        5% of the calls answer 500
+#     dropped_connections  3% of the connections are closed without answer
+#     session_expiry       sessions and tokens are invalidated every 25 API calls
+#     degraded             all of the above, milder, at the same time
+#
+#   cluster-auth checks that every node of a two-node ClusterManager logs in
+#   on its own with each authentication strategy (no node is ejected).
+#   auth-fallback checks that AutoAuth picks JWT on 20.18+, falls back to a
+#   session login on older managers and reports rejected credentials.
+#
+#   Example:
+#     python fault_injection.py run --devices 5000 --groups 50
+#     python fault_injection.py run --scenario slow_tail --scenario session_expiry --output faults.json
+#     python fault_injection.py cluster-auth
+#     python fault_injection.py auth-fallback
+#
+# =========================================================================
+
+import contextlib
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import click
+import requests
+import tabulate
+
+import json_backend
+from mock_manager import (
+    EndpointFault,
+    LatencyDistribution,
+    MockManager,
+    MockManagerServer,
+    SyntheticFleet,
+)
+
+
+# -----------------------------------------------------------------------------
+class FaultScenario:
+    """
+    A named set of fault rules applied by the mock manager.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        faults: Callable[[], List[EndpointFault]] = list,
+        expire_every: int = 0,
+    ):
+        """
+        Args:
+            name (str): scenario name.
+            description (str): one line shown in the report.
+            faults (callable): returns fresh EndpointFault rules.
+            expire_every (int): forced session expiry every N API calls (0: never).
+        """
+        self.name = name
+        self.description = description
+        self.faults = faults
+        self.expire_every = expire_every
+
+
+SCENARIOS: Dict[str, FaultScenario] = {
+    scenario.name: scenario
+    for scenario in [
+        FaultScenario("baseline", "no fault"),
+        FaultScenario(
+            "slow_tail",
+            "lognormal latency, median 20 ms, sigma 1.2",
+            lambda: [EndpointFault(".*", latency=LatencyDistribution("lognormal", 0.02, 1.2))],
+        ),
+        FaultScenario(
+            "server_errors",
+            "5% of the calls answer 500",
+            lambda: [EndpointFault(".*", error_rate=0.05, status=500)],
+        ),
+        FaultScenario(
+            "dropped_connections",
+            "3% of the connections closed without answer",
+            lambda: [EndpointFault(".*", drop_rate=0.03)],
+        ),
+        FaultScenario("session_expiry", "sessions expire every 25 API calls", expire_every=25),
+        FaultScenario(
+            "degraded",
+            "lognormal latency + 2% errors + 1% drops + expiry every 50 calls",
+            lambda: [
+                EndpointFault(
+                    ".*",
+                    latency=LatencyDistribution("lognormal", 0.01, 1.0),
+                    error_rate=0.02,
+                    drop_rate=0.01,
+                )
+            ],
+            expire_every=50,
+        ),
+    ]
+}
+
+
+# -----------------------------------------------------------------------------
+def _collect_sdwan_profiles(manager, fleet: SyntheticFleet) -> Tuple[int, int]:
+    from config_groups import SDWANProfileTable, get_max_workers_from_env
+
+    table = SDWANProfileTable(manager, max_workers=get_max_workers_from_env())
+    return len(table.profiles_table), fleet.sdwan_profiles
+
+
+def _collect_sdrouting_profiles(manager, fleet: SyntheticFleet) -> Tuple[int, int]:
+    from config_groups import SDRoutingProfileTable, get_max_workers_from_env
+
+    table = SDRoutingProfileTable(manager, max_workers=get_max_workers_from_env())
+    return len(table.profiles_table), fleet.sdrouting_profiles
+
+
+def _collect_config_groups(manager, fleet: SyntheticFleet) -> Tuple[int, int]:
+    """
+    Counts the groups, associated devices and device variable sets collected.
+    """
+    from config_groups import ConfigGroupTable, get_max_workers_from_env
+
+    groups = ConfigGroupTable(manager, max_workers=get_max_workers_from_env()).config_groups_objects
+    devices = [device for group in groups for device in group.devices]
+    collected = len(groups) + len(devices) + sum(1 for device in devices if device.variables)
+    return collected, fleet.groups + 2 * fleet.devices
+
+
+def _collect_device_inventory(manager, fleet: SyntheticFleet) -> Tuple[int, int]:
+    """
+    Same API call as "device.py ls".
+    """
+    try:
+        collected = sum(1 for _ in manager.api_stream("/system/device/vedges"))
+    except requests.exceptions.RequestException:
+        collected = 0
+    return collected, fleet.devices
+
+
+COLLECTORS: Dict[str, Callable] = {
+    "sdwan_profile_table": _collect_sdwan_profiles,
+    "sdrouting_profile_table": _collect_sdrouting_profiles,
+    "config_group_table": _collect_config_groups,
+    "device_inventory": _collect_device_inventory,
+}
+
+
+# -----------------------------------------------------------------------------
+def run_collector(
+    collector: str,
+    mock: MockManager,
+    port: int,
+    manager_options: Optional[dict] = None,
+) -> dict:
+    """
+    Runs one collector against a running mock and measures time and completeness.
+    """
+    from manager import Manager
+
+    manager = Manager("127.0.0.1", port, mock.user, mock.password, **(manager_options or {}))
+    before = (mock.injected_errors, mock.dropped_connections, mock.expirations)
+    error = None
+    collected, expected = 0, 1
+
+    with tempfile.TemporaryDirectory(prefix="sdwan_faults_") as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # Payloads saved by the collectors land in the scratch folder
+        start = time.perf_counter()
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                collected, expected = COLLECTORS[collector](manager, mock.fleet)
+        except Exception as e:  # Report the crash and keep going with the other collectors
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            seconds = time.perf_counter() - start
+            os.chdir(cwd)
+            manager.close()
+
+    retry = manager.retry_stats.to_dict()
+    return {
+        "collector": collector,
+        "seconds": round(seconds, 3),
+        "collected": collected,
+        "expected": expected,
+        "completeness": round(collected / expected, 4) if expected else 1.0,
+        "api_requests": sum(e["requests"] for e in manager.metrics.summary().values()),
+        "retries": retry["retries"],
+        "reauthentications": retry["reauthentications"],
+        "gave_up": retry["gave_up"],
+        "injected_errors": mock.injected_errors - before[0],
+        "dropped_connections": mock.dropped_connections - before[1],
+        "session_expirations": mock.expirations - before[2],
+        "error": error,
+    }
+
+
+# -----------------------------------------------------------------------------
+def run_scenarios(
+    scenarios: List[str],
+    collectors: List[str],
+    fleet_options: dict,
+    seed: int = 1,
+    manager_options: Optional[dict] = None,
+    progress: Callable[[str], None] = print,
+) -> dict:
+    """
+    Runs every collector under every scenario, each scenario with a fresh mock.
+
+    Returns:
+        dict: {"fleet": {...}, "results": [{"scenario", "collector", <measurements>}, ...]}
+    """
+    fleet = SyntheticFleet(**fleet_options)
+    results = []
+    for name in scenarios:
+        scenario = SCENARIOS[name]
+        progress(f"Scenario {name}: {scenario.description}")
+        mock = MockManager(
+            fleet, faults=scenario.faults(), seed=seed, expire_every=scenario.expire_every
+        )
+        with MockManagerServer(mock) as server:
+            for collector in collectors:
+                result = run_collector(collector, mock, server.port, manager_options)
+                progress(
+                    f"  {collector:<24} {result['seconds']:7.2f}s  "
+                    f"{result['completeness']:7.1%} complete  {result['retries']} retries"
+                )
+                results.append({"scenario": name, **result})
+    return {"fleet": fleet.to_dict(), "seed": seed, "results": results}
+
+
+# -----------------------------------------------------------------------------
+def print_report(report: dict):
+    headers = [
+        "Scenario",
+        "Collector",
+        "Time (s)",
+        "Complete",
+        "Requests",
+        "Retries",
+        "Re-logins",
+        "Gave up",
+        "Injected",
+        "Error",
+    ]
+    table = [
+        [
+            r["scenario"],
+            r["collector"],
+            r["seconds"],
+            f"{r['completeness']:.1%}",
+            r["api_requests"],
+            r["retries"],
+            r["reauthentications"],
+            r["gave_up"],
+            r["injected_errors"] + r["dropped_connections"] + r["session_expirations"],
+            r["error"] or "",
+        ]
+        for r in report["results"]
+    ]
+    print(tabulate.tabulate(table, headers, tablefmt="simple"))
+
+
+# -----------------------------------------------------------------------------
+def check_cluster_auth(calls: int = 20) -> List[dict]:
+    """
+    Runs round-robin GETs through a ClusterManager over two mock nodes, once per
+    authentication strategy (and with share_jwt), and checks that both nodes
+    answer every call they get.
+
+    Returns:
+        list: one {"strategy", "ok", "calls", "failed", "node_requests", "ejections"} per strategy.
+    """
+    from auth import AutoAuth, JWTAuth, SessionAuth
+    from cluster import ROUND_ROBIN, ClusterManager
+
+    strategies = {
+        "auto": {"auth": AutoAuth()},
+        "jwt": {"auth": JWTAuth()},
+        "session": {"auth": SessionAuth()},
+        "auto (factory)": {"auth": AutoAuth},
+        "shared jwt": {"share_jwt": True},
+    }
+    fleet = SyntheticFleet(devices=10, groups=1)
+    mock1, mock2 = MockManager(fleet), MockManager(fleet)
+    results = []
+    with contextlib.ExitStack() as stack:
+        servers = [stack.enter_context(MockManagerServer(mock)) for mock in (mock1, mock2, mock1)]
+        for name, options in strategies.items():
+            # Cluster members accept each other's JWT: with share_jwt, the second
+            # node is another port of the first mock; otherwise independent mocks
+            second = servers[2] if options.get("share_jwt") else servers[1]
+            nodes = [("127.0.0.1", servers[0].port), ("127.0.0.1", second.port)]
+            cluster = ClusterManager(
+                nodes,
+                None,
+                "admin",
+                "admin",
+                strategy=ROUND_ROBIN,
+                timeout=10,
+                **options,
+            )
+            failed = 0
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                for _ in range(calls):
+                    try:
+                        cluster._api_get("/client/about")
+                    except requests.exceptions.RequestException:
+                        failed += 1
+            stats = cluster.stats()
+            cluster.close()
+            node_requests = [node["requests"] for node in stats]
+            ejections = sum(node["ejections"] for node in stats)
+            results.append(
+                {
+                    "strategy": name,
+                    "ok": failed == 0 and ejections == 0 and all(node_requests),
+                    "calls": calls,
+                    "failed": failed,
+                    "node_requests": node_requests,
+                    "ejections": ejections,
+                }
+            )
+    return results
+
+
+# -----------------------------------------------------------------------------
+def check_auth_fallback() -> List[dict]:
+    """
+    Logs in with AutoAuth (version unknown, so /jwt/login is probed) on mock
+    managers with and without JWT support, with valid and wrong credentials.
+
+    Returns:
+        list: one {"version", "password", "expected", "outcome", "ok"} per case.
+    """
+    from auth import AutoAuth
+    from manager import Manager
+
+    cases = [
+        ("20.18.1", "admin", "jwt"),
+        ("20.15.1", "admin", "session"),
+        ("20.18.1", "wrong", "JWTAuthenticationError"),
+        ("20.15.1", "wrong", "RequestException"),
+    ]
+    fleet = SyntheticFleet(devices=10, groups=1)
+    results = []
+    for version, password, expected in cases:
+        with MockManagerServer(MockManager(fleet, version=version)) as server:
+            auth = AutoAuth()
+            manager = Manager("127.0.0.1", server.port, "admin", password, auth=auth, timeout=10)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                try:
+                    manager._api_get("/client/about")
+                    outcome = auth.selected.name
+                except requests.exceptions.RequestException as e:
+                    outcome = type(e).__name__
+            manager.close()
+        results.append(
+            {
+                "version": version,
+                "password": password,
+                "expected": expected,
+                "outcome": outcome,
+                "ok": outcome == expected,
+            }
+        )
+    return results
+
+
+# -----------------------------------------------------------------------------
+@click.group()
+def cli():
+    """Fault-injection scenarios for the SD-WAN Manager collectors."""
+    pass
+
+
+# -----------------------------------------------------------------------------
+@click.command()
+@click.option(
+    "--scenario",
+    "scenarios",
+    multiple=True,
+    type=click.Choice(list(SCENARIOS)),
+    help="Scenarios to run (default: all).",
+)
+@click.option(
+    "--collector",
+    "collectors",
+    multiple=True,
+    type=click.Choice(list(COLLECTORS)),
+    help="Collectors to run (default: all).",
+)
+@click.option("--devices", default=2000, show_default=True)
+@click.option("--groups", default=20, show_default=True)
+@click.option("--sdwan-profiles", default=40, show_default=True)
+@click.option("--sdrouting-profiles", default=16, show_default=True)
+@click.option("--seed", default=1, show_default=True, help="Seed of the fault injection.")
+@click.option("--timeout", default=10, show_default=True, help="Manager request timeout (s).")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the results (JSON).")
+def run(
+    scenarios,
+    collectors,
+    devices,
+    groups,
+    sdwan_profiles,
+    sdrouting_profiles,
+    seed,
+    timeout,
+    output,
+):
+    """
+    Run the collectors under each fault scenario.
+    """
+    report = run_scenarios(
+        scenarios=list(scenarios) or list(SCENARIOS),
+        collectors=list(collectors) or list(COLLECTORS),
+        fleet_options={
+            "devices": devices,
+            "groups": groups,
+            "sdwan_profiles": sdwan_profiles,
+            "sdrouting_profiles": sdrouting_profiles,
+        },
+        seed=seed,
+        manager_options={"timeout": timeout},
+    )
+    print()
+    print_report(report)
+    if output:
+        with open(output, "w") as f:
+            json_backend.dump(report, f, compact=False)
+        print(f"\nResults written to {output}")
+
+
+# -----------------------------------------------------------------------------
+@click.command("cluster-auth")
+@click.option("--calls", default=20, show_default=True, help="GETs per strategy.")
+def cluster_auth(calls):
+    """
+    Check per-node authentication of ClusterManager on two mock nodes.
+    """
+    results = check_cluster_auth(calls)
+    headers = ["Strategy", "Result", "Failed calls", "Requests per node", "Ejections"]
+    table = [
+        [
+            r["strategy"],
+            "ok" if r["ok"] else "FAILED",
+            r["failed"],
+            " / ".join(str(n) for n in r["node_requests"]),
+            r["ejections"],
+        ]
+        for r in results
+    ]
+    print(tabulate.tabulate(table, headers, tablefmt="simple"))
+    if not all(r["ok"] for r in results):
+        raise SystemExit(1)
+
+
+# -----------------------------------------------------------------------------
+@click.command("auth-fallback")
+def auth_fallback():
+    """
+    Check AutoAuth against mock managers with and without /jwt/login.
+    """
+    results = check_auth_fallback()
+    headers = ["Version", "Password", "Expected", "Outcome", "Result"]
+    table = [
+        [r["version"], r["password"], r["expected"], r["outcome"], "ok" if r["ok"] else "FAILED"]
+        for r in results
+    ]
+    print(tabulate.tabulate(table, headers, tablefmt="simple"))
+    if not all(r["ok"] for r in results):
+        raise SystemExit(1)
+
+
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    cli.add_command(run)
+    cli.add_command(cluster_auth)
+    cli.add_command(auth_fallback)
+    cli()
@@ -0,0 +1,200 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# JSON backend
+#
+# Description:
+#   Single entry point for JSON parsing (API responses) and dumping
+#   (saved payloads). Uses the fastest installed library and falls back
+#   to the standard library:
+#     orjson -> ujson -> json
+#
+#   Environment variables:
+#     sdwan_json_backend=json      force a backend (orjson, ujson or json)
+#     sdwan_json_compact=1         write saved files without indentation
+#
+# =========================================================================
+
+import json
+import logging
+import os
+from typing import IO, Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+INDENT = 4
+
+
+# ----------------------------------------------------------
+class JSONBackend:
+    """
+    Standard library backend, also the interface of the faster backends.
+    """
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, compact: bool = False) -> str:
+        if compact:
+            return json.dumps(obj, separators=(",", ":"))
+        return json.dumps(obj, indent=INDENT)
+
+
+# ----------------------------------------------------------
+class OrjsonBackend(JSONBackend):
+    """
+    orjson backend. orjson only supports 2-space indentation, so pretty
+    output differs in whitespace from the standard library.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError as e:
+            raise json.JSONDecodeError(e.msg, e.doc, e.pos) from None
+
+    def dumps(self, obj: Any, compact: bool = False) -> str:
+        option = self._orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= self._orjson.OPT_INDENT_2
+        try:
+            return self._orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            # e.g. integers above 64 bits, let the standard library handle them
+            return super().dumps(obj, compact)
+
+
+# ----------------------------------------------------------
+class UjsonBackend(JSONBackend):
+    """
+    ujson backend.
+    """
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._ujson.loads(data)
+        except ValueError as e:
+            doc = data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+            raise json.JSONDecodeError(str(e), doc, 0) from None
+
+    def dumps(self, obj: Any, compact: bool = False) -> str:
+        try:
+            if compact:
+                return self._ujson.dumps(obj, escape_forward_slashes=False)
+            return self._ujson.dumps(obj, indent=INDENT, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return super().dumps(obj, compact)
+
+
+_BACKEND_CLASSES = {
+    "orjson": OrjsonBackend,
+    "ujson": UjsonBackend,
+    "json": JSONBackend,
+}
+
+
+# ----------------------------------------------------------
+def available_backends() -> Dict[str, JSONBackend]:
+    """
+    Returns {name: backend} for every backend importable in this environment.
+    """
+    backends = {}
+    for name, backend_class in _BACKEND_CLASSES.items():
+        try:
+            backends[name] = backend_class()
+        except ImportError:
+            continue
+    return backends
+
+
+# ----------------------------------------------------------
+def get_backend(name: Optional[str] = None) -> JSONBackend:
+    """
+    Returns the requested backend, or the fastest installed one.
+
+    Args:
+        name (str, optional): "orjson", "ujson" or "json". Defaults to the
+            sdwan_json_backend environment variable, then to auto-detection.
+
+    Raises:
+        ValueError: if the backend name is unknown.
+    """
+    name = name or os.environ.get("sdwan_json_backend")
+    if name:
+        if name not in _BACKEND_CLASSES:
+            raise ValueError(
+                f"Unknown JSON backend '{name}', expected one of {', '.join(_BACKEND_CLASSES)}"
+            )
+        try:
+            return _BACKEND_CLASSES[name]()
+        except ImportError:
+            logger.warning(f"JSON backend '{name}' is not installed, using auto-detection.")
+
+    for backend_class in _BACKEND_CLASSES.values():
+        try:
+            return backend_class()
+        except ImportError:
+            continue
+    return JSONBackend()
+
+
+backend = get_backend()
+
+# Compact output for saved files, unless a caller asks otherwise
+compact_default = os.environ.get("sdwan_json_compact", "").lower() in ("1", "true", "yes", "on")
+
+
+# ----------------------------------------------------------
+def set_backend(name: str):
+    """
+    Switches the backend used by loads()/dumps()/dump() for the whole process.
+    """
+    global backend
+    backend = get_backend(name)
+
+
+# ----------------------------------------------------------
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parses a JSON document (bytes are decoded as UTF-8).
+
+    Raises:
+        json.JSONDecodeError: if the document is not valid JSON, whatever the backend.
+    """
+    return backend.loads(data)
+
+
+# ----------------------------------------------------------
+def dumps(obj: Any, compact: Optional[bool] = None) -> str:
+    """
+    Serializes `obj`, indented unless `compact` (defaults to sdwan_json_compact).
+    """
+    if compact is None:
+        compact = compact_default
+    return backend.dumps(obj, compact)
+
+
+# ----------------------------------------------------------
+def dump(obj: Any, file: IO[str], compact: Optional[bool] = None):
+    """
+    Writes `obj` to an open text file, indented unless `compact`.
+    """
+    file.write(dumps(obj, compact))
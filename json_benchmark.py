@@ -0,0 +1,123 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# JSON backend micro-benchmark
+#
+# Description:
+#   Compares the installed JSON backends (orjson, ujson, json) on payloads
+#   recorded under output/payloads (or any JSON files given as arguments):
+#     - parse time (bytes -> objects, as done for API responses)
+#     - dump time, indented and compact (as done by save_json/save_to_file)
+#     - output size
+#
+#   Example:
+#     python json_benchmark.py
+#     python json_benchmark.py --repeat 50 output/payloads/devices/devices_all.json
+#
+# =========================================================================
+
+import os
+import time
+from typing import List, Tuple
+
+import click
+import tabulate
+
+import json_backend
+from payloads import open_payload
+
+
+# -----------------------------------------------------------------------------
+def find_payloads(paths: Tuple[str, ...]) -> List[str]:
+    """
+    Expands files and folders into the list of .json (or .json.gz/.xz) files to benchmark.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(
+                    os.path.join(root, name)
+                    for name in names
+                    if name.endswith((".json", ".json.gz", ".json.xz"))
+                )
+        elif os.path.isfile(path):
+            files.append(path)
+    return sorted(files)
+
+
+# -----------------------------------------------------------------------------
+def best_of(function, repeat: int) -> float:
+    """
+    Returns the fastest of `repeat` runs, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# -----------------------------------------------------------------------------
+@click.command()
+@click.argument("paths", nargs=-1)
+@click.option("--repeat", default=20, show_default=True, help="Runs per measurement.")
+def run(paths, repeat):
+    """
+    Benchmark the JSON backends on recorded payloads.
+    """
+    files = find_payloads(paths or ("output/payloads",))
+    if not files:
+        print("No recorded payloads found, run one of the collectors first (e.g. device.py ls).")
+        return
+
+    documents = []
+    for filepath in files:
+        with open_payload(filepath, "rb") as f:
+            documents.append(f.read())
+    total_bytes = sum(len(document) for document in documents)
+    print(f"{len(documents)} payloads, {total_bytes / 1024:.1f} KiB, best of {repeat} runs\n")
+
+    # Reference objects, parsed once with the standard library
+    objects = [json_backend.JSONBackend().loads(document) for document in documents]
+
+    headers = [
+        "Backend",
+        "Parse (ms)",
+        "Parse (MB/s)",
+        "Dump indent (ms)",
+        "Dump compact (ms)",
+        "Indent size (KiB)",
+        "Compact size (KiB)",
+    ]
+    table = []
+    for name, backend in json_backend.available_backends().items():
+        parse = best_of(lambda: [backend.loads(d) for d in documents], repeat)
+        dump_indent = best_of(lambda: [backend.dumps(o) for o in objects], repeat)
+        dump_compact = best_of(
+            lambda: [backend.dumps(o, compact=True) for o in objects], repeat
+        )
+        indent_size = sum(len(backend.dumps(o).encode()) for o in objects)
+        compact_size = sum(len(backend.dumps(o, compact=True).encode()) for o in objects)
+        table.append(
+            [
+                name,
+                round(parse * 1000, 2),
+                round(total_bytes / parse / 1e6, 1) if parse else "N/A",
+                round(dump_indent * 1000, 2),
+                round(dump_compact * 1000, 2),
+                round(indent_size / 1024, 1),
+                round(compact_size / 1024, 1),
+            ]
+        )
+
+    print(tabulate.tabulate(table, headers, tablefmt="fancy_grid"))
+    print(f"\nActive backend: {json_backend.backend.name}")
+
+
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    run()
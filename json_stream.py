@@ -0,0 +1,186 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Streaming JSON decoding
+#
+# Description:
+#   Yields the records of a large JSON response one by one while the body
+#   is still being received, instead of buffering the whole payload and
+#   materializing it with response.json().
+#   Records are addressed with an ijson-like path:
+#     "data.item"  -> every element of the top-level "data" array
+#     "item"       -> every element of a top-level array
+#     "header"     -> the single value under the "header" key
+#
+# =========================================================================
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that can follow a complete number, true, false or null
+_SCALAR_END = _WHITESPACE + ",]}"
+
+# Drop consumed text from the buffer once it grows past this size
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+# ----------------------------------------------------------
+class _Reader:
+    """
+    Text buffer fed from an iterable of byte chunks.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decoder_json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """
+        Appends the next chunk to the buffer. Returns False at end of stream.
+        """
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            text = self._decoder.decode(chunk)
+            if text:
+                if self.pos > _COMPACT_THRESHOLD:
+                    self.buffer = self.buffer[self.pos :]
+                    self.pos = 0
+                self.buffer += text
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def _fill_more(self) -> bool:
+        """
+        Reads until the pending text has at least doubled, so that re-decoding
+        a value split across many small chunks stays linear overall.
+        """
+        target = 2 * (len(self.buffer) - self.pos) + 1
+        filled = False
+        while len(self.buffer) - self.pos < target and self._fill():
+            filled = True
+        return filled
+
+    def peek(self) -> str:
+        """
+        Returns the next non-whitespace character without consuming it ("" at end of stream).
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"Invalid JSON stream: expected '{char}' but found '{found or 'end of stream'}'"
+            )
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Decodes the next complete JSON value, reading more data until it is available.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder_json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill_more():
+                    continue
+                raise
+            # A number split across chunks decodes early ("1." + "5" gives 1):
+            # accept a scalar only once the character that follows it was received
+            if (
+                not isinstance(value, (dict, list, str))
+                and not self.eof
+                and (end == len(self.buffer) or self.buffer[end] not in _SCALAR_END)
+                and self._fill_more()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+# ----------------------------------------------------------
+def _iter_at(reader: _Reader, path: List[str]) -> Iterator[Any]:
+    if not path:
+        yield reader.value()
+        return
+
+    component, rest = path[0], path[1:]
+
+    if component == "item":
+        if reader.peek() != "[":
+            reader.value()  # Not an array, nothing to iterate
+            return
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        while True:
+            yield from _iter_at(reader, rest)
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError("Invalid JSON stream: expected ',' or ']' in array")
+
+    if reader.peek() != "{":
+        reader.value()  # Not an object, the path does not exist
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == component:
+            yield from _iter_at(reader, rest)
+        else:
+            reader.value()  # Skip sibling value
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError("Invalid JSON stream: expected ',' or '}' in object")
+
+
+# ----------------------------------------------------------
+def iter_json_items(chunks: Iterable[bytes], item_path: str = "data.item") -> Iterator[Any]:
+    """
+    Yields the JSON values found at `item_path` while reading `chunks`.
+
+    Args:
+        chunks (Iterable[bytes]): raw body chunks, e.g. response.iter_content(65536).
+        item_path (str): dotted path, "item" iterates over array elements.
+
+    Yields:
+        Decoded records, one at a time. Only the record being decoded is kept in memory.
+
+    Raises:
+        ValueError: if the stream is not valid JSON.
+    """
+    reader = _Reader(chunks)
+    path = [component for component in item_path.split(".") if component]
+    yield from _iter_at(reader, path)
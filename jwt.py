@@ -9,13 +9,20 @@
 # Use the JSESSIONID to request a JWT token from the /api/v1/user/login endpoint.
 # Subsequent API calls will use the JWT token in the X-Auth-Token header.
 #
+# AuthenticationJWT keeps the refresh token returned by /jwt/login and renews
+# the access token with /jwt/refresh before it expires ("exp" claim).
+#
 # More information [here](https://developer.cisco.com/docs/sdwan/authentication/#jwt-based-authentication)
 
 #! /usr/bin/env python
 
+import base64
+import json
 import logging
 import os
 import sys
+import threading
+import time
 
 import requests
 import urllib3
@@ -145,10 +152,43 @@ class Authentication:
         return self.dataservice_base_url, self.header
 
 
+# ----------------------------------------------------------
+class JWTAuthenticationError(requests.exceptions.RequestException):
+    """
+    Raised when a JWT login or refresh fails.
+    """
+
+
+# ----------------------------------------------------------
+def decode_jwt_claims(token):
+    """
+    Decodes the claims (payload) of a JWT without verifying its signature.
+    Only used locally to read "exp" and "csrf", SD-WAN Manager validates the token.
+
+    Args:
+        token (str): JWT in compact form (header.payload.signature)
+
+    Returns:
+        dict: the claims, or an empty dict if the token cannot be decoded.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)  # Restore base64 padding
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return claims if isinstance(claims, dict) else {}
+    except (IndexError, ValueError, AttributeError):
+        return {}
+
+
 # ----------------------------------------------------------
 class AuthenticationJWT:
     """
     Handles JWT-based authentication for vManage by directly POSTing to /jwt/login.
+
+    The refresh token returned by /jwt/login is kept, so the access token can be
+    renewed with POST /jwt/refresh before it expires instead of logging in again
+    with the password. Refresh can be driven by the caller (ensure_valid) or by a
+    background thread (start_auto_refresh) that updates self.header in place.
     """
 
     def __init__(
@@ -160,6 +200,8 @@ class AuthenticationJWT:
         validate_certs=False,
         timeout=10,
         token_duration=None,
+        refresh_margin=120,
+        session=None,
     ):
         """Initialize AuthenticationJWT object with session parameters.
         Args:
@@ -171,6 +213,9 @@ class AuthenticationJWT:
             timeout (int): how long Requests will wait for a response from the server, default 10 seconds
             token_duration (int, optional): Desired duration for the JWT token in seconds.
                                             Defaults to vManage's default (1800s).
+            refresh_margin (int): refresh the access token this many seconds before it expires.
+            session (requests.Session, optional): session used for /jwt/login and /jwt/refresh,
+                                                  e.g. the one of a Manager. A new session by default.
         """
 
         self.host = host
@@ -179,26 +224,54 @@ class AuthenticationJWT:
         self.password = password
         self.timeout = timeout
         self.token_duration = token_duration
+        self.refresh_margin = refresh_margin
         self.base_url = f"https://{self.host}:{self.port}"
-        self.session = requests.Session()
-        self.session.verify = validate_certs  # Set session-wide verification
+        if session is None:
+            session = requests.Session()
+            session.verify = validate_certs  # Set session-wide verification
+        self.session = session
         self.jwt_token = None
         self.csrf_token = None
+        self.refresh_token = None
+        self.expires_at = None  # Epoch seconds, from the token "exp" claim
         self.header = None
         self.dataservice_base_url = None
+        self.refresh_count = 0
+        self._lock = threading.Lock()  # Serializes login/refresh
+        self._refresh_thread = None
+        self._stop_refresh = threading.Event()
 
-    def login_jwt(self):
+    def _set_tokens(self, response_json):
         """
-        Performs the JWT login by POSTing credentials to /jwt/login.
-        Retrieves the JWT token and CSRF token from the response.
+        Stores the tokens of a /jwt/login or /jwt/refresh response and updates the header in place.
         """
-        api = "/jwt/login"
-        url = self.base_url + api
-
-        payload = {"username": self.user, "password": self.password}
-        if self.token_duration is not None:
-            payload["duration"] = self.token_duration
+        token = response_json.get("token")
+        if not token:
+            raise JWTAuthenticationError("JWT 'token' not found in response.")
+
+        claims = decode_jwt_claims(token)
+        csrf = response_json.get("csrf") or claims.get("csrf") or self.csrf_token
+        exp = claims.get("exp") or response_json.get("exp")
+        if exp:
+            expires_at = float(exp)
+        else:
+            duration = response_json.get("duration") or self.token_duration or 1800
+            expires_at = time.time() + float(duration)
+
+        self.jwt_token = token
+        self.csrf_token = csrf
+        # /jwt/refresh does not issue a new refresh token, keep the current one
+        self.refresh_token = response_json.get("refresh") or self.refresh_token
+        self.expires_at = expires_at
+
+        if self.header is not None:
+            # Same dict object, so callers holding the header see the new token
+            self.header["Authorization"] = f"Bearer {self.jwt_token}"
+            if self.csrf_token:
+                self.header["X-XSRF-TOKEN"] = self.csrf_token
 
+    def _post(self, api, payload, action):
+        url = self.base_url + api
         headers = {"Content-Type": "application/json"}
 
         response = None
@@ -207,53 +280,170 @@ class AuthenticationJWT:
                 url=url, headers=headers, json=payload, timeout=self.timeout
             )
             response.raise_for_status()  # Raise an exception for HTTP errors (4xx or 5xx)
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            # Logged by the caller, which knows whether the failure is expected
+            logger.debug(
+                f"JWT {action} failed: {e}. Status: {response.status_code if response is not None else 'N/A'}"
+            )
+            raise JWTAuthenticationError(
+                f"JWT {action} failed: {e}", response=response
+            ) from e
+        except ValueError as e:
+            logger.debug(f"JWT {action} failed: invalid JSON response: {e}")
+            raise JWTAuthenticationError(
+                f"JWT {action} failed: invalid JSON response", response=response
+            ) from e
 
-            response_json = response.json()
-            self.jwt_token = response_json.get("token")
-            self.csrf_token = response_json.get("csrf")
+    def login_jwt(self):
+        """
+        Performs the JWT login by POSTing credentials to /jwt/login.
+        Retrieves the JWT token, CSRF token and refresh token from the response.
 
-            if not self.jwt_token:
-                raise ValueError("JWT 'token' not found in login response.")
-            # CSRF token might be optional for some GET calls, but good practice to get it.
-            if not self.csrf_token:
-                logger.warning(
-                    "JWT 'csrf' token not found in login response. POST/PUT/DELETE requests might fail."
-                )
+        Returns:
+            tuple: (jwt_token, csrf_token)
 
-            logger.info("JWT token and CSRF token obtained successfully.")
-            return self.jwt_token, self.csrf_token
+        Raises:
+            JWTAuthenticationError: If the login fails.
+        """
+        payload = {"username": self.user, "password": self.password}
+        if self.token_duration is not None:
+            payload["duration"] = self.token_duration
 
-        except requests.exceptions.RequestException as e:
-            logger.error(
-                f"JWT login failed: {e}. Status: {response.status_code if response is not None else 'N/A'}, Response: {response.text if response is not None else 'No response'}\n"
+        with self._lock:
+            response_json = self._post("/jwt/login", payload, "login")
+            self._set_tokens(response_json)
+
+        # CSRF token might be optional for some GET calls, but good practice to get it.
+        if not self.csrf_token:
+            logger.warning(
+                "JWT 'csrf' token not found in login response. POST/PUT/DELETE requests might fail."
             )
-            sys.exit(1)
-        except ValueError as e:
-            logger.error(f"JWT login failed: {e}\n")
-            sys.exit(1)
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during JWT login: {e}\n")
-            sys.exit(1)
+        if not self.refresh_token:
+            logger.warning("JWT 'refresh' token not found in login response.")
+
+        logger.info("JWT token and CSRF token obtained successfully.")
+        return self.jwt_token, self.csrf_token
 
-    def establish_session_jwt(self):
+    def refresh_jwt(self):
         """
-        Performs JWT login and constructs the header and base_url for subsequent API calls.
+        Renews the access token with POST /jwt/refresh.
+        Falls back to a password login when there is no refresh token or when
+        SD-WAN Manager rejects it (e.g. the refresh token itself expired).
+
+        Returns:
+            tuple: (jwt_token, csrf_token)
+
+        Raises:
+            JWTAuthenticationError: If both the refresh and the fallback login fail.
         """
-        self.jwt_token, self.csrf_token = self.login_jwt()
+        if not self.refresh_token:
+            return self.login_jwt()
 
-        if self.jwt_token:
-            self.header = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.jwt_token}",
-            }
-            if self.csrf_token:  # Include CSRF token if it was successfully obtained
-                self.header["X-XSRF-TOKEN"] = self.csrf_token
-            logger.info("JWT session header created.")
-        else:
-            logger.error("JWT token was not obtained. Cannot establish session.")
-            sys.exit(1)
+        payload = {"refresh": self.refresh_token}
+        if self.token_duration is not None:
+            payload["duration"] = self.token_duration
+
+        token = self.jwt_token
+        try:
+            with self._lock:
+                if self.jwt_token != token:
+                    # Another thread refreshed while we were waiting for the lock
+                    return self.jwt_token, self.csrf_token
+                response_json = self._post("/jwt/refresh", payload, "refresh")
+                self._set_tokens(response_json)
+                self.refresh_count += 1
+        except JWTAuthenticationError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status not in (400, 401, 403):
+                logger.error(str(e))
+                raise
+            logger.warning("JWT refresh token rejected, logging in again.")
+            self.refresh_token = None
+            return self.login_jwt()
+
+        logger.info("JWT access token refreshed.")
+        return self.jwt_token, self.csrf_token
+
+    def seconds_until_expiry(self):
+        """
+        Returns the seconds left before the access token expires (None before login).
+        """
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.time()
+
+    def ensure_valid(self):
+        """
+        Refreshes the access token if it expires within refresh_margin seconds.
+        Meant for callers that do not run the background refresh thread.
+        """
+        remaining = self.seconds_until_expiry()
+        if remaining is None:
+            self.establish_session_jwt()
+        elif remaining <= self.refresh_margin:
+            self.refresh_jwt()
+        return self.header
+
+    def start_auto_refresh(self):
+        """
+        Starts a daemon thread refreshing the access token refresh_margin seconds
+        before it expires. Requests in flight keep using the previous token, which
+        is still valid, while the new one is obtained.
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._stop_refresh.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._auto_refresh_loop, name="jwt-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def stop_auto_refresh(self):
+        """
+        Stops the background refresh thread.
+        """
+        self._stop_refresh.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=self.timeout)
+            self._refresh_thread = None
+
+    def _auto_refresh_loop(self):
+        retry_delay = 5
+        while not self._stop_refresh.is_set():
+            remaining = self.seconds_until_expiry()
+            wait = 0 if remaining is None else max(0, remaining - self.refresh_margin)
+            if self._stop_refresh.wait(wait):
+                return
+            try:
+                self.refresh_jwt()
+                retry_delay = 5
+            except JWTAuthenticationError as e:
+                # Keep the current token and try again, it may still be valid for a while
+                logger.error(f"Background JWT refresh failed: {e}")
+                if self._stop_refresh.wait(retry_delay):
+                    return
+                retry_delay = min(retry_delay * 2, 60)
+
+    def establish_session_jwt(self, auto_refresh=False):
+        """
+        Performs JWT login and constructs the header and base_url for subsequent API calls.
+
+        Args:
+            auto_refresh (bool): keep the token valid with a background refresh thread.
+                The returned header dict is updated in place on each refresh.
+
+        Raises:
+            JWTAuthenticationError: If the login fails.
+        """
+        # Authorization and X-XSRF-TOKEN (if obtained) are filled in by login_jwt
+        self.header = {"Content-Type": "application/json"}
+        self.login_jwt()
+        logger.info("JWT session header created.")
 
         self.dataservice_base_url = f"https://{self.host}:{self.port}/dataservice"
+        if auto_refresh:
+            self.start_auto_refresh()
         return self.dataservice_base_url, self.header
 
 
@@ -302,19 +492,21 @@ def get_authenticated_session_details():
 
 
 # ----------------------------------------------------------
-def get_authenticated_session_details_jwt(token_duration=None):
+def get_authenticated_session_details_jwt(token_duration=None, auto_refresh=False):
     """
     Orchestrates the retrieval of credentials, authentication (JWT-based),
     and returns the base URL and header for API calls.
     Args:
         token_duration (int, optional): Desired duration for the JWT token in seconds.
                                         Defaults to vManage's default (1800s).
+        auto_refresh (bool): refresh the token in the background, the returned
+                             header is updated in place.
     """
     host, port, user, password = get_manager_credentials_from_env()
     auth_manager_jwt = AuthenticationJWT(
         host, port, user, password, token_duration=token_duration
     )
-    base_url, header = auth_manager_jwt.establish_session_jwt()
+    base_url, header = auth_manager_jwt.establish_session_jwt(auto_refresh=auto_refresh)
     return base_url, header
 
 
@@ -338,7 +530,7 @@ if __name__ == "__main__":
         # For example:
         # response = requests.get(f"{jwt_base_url}/device", headers=jwt_header, verify=False)
         # print(response.json())
-    except SystemExit:
+    except (SystemExit, JWTAuthenticationError):
         print(
             "\nJWT Authentication failed. Please check environment variables and vManage connectivity/credentials."
         )
@@ -6,20 +6,39 @@
 # Authentication and common API methods
 #
 # Description:
-#   Session-based authentication for Cisco SD-WAN Manager
-#   Log in with a username and password to establish a session.
-#   Get a cross-site request forgery prevention token, necessary for most POST operations
+#   Authentication for Cisco SD-WAN Manager through pluggable strategies (auth.py):
+#   session-based (JSESSIONID + cross-site request forgery prevention token),
+#   JWT (20.18+, used by default when available) or a pre-issued access token.
+#   AsyncManager: asyncio front-end sharing the same session for concurrent API calls
 #
 # =========================================================================
 
+import asyncio
+import email.utils
 import json
 import logging
 import os
+import random
 import sys
-from typing import Optional, cast
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, Iterator, Optional, cast
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+import json_backend
+from auth import AuthStrategy, AutoAuth
+from cassette import Cassette
+from json_stream import iter_json_items
+from metrics import MetricsRegistry
+from payloads import RawPayloadWriter
+from rate_limit import RateLimiter
+from session_cache import SessionCache
 
 logger = logging.getLogger(__name__)
 
@@ -27,15 +46,338 @@ logger = logging.getLogger(__name__)
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+# ----------------------------------------------------------
+class ConnectionStats:
+    """
+    Thread-safe counters showing how well the HTTP connection pool is reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    @property
+    def reused_connections(self):
+        # Every request either opened a new connection or reused a pooled one
+        return max(self.requests - self.new_connections, 0)
+
+    def to_dict(self):
+        with self._lock:
+            requests_count = self.requests
+            new_connections = self.new_connections
+        reused = max(requests_count - new_connections, 0)
+        return {
+            "requests": requests_count,
+            "new_connections": new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / requests_count, 3) if requests_count else 0.0,
+        }
+
+
+# ----------------------------------------------------------
+class PoolingHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with a tunable connection pool that counts new vs reused connections.
+    """
+
+    def __init__(self, stats: Optional[ConnectionStats] = None, **kwargs):
+        """
+        Args:
+            stats (ConnectionStats, optional): counters to update, a new instance is created if omitted.
+            **kwargs: forwarded to requests.adapters.HTTPAdapter
+                (pool_connections, pool_maxsize, pool_block, max_retries).
+        """
+        self.stats = stats or ConnectionStats()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+        stats = self.stats
+
+        # Count at connect() time: a pooled connection dropped by the server is
+        # reconnected in place, which is a new TCP/TLS handshake as well.
+        class CountingHTTPConnection(urllib3.connection.HTTPConnection):
+            def connect(self):
+                stats.record_new_connection()
+                super().connect()
+
+        class CountingHTTPSConnection(urllib3.connection.HTTPSConnection):
+            def connect(self):
+                stats.record_new_connection()
+                super().connect()
+
+        class CountingHTTPConnectionPool(urllib3.HTTPConnectionPool):
+            ConnectionCls = CountingHTTPConnection
+
+        class CountingHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+            ConnectionCls = CountingHTTPSConnection
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        self.stats.record_request()
+        return super().send(request, **kwargs)
+
+
+# ----------------------------------------------------------
+class _CountingChunks:
+    """
+    Wraps an iterator of byte chunks and counts the bytes read.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.bytes = 0
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            self.bytes += len(chunk)
+            yield chunk
+
+
+# ----------------------------------------------------------
+class RetryPolicy:
+    """
+    Retry rules applied by Manager._request to every API call.
+
+    Transient failures (connection errors, 429, 502, 503, 504) are retried with
+    exponential backoff and full jitter, honoring the Retry-After header.
+    Non-idempotent methods (POST) are only retried when SD-WAN Manager explicitly
+    asks to come back later (429 or a Retry-After header), since the request was not processed.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+    def __init__(
+        self,
+        max_attempts=5,
+        backoff_base=1.0,
+        backoff_max=30.0,
+        max_total_time=300.0,
+        retry_statuses=(429, 502, 503, 504),
+    ):
+        """
+        Args:
+            max_attempts (int): total attempts per API call, including the first one. 1 disables retries.
+            backoff_base (float): base delay in seconds, doubled after every attempt.
+            backoff_max (float): upper bound for a single backoff delay, in seconds.
+            max_total_time (float): give up once this many seconds have been spent on one API call.
+            retry_statuses (tuple): HTTP status codes considered transient.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_total_time = max_total_time
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def is_retryable(self, method: str, response: Optional[requests.Response]) -> bool:
+        """
+        Tells if a failed attempt may be retried. response is None for connection errors.
+        """
+        if response is None:
+            return method in self.IDEMPOTENT_METHODS
+        if response.status_code not in self.retry_statuses:
+            return False
+        if method in self.IDEMPOTENT_METHODS:
+            return True
+        return response.status_code == 429 or "Retry-After" in response.headers
+
+    def retry_after(self, response: Optional[requests.Response]) -> Optional[float]:
+        """
+        Parses the Retry-After header (delay in seconds or HTTP date).
+        """
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(retry_at.timestamp() - time.time(), 0.0)
+
+    def next_delay(
+        self, attempt: int, elapsed: float, response: Optional[requests.Response] = None
+    ) -> Optional[float]:
+        """
+        Returns how long to sleep before the next attempt, or None to give up.
+
+        Args:
+            attempt (int): number of attempts already made (1 after the first failure).
+            elapsed (float): seconds already spent on this API call.
+            response (requests.Response, optional): the failed response, if any.
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        delay = self.retry_after(response)
+        if delay is None:
+            delay = random.uniform(
+                0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+            )
+
+        if elapsed + delay > self.max_total_time:
+            return None
+        return delay
+
+
+# ----------------------------------------------------------
+class RetryStats:
+    """
+    Thread-safe counters for retries and re-authentications done by Manager.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.reauthentications = 0
+        self.gave_up = 0
+        self.retries_by_reason: Dict[str, int] = {}
+
+    def record_retry(self, reason: str):
+        with self._lock:
+            self.retries += 1
+            self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+
+    def record_reauthentication(self):
+        with self._lock:
+            self.reauthentications += 1
+
+    def record_gave_up(self):
+        with self._lock:
+            self.gave_up += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "reauthentications": self.reauthentications,
+                "gave_up": self.gave_up,
+                "retries_by_reason": dict(self.retries_by_reason),
+            }
+
+
+# ----------------------------------------------------------
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+# ----------------------------------------------------------
+class SingleFlight:
+    """
+    Coalesces identical calls running at the same time: the first caller performs
+    the call, callers arriving while it is in flight wait for it and get the same
+    result (or exception) instead of issuing their own request.
+    Results are not cached, a call made after the first one completed runs again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, _InFlightCall] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.coalesced_by_path: Dict[str, int] = {}
+
+    def do(self, key, function, path: str = ""):
+        """
+        Runs function() unless a call with the same key is in flight, and returns its result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _InFlightCall()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                self.coalesced_by_path[path] = self.coalesced_by_path.get(path, 0) + 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced_requests": self.coalesced,
+                "coalesced_by_path": dict(self.coalesced_by_path),
+            }
+
+
+# ----------------------------------------------------------
+class SessionRejectedError(requests.exceptions.HTTPError):
+    """
+    Raised when SD-WAN Manager still rejects a request (401/403 or HTML login page)
+    right after logging in again.
+    """
+
+
 # ----------------------------------------------------------
 class Manager:
     """
-    Handles session-based authentication for SD-WAN Manager and provides common API methods.
+    Handles authentication for SD-WAN Manager and provides common API methods.
     """
 
-    def __init__(self, host, port, user, password, validate_certs=False, timeout=10):
+    def __init__(
+        self,
+        host,
+        port,
+        user,
+        password,
+        validate_certs=False,
+        timeout=10,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        keep_alive=True,
+        session_cache: Optional[SessionCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        auth: Optional[AuthStrategy] = None,
+        compression: bool = True,
+        coalesce_gets: bool = True,
+        cassette: Optional[Cassette] = None,
+    ):
         """
-        Initialize Manager object with session parameters and perform authentication.
+        Initialize Manager object with session parameters.
+        Authentication and the /client/about fetch are deferred until the first API call,
+        so building a Manager is free for commands that never reach SD-WAN Manager.
         Args:
             host (str): hostname or IP address of SD-WAN Manager
             user (str): username for authentication
@@ -43,6 +385,27 @@ class Manager:
             port (int): default HTTPS port 443
             validate_certs (bool): turn certificate validation on or off.
             timeout (int): how long Requests will wait for a response from the server, default 10 seconds
+            pool_connections (int): number of per-host connection pools to cache, default 10
+            pool_maxsize (int): maximum number of connections kept open per host, default 10.
+                Set it to at least the number of concurrent workers.
+            pool_block (bool): when the pool is exhausted, wait for a free connection
+                instead of opening (and later discarding) an extra one.
+            keep_alive (bool): reuse TCP/TLS connections between requests, default True
+            session_cache (SessionCache, optional): reuse a session persisted on disk by a
+                previous run instead of logging in again, and persist new sessions.
+            retry_policy (RetryPolicy, optional): retry/backoff rules for API calls.
+                Defaults to RetryPolicy(), use RetryPolicy(max_attempts=1) to disable retries.
+            rate_limiter (RateLimiter, optional): client-side rate and concurrency limits
+                shared by every API call, e.g. RateLimiter.vmanage_defaults(). No limit by default.
+            auth (AuthStrategy, optional): SessionAuth(), JWTAuth() or TokenAuth(token).
+                Defaults to AutoAuth(): JWT on 20.18+ managers, session-based otherwise.
+            compression (bool): ask for compressed responses (gzip/deflate, and br/zstd
+                when brotli/zstandard are installed), default True.
+                Bytes saved per endpoint are reported in the metrics (wire_bytes).
+            coalesce_gets (bool): share one request between concurrent identical GETs
+                (same path and params), default True. See SingleFlight.
+            cassette (Cassette, optional): record every API call to a cassette directory,
+                or replay a recorded cassette without contacting SD-WAN Manager.
         """
         self.host = host
         self.port = port
@@ -52,30 +415,75 @@ class Manager:
         self.base_url = f"https://{self.host}:{self.port}"  # Base URL for login/token
         self.session = requests.Session()
         self.session.verify = validate_certs
+        self.connection_stats = ConnectionStats()
+        self.adapter = PoolingHTTPAdapter(
+            stats=self.connection_stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.cassette = cassette
+        transport = cassette.adapter(self.adapter) if cassette is not None else self.adapter
+        self.session.mount("https://", transport)
+        self.session.mount("http://", transport)
+        if not keep_alive:
+            self.session.headers.update({"Connection": "close"})
+        # Every encoding urllib3 can decode here: gzip and deflate, plus br and zstd
+        # when the optional brotli / zstandard packages are installed
+        self.session.headers.update(
+            {"Accept-Encoding": ACCEPT_ENCODING if compression else "identity"}
+        )
         self.jsessionid = None
         self.token = None
         self.dataservice_base_url = None  # Base URL for API calls (e.g., /dataservice)
-        self.version = None  # Will be populated by about() method
-        self.applicationVersion = None  # Will be populated by about() method
-        self.applicationServer = None  # Will be populated by about() method
-        self.time = None  # Will be populated by about() method
-        self.timeZone = None  # Will be populated by about() method
+        self._about = None  # /client/about data, fetched on first access (see version, ...)
         self.status = False  # Indicates if authentication was successful
+        self.session_cache = session_cache
+        self.session_from_cache = False  # True while running on a cached session
+        self._cache_created = None
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0  # Incremented on every re-login
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        self.rate_limiter = rate_limiter
+        self.metrics = MetricsRegistry()  # Per-endpoint API call metrics
+        self.auth = auth or AutoAuth()
+        self.single_flight = SingleFlight() if coalesce_gets else None
+        self.tenant: Optional[str] = None  # Selected with select_tenant(), kept across re-logins
 
-        # Perform authentication during initialization
-        self._authenticate()
-        if self.dataservice_base_url:  # Check if authentication was successful
+    def _ensure_authenticated(self):
+        """
+        Authenticates on first use (or reuses a cached session).
+        Safe to call from several threads, only one of them performs the login.
+
+        Raises:
+            requests.exceptions.RequestException: If authentication fails.
+        """
+        if self.status:
+            return
+
+        with self._auth_lock:
+            if self.status:
+                return
+
+            cached_about = None
+            if self.auth.uses_session_cache:
+                cached_about = self._restore_cached_session()
+            if not self.session_from_cache and not self._authenticate():
+                logger.error("Failed to authenticate with SD-WAN Manager.")
+                raise requests.exceptions.RequestException(
+                    "Failed to authenticate with SD-WAN Manager."
+                )
+
+            if self.tenant:
+                self._apply_tenant(self.tenant)  # Login after a failed re-login
+            if cached_about:
+                self._set_about_data(cached_about)  # Populate version from cache
             self.status = True
             logger.info("Successfully authenticated with SD-WAN Manager.")
             logger.info(f"Session headers: {self.session.headers}")
             logger.info(f"Base URL: {self.dataservice_base_url}")
 
-        else:
-            logger.error("Failed to authenticate with SD-WAN Manager. Exiting.")
-            sys.exit(1)  # Exit if authentication fails
-
-        self.about()  # Populate version and other info
-
     def _login(self):
         """
         Performs the initial login to get the JSESSIONID.
@@ -130,9 +538,19 @@ class Manager:
             )
             return None
 
-    def _authenticate(self):
+    def _authenticate(self) -> bool:
+        """
+        Logs in with the configured authentication strategy.
+
+        Returns:
+            bool: True if authentication succeeded.
+        """
+        return self.auth.authenticate(self)
+
+    def _authenticate_session(self):
         """
-        Performs login and token retrieval, then configures the session with default headers.
+        Session-based login (SessionAuth): performs login and token retrieval, then
+        configures the session with default headers.
         Sets self.dataservice_base_url and updates self.session headers.
         """
         self.jsessionid = self._login()
@@ -152,10 +570,167 @@ class Manager:
             self.session.headers.update({"X-XSRF-TOKEN": self.token})
 
         self.dataservice_base_url = f"https://{self.host}:{self.port}/dataservice"
+        self._save_session_cache()
+
+    def _restore_cached_session(self):
+        """
+        Loads JSESSIONID and X-XSRF-TOKEN from the session cache, if enabled and still valid.
+        Sets self.session_from_cache and returns the cached about() data (or None).
+        """
+        if not self.session_cache:
+            return None
+
+        entry = self.session_cache.load(self.host, self.port, self.user)
+        if not entry:
+            return None
+
+        self.jsessionid = entry["jsessionid"]
+        self.token = entry.get("token")
+        name, _, value = self.jsessionid.partition("=")
+        self.session.cookies.set(name, value)
+        self.session.headers.update({"Content-Type": "application/json"})
+        if self.token:
+            self.session.headers.update({"X-XSRF-TOKEN": self.token})
+        self.dataservice_base_url = f"https://{self.host}:{self.port}/dataservice"
+        self.session_from_cache = True
+        self._cache_created = entry.get("created")
+        logger.info(f"Reusing cached session for {self.user}@{self.host}:{self.port}")
+        return entry.get("about")
+
+    def _save_session_cache(self, about=None):
+        """
+        Persists the current session (and optionally about() data) to the session cache.
+        """
+        if not self.session_cache or not self.jsessionid:
+            return
+        self.session_cache.save(
+            self.host,
+            self.port,
+            self.user,
+            self.jsessionid,
+            self.token,
+            about=about,
+            created=self._cache_created,
+        )
+
+    def _is_login_page(self, response: requests.Response) -> bool:
+        """
+        SD-WAN Manager answers requests on an invalid session with its HTML login page.
+        """
+        if response.status_code in (401, 403):
+            return True
+        # Check the header first, so streamed JSON bodies are never read here
+        content_type = response.headers.get("Content-Type", "")
+        return "text/html" in content_type and b"<html" in response.content[:512].lower()
+
+    def _reauthenticate(self, generation: int):
+        """
+        Discards the current (expired or cached) session and logs in again.
+        When several threads see the session expire at once, only the first one logs in.
+
+        Args:
+            generation (int): value of self._auth_generation when the rejected request was sent.
+        """
+        with self._auth_lock:
+            if generation != self._auth_generation:
+                return  # Another thread already logged in again
+
+            logger.warning("Session rejected by SD-WAN Manager, logging in again.")
+            self.retry_stats.record_reauthentication()
+            if self.session_cache:
+                self.session_cache.clear(self.host, self.port, self.user)
+            self.session_from_cache = False
+            self._cache_created = None
+            self.session.headers.pop("VSessionId", None)  # Bound to the rejected session
+            for attempt in (1, 2):
+                if not self.auth.reauthenticate(self):
+                    self.status = False
+                    raise requests.exceptions.RequestException(
+                        "Re-authentication with SD-WAN Manager failed."
+                    )
+                if not self.tenant:
+                    break
+                try:
+                    self._apply_tenant(self.tenant)
+                    break
+                except requests.exceptions.RequestException as e:
+                    if attempt == 2:
+                        self.status = False
+                        raise
+                    logger.warning(f"Tenant selection after re-login failed ({e}), logging in again.")
+                    self.auth.clear(self)
+            self._auth_generation += 1
+            self._save_session_cache(about=self._about_data())
+
+    @staticmethod
+    def _tenant_id(tenants, tenant: str) -> str:
+        """
+        Finds `tenant` (name, organization name or tenant ID) in the /tenant payload.
+
+        Raises:
+            requests.exceptions.RequestException: if the tenant is unknown.
+        """
+        tenants = tenants.get("data", tenants) if isinstance(tenants, dict) else tenants
+        for item in tenants or []:
+            if tenant in (item.get("tenantId"), item.get("name"), item.get("orgName")):
+                return item["tenantId"]
+        raise requests.exceptions.RequestException(f"Tenant '{tenant}' not found")
+
+    def select_tenant(self, tenant: str):
+        """
+        Switches a provider session to `tenant` (name or tenant ID): the VSessionId
+        returned by SD-WAN Manager is sent with every subsequent API call, and the
+        tenant is selected again after every re-login.
+
+        Raises:
+            requests.exceptions.RequestException: if the tenant is unknown or cannot be selected.
+        """
+        self.session.headers.pop("VSessionId", None)
+        tenant_id = self._tenant_id(self._api_get("/tenant"), tenant)
+        response = self._api_post(f"/tenant/{tenant_id}/vsessionid")
+        vsessionid = (response or {}).get("VSessionId")
+        if not vsessionid:
+            raise requests.exceptions.RequestException(f"No VSessionId returned for tenant '{tenant}'")
+        with self._auth_lock:
+            self.session.headers.update({"VSessionId": vsessionid})
+            self.tenant = tenant
+        logger.info(f"Selected tenant {tenant} ({tenant_id})")
+
+    def _apply_tenant(self, tenant: str):
+        """
+        Requests a VSessionId for `tenant` right after a login and sets it on the
+        session. Called with self._auth_lock held, so it talks to the session
+        directly instead of going through _request (which may need the lock to log in again).
+
+        Raises:
+            requests.exceptions.RequestException: if the tenant cannot be selected.
+        """
+        base_url = cast(str, self.dataservice_base_url)
+        self.session.headers.pop("VSessionId", None)
+        try:
+            response = self.session.get(f"{base_url}/tenant", timeout=self.timeout)
+            if self._is_login_page(response):
+                raise requests.exceptions.RequestException("Session rejected while listing tenants")
+            response.raise_for_status()
+            tenant_id = self._tenant_id(json_backend.loads(response.content), tenant)
+
+            response = self.session.post(f"{base_url}/tenant/{tenant_id}/vsessionid", timeout=self.timeout)
+            if self._is_login_page(response):
+                raise requests.exceptions.RequestException("Session rejected while selecting the tenant")
+            response.raise_for_status()
+            vsessionid = json_backend.loads(response.content).get("VSessionId")
+        except ValueError as e:
+            raise requests.exceptions.RequestException(f"Invalid tenant response: {e}") from e
+        if not vsessionid:
+            raise requests.exceptions.RequestException(f"No VSessionId returned for tenant '{tenant}'")
+        self.session.headers.update({"VSessionId": vsessionid})
+        logger.info(f"Selected tenant {tenant} ({tenant_id})")
 
     def about(self):
         """
-        Fetches and returns key information about the SD-WAN Manager application.
+        Fetches and prints key information about the SD-WAN Manager application.
+        The same fields are also available as lazily fetched properties
+        (version, applicationVersion, applicationServer, time, timeZone).
 
         Returns:
             Optional[Dict[str, Any]]: A dictionary containing 'version',
@@ -169,21 +744,11 @@ class Manager:
 
             # The actual data is nested under the "data" key in the payload
             data = full_payload.get("data")
-
-            self.version = data.get("version")
-            self.applicationVersion = data.get("applicationVersion")
-            self.applicationServer = data.get("applicationServer")
-            self.time = data.get("time")
-            self.timeZone = data.get("timeZone")
+            self._set_about_data(data)
+            self._save_session_cache(about=data)
 
             # Print the information
-            print("\nSD-WAN Manager Information:")
-            print(f" Version: {self.version}")
-            print(f" Application Version: {self.applicationVersion}")
-            print(f" Application Server: {self.applicationServer}")
-            print(f" Time: {self.time}")
-            print(f" Time Zone: {self.timeZone}")
-            print()
+            self._print_about()
 
         except requests.exceptions.RequestException as e:
             print(f"An unexpected error occurred: {e}")
@@ -191,6 +756,345 @@ class Manager:
                 print(f"Status: {e.response.status_code}, Response: {e.response.text}")
             return
 
+    def _set_about_data(self, data: dict):
+        self._about = {
+            "version": data.get("version"),
+            "applicationVersion": data.get("applicationVersion"),
+            "applicationServer": data.get("applicationServer"),
+            "time": data.get("time"),
+            "timeZone": data.get("timeZone"),
+        }
+
+    def _about_data(self):
+        return self._about or None
+
+    def _about_field(self, name: str):
+        """
+        Returns one /client/about field, fetching the about data on first access.
+        """
+        if self._about is None:
+            try:
+                data = self._api_get("/client/about").get("data") or {}
+                self._set_about_data(data)
+                self._save_session_cache(about=self._about)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to fetch SD-WAN Manager information: {e}")
+                self._about = {}  # Do not retry on every property access
+        return self._about.get(name)
+
+    @property
+    def version(self):
+        return self._about_field("version")
+
+    @property
+    def applicationVersion(self):
+        return self._about_field("applicationVersion")
+
+    @property
+    def applicationServer(self):
+        return self._about_field("applicationServer")
+
+    @property
+    def time(self):
+        return self._about_field("time")
+
+    @property
+    def timeZone(self):
+        return self._about_field("timeZone")
+
+    def _print_about(self):
+        print("\nSD-WAN Manager Information:")
+        print(f" Version: {self.version}")
+        print(f" Application Version: {self.applicationVersion}")
+        print(f" Application Server: {self.applicationServer}")
+        print(f" Time: {self.time}")
+        print(f" Time Zone: {self.timeZone}")
+        print()
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        payload: Optional[dict] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Sends a request to the SD-WAN Manager API using the authenticated session.
+        Handles URL construction, logging and HTTP error checks for all _api_* helpers.
+
+        Transient failures are retried according to self.retry_policy, and an expired
+        session (401/403 or HTML login page) triggers one transparent re-login per call.
+
+        Args:
+            method (str): HTTP method (GET, POST, PUT, DELETE).
+            path (str): The API endpoint path (e.g., "/v1/config-group/").
+            params (dict, optional): Dictionary of query parameters. Defaults to None.
+            payload (dict, optional): Dictionary sent as JSON body. Defaults to None.
+            stream (bool): do not download the body yet, the caller reads it incrementally.
+
+        Returns:
+            requests.Response: The successful HTTP response.
+
+        Raises:
+            SessionRejectedError: If the session is still rejected after logging in again.
+            requests.exceptions.RequestException: If the API call fails or authentication fails.
+        """
+        self._ensure_authenticated()
+
+        policy = self.retry_policy
+        start = time.monotonic()
+        attempt = 0
+        reauthenticated = False
+
+        while True:
+            attempt += 1
+            url = cast(str, self.dataservice_base_url) + path
+            if payload is not None:
+                logger.info(f"Making {method} request to: {url} with payload: {payload}")
+            else:
+                logger.info(f"Making {method} request to: {url} with params: {params}")
+
+            generation = self._auth_generation
+            self.auth.before_request(self)  # e.g. refresh a JWT about to expire
+            try:
+                response = self._send(method, url, path, params, payload, stream)
+            except requests.exceptions.SSLError:
+                raise  # Certificate problems are not transient
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if not policy.is_retryable(method, None):
+                    raise
+                delay = policy.next_delay(attempt, time.monotonic() - start)
+                if delay is None:
+                    self.retry_stats.record_gave_up()
+                    logger.error(f"Giving up {method} {url} after {attempt} attempts: {e}")
+                    raise
+                self.retry_stats.record_retry("connection error")
+                self.metrics.record_retry(method, path)
+                logger.warning(
+                    f"{method} {url} failed ({e}), retrying in {delay:.1f}s (attempt {attempt}/{policy.max_attempts})"
+                )
+                time.sleep(delay)
+                continue
+
+            if self._is_login_page(response):
+                response.close()  # Release the connection of a streamed response
+                if reauthenticated:
+                    raise SessionRejectedError(
+                        f"{method} {url} rejected again after logging in (status {response.status_code})",
+                        response=response,
+                    )
+                reauthenticated = True
+                self._reauthenticate(generation)
+                continue
+
+            if policy.is_retryable(method, response):
+                delay = policy.next_delay(attempt, time.monotonic() - start, response)
+                if delay is not None:
+                    self.retry_stats.record_retry(str(response.status_code))
+                    self.metrics.record_retry(method, path)
+                    logger.warning(
+                        f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s (attempt {attempt}/{policy.max_attempts})"
+                    )
+                    response.close()
+                    time.sleep(delay)
+                    continue
+                self.retry_stats.record_gave_up()
+                logger.error(
+                    f"Giving up {method} {url} after {attempt} attempts: status {response.status_code}"
+                )
+
+            if stream and response.status_code >= 400:
+                response.close()
+            response.raise_for_status()
+            return response
+
+    def _send(
+        self, method, url, path, params=None, payload=None, stream=False
+    ) -> requests.Response:
+        """
+        Sends a single HTTP attempt within the rate limits and records its metrics.
+        For streamed responses the latency covers the headers only and the body
+        size is recorded by the caller once it has been read.
+        """
+        with self._rate_limit(path):
+            sent = time.monotonic()
+            try:
+                response = self.session.request(
+                    method, url=url, params=params, json=payload, stream=stream
+                )
+            except requests.exceptions.RequestException:
+                self.metrics.record_request(
+                    method, path, time.monotonic() - sent, error=True
+                )
+                raise
+        self.metrics.record_request(
+            method,
+            path,
+            time.monotonic() - sent,
+            0 if stream else len(response.content),
+            error=response.status_code >= 400,
+            wire_bytes=0 if stream else self._wire_bytes(response),
+        )
+        return response
+
+    @staticmethod
+    def _wire_bytes(response: requests.Response) -> Optional[int]:
+        """
+        Bytes received on the wire for the body read so far (before gzip/deflate decoding).
+        """
+        try:
+            return response.raw.tell()
+        except (AttributeError, OSError):
+            return None
+
+    def close(self):
+        """
+        Stops background token refresh and closes the pooled connections.
+        """
+        self.auth.close()
+        self.session.close()
+
+    def _decode_json(self, response: requests.Response, method: str, path: str):
+        """
+        Decodes the JSON body of a response with the configured JSON backend
+        and records the decode time.
+
+        Raises:
+            requests.exceptions.JSONDecodeError: If the body is not valid JSON.
+        """
+        start = time.monotonic()
+        try:
+            return json_backend.loads(response.content)
+        except json.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+        finally:
+            self.metrics.record_decode(method, path, time.monotonic() - start)
+
+    def metrics_extra(self) -> Dict[str, dict]:
+        """
+        Session-wide counters exported alongside the per-endpoint metrics.
+        """
+        retry_stats = self.retry_stats.to_dict()
+        retry_stats.pop("retries_by_reason")
+        extra = {
+            "connection": self.connection_stats.to_dict(),
+            "retry": retry_stats,
+        }
+        if self.single_flight is not None:
+            single_flight = self.single_flight.to_dict()
+            single_flight.pop("coalesced_by_path")
+            extra["single_flight"] = single_flight
+        if self.cassette is not None:
+            extra["cassette"] = self.cassette.to_dict()
+        return extra
+
+    def print_metrics(self):
+        """
+        Prints per-endpoint API metrics (count, errors, latency percentiles, bytes, decode time).
+        """
+        self.metrics.print_summary(self.metrics_extra())
+
+    def _rate_limit(self, path: str):
+        """
+        Returns the rate limiter context for `path`, or a no-op context without limiter.
+        """
+        if self.rate_limiter is None:
+            return nullcontext()
+        return self.rate_limiter.limit(path)
+
+    def api_stream(
+        self,
+        path: str,
+        item_path: str = "data.item",
+        params: Optional[dict] = None,
+        chunk_size: int = 64 * 1024,
+        save_to: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """
+        Streams a GET response and yields its records one by one, in constant memory.
+        Use it instead of _api_get for very large payloads (application mapping,
+        bulk statistics, feature profiles with details=true, ...).
+
+        Args:
+            path (str): The API endpoint path (e.g., "/device/dpi/application-mapping").
+            item_path (str): records to yield, e.g. "data.item" for the elements of the
+                "data" array or "item" when the payload is a top-level array.
+            params (dict, optional): Dictionary of query parameters. Defaults to None.
+            chunk_size (int): bytes read from the socket at a time.
+            save_to (str, optional): also write the raw response body to this file while
+                it is consumed (no re-encoding). The whole body is saved even if the
+                caller stops iterating early.
+
+        Yields:
+            The decoded records.
+
+        Raises:
+            requests.exceptions.RequestException: If the API call fails, authentication fails
+                or the response body is not valid JSON.
+        """
+        response = self._request("GET", path, params=params, stream=True)
+        counted = _CountingChunks(response.iter_content(chunk_size=chunk_size))
+        decode_start = time.monotonic()
+        try:
+            if save_to is None:
+                yield from iter_json_items(counted, item_path)
+            else:
+                with RawPayloadWriter(save_to) as writer:
+                    chunks = writer.tee(counted)
+                    try:
+                        yield from iter_json_items(chunks, item_path)
+                    finally:
+                        for _ in chunks:  # Save the rest of the body
+                            pass
+        except ValueError as e:
+            # Same exception family as response.json() in the _api_* helpers
+            raise requests.exceptions.InvalidJSONError(
+                f"Invalid JSON in {path} response: {e}", response=response
+            ) from e
+        finally:
+            response.close()
+            self.metrics.record_bytes("GET", path, counted.bytes, self._wire_bytes(response))
+            self.metrics.record_decode("GET", path, time.monotonic() - decode_start)
+
+    def api_save(
+        self,
+        path: str,
+        filepath: str,
+        params: Optional[dict] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> str:
+        """
+        Streams a GET response body straight to disk, without decoding it.
+        Use payloads.pretty_print() or payloads.derive_data_file() to post-process it offline.
+
+        Args:
+            path (str): The API endpoint path.
+            filepath (str): destination file (folders are created if needed).
+            params (dict, optional): Dictionary of query parameters. Defaults to None.
+            chunk_size (int): bytes read from the socket at a time.
+
+        Returns:
+            str: the file path.
+
+        Raises:
+            requests.exceptions.RequestException: If the API call fails or authentication fails.
+        """
+        response = self._request("GET", path, params=params, stream=True)
+        saved = 0
+        try:
+            with RawPayloadWriter(filepath) as writer:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    writer.write(chunk)
+                saved = writer.bytes
+        finally:
+            response.close()
+            self.metrics.record_bytes("GET", path, saved, self._wire_bytes(response))
+        return filepath
+
     def _api_get(self, path: str, params: Optional[dict] = None):
         """
         Helper method to make a GET request to the SD-WAN Manager API.
@@ -200,22 +1104,23 @@ class Manager:
             path (str): The API endpoint path (e.g., "/v1/config-group/").
             params (dict, optional): Dictionary of query parameters. Defaults to None.
 
+        Identical GETs issued concurrently (e.g. from worker threads) share one request,
+        each caller decodes its own copy of the payload.
+
         Returns:
             dict: The JSON response from the API.
 
         Raises:
             requests.exceptions.RequestException: If the API call fails or manager is not authenticated.
         """
-        if not self.status:
-            raise requests.exceptions.RequestException(
-                "Manager not authenticated. Cannot make API call."
+        if self.single_flight is None:
+            response = self._request("GET", path, params=params)
+        else:
+            key = (path, repr(sorted(params.items())) if params else None)
+            response = self.single_flight.do(
+                key, lambda: self._request("GET", path, params=params), path
             )
-
-        url = cast(str, self.dataservice_base_url) + path
-        logger.info(f"Making GET request to: {url} with params: {params}")
-        response = self.session.get(url=url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return self._decode_json(response, "GET", path)
 
     def _api_post(self, path: str, payload: Optional[dict] = None):
         """
@@ -232,17 +1137,8 @@ class Manager:
         Raises:
             requests.exceptions.RequestException: If the API call fails or manager is not authenticated.
         """
-        if not self.status:
-            raise requests.exceptions.RequestException(
-                "Manager not authenticated. Cannot make API call."
-            )
-
-        url = cast(str, self.dataservice_base_url) + path
-        logger.info(f"Making POST request to: {url} with payload: {payload}")
-        response = self.session.post(url=url, json=payload)
-        response.raise_for_status()
-
-        return response.json()
+        response = self._request("POST", path, payload=payload)
+        return self._decode_json(response, "POST", path)
 
     def _api_put(self, path: str, payload: Optional[dict] = None):
         """
@@ -259,17 +1155,8 @@ class Manager:
         Raises:
             requests.exceptions.RequestException: If the API call fails or manager is not authenticated.
         """
-        if not self.status:
-            raise requests.exceptions.RequestException(
-                "Manager not authenticated. Cannot make API call."
-            )
-
-        url = cast(str, self.dataservice_base_url) + path
-        logger.info(f"Making PUT request to: {url} with payload: {payload}")
-        response = self.session.put(url=url, json=payload)
-        response.raise_for_status()
-
-        return response.json()
+        response = self._request("PUT", path, payload=payload)
+        return self._decode_json(response, "PUT", path)
 
     def _api_delete(self, path: str, params: Optional[dict] = None):
         """
@@ -286,21 +1173,13 @@ class Manager:
         Raises:
             requests.exceptions.RequestException: If the API call fails or manager is not authenticated.
         """
-        if not self.status:
-            raise requests.exceptions.RequestException(
-                "Manager not authenticated. Cannot make API call."
-            )
-
-        url = cast(str, self.dataservice_base_url) + path
-        response = self.session.delete(url=url, params=params)
-        logger.info(f"Making DELETE request to: {url} with params: {params}")
-        response.raise_for_status()
+        response = self._request("DELETE", path, params=params)
 
         # DELETE requests often return 204 No Content, so response.json() might fail.
         # Check if there's content before trying to parse JSON.
         if response.content:
             try:
-                return response.json()
+                return self._decode_json(response, "DELETE", path)
             except json.JSONDecodeError:
                 logger.warning(f"DELETE response content is not JSON: {response.text}")
                 return {"message": "Operation successful, no JSON response content."}
@@ -308,6 +1187,155 @@ class Manager:
             return {"message": "Operation successful, no content returned."}
 
 
+# ----------------------------------------------------------
+class AsyncManager:
+    """
+    Asyncio twin of Manager for issuing many API calls concurrently.
+
+    Authentication is delegated to the wrapped Manager (same strategy, login on the
+    first API call), and every awaitable api_* call shares that single session.
+    The blocking requests calls run in a bounded thread pool, so at most
+    `max_concurrency` requests are in flight at any time.
+
+    Example:
+        async with AsyncManager(host, port, user, password, max_concurrency=50) as amanager:
+            results = await asyncio.gather(*(amanager.api_get(p) for p in paths))
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        user,
+        password,
+        validate_certs=False,
+        timeout=10,
+        max_concurrency=20,
+        manager: Optional[Manager] = None,
+        **manager_options,
+    ):
+        """
+        Initialize AsyncManager object. No request is sent here: the wrapped Manager
+        logs in on the first API call.
+        Args:
+            host (str): hostname or IP address of SD-WAN Manager
+            user (str): username for authentication
+            password (str): password for authentication
+            port (int): default HTTPS port 443
+            validate_certs (bool): turn certificate validation on or off.
+            timeout (int): how long Requests will wait for a response from the server, default 10 seconds
+            max_concurrency (int): maximum number of API calls in flight at once, default 20
+            manager (Manager, optional): reuse an existing Manager and its session instead of
+                creating one. The caller keeps ownership: close() does not close it.
+            **manager_options: extra Manager options (session_cache, retry_policy, rate_limiter, ...)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        # A Manager passed in stays owned by the caller, close() only closes the one created here
+        self._owns_manager = manager is None
+        # Size the connection pool so every worker thread can keep its connection alive
+        self.manager = manager or Manager(
+            host,
+            port,
+            user,
+            password,
+            validate_certs=validate_certs,
+            timeout=timeout,
+            pool_maxsize=max_concurrency,
+            pool_block=True,
+            **manager_options,
+        )
+        if self.manager.adapter._pool_maxsize < max_concurrency:
+            logger.warning(
+                f"Connection pool size ({self.manager.adapter._pool_maxsize}) is smaller than "
+                f"max_concurrency ({max_concurrency}), extra connections will be discarded."
+            )
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="sdwan-api"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @classmethod
+    def from_manager(cls, manager: Manager, max_concurrency=20):
+        """
+        Build an AsyncManager on top of an existing, authenticated Manager.
+        The caller still owns `manager` and closes it when done.
+        """
+        return cls(
+            manager.host,
+            manager.port,
+            manager.user,
+            manager.password,
+            max_concurrency=max_concurrency,
+            manager=manager,
+        )
+
+    async def _run(self, func, *args):
+        """
+        Runs a blocking Manager call in the thread pool, bounded by the concurrency limit.
+        """
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def api_get(self, path: str, params: Optional[dict] = None):
+        """
+        Awaitable GET request, see Manager._api_get.
+        """
+        return await self._run(self.manager._api_get, path, params)
+
+    async def api_post(self, path: str, payload: Optional[dict] = None):
+        """
+        Awaitable POST request, see Manager._api_post.
+        """
+        return await self._run(self.manager._api_post, path, payload)
+
+    async def api_put(self, path: str, payload: Optional[dict] = None):
+        """
+        Awaitable PUT request, see Manager._api_put.
+        """
+        return await self._run(self.manager._api_put, path, payload)
+
+    async def api_delete(self, path: str, params: Optional[dict] = None):
+        """
+        Awaitable DELETE request, see Manager._api_delete.
+        """
+        return await self._run(self.manager._api_delete, path, params)
+
+    async def api_get_many(self, paths, params: Optional[dict] = None):
+        """
+        Fetches several API paths concurrently.
+
+        Args:
+            paths (list): API endpoint paths to GET.
+            params (dict, optional): query parameters applied to every request.
+
+        Returns:
+            list: one entry per path, in the same order. Failed calls return the
+            raised exception instead of a payload.
+        """
+        return await asyncio.gather(
+            *(self.api_get(path, params) for path in paths), return_exceptions=True
+        )
+
+    def close(self):
+        """
+        Shuts down the worker threads, then closes the wrapped Manager (session,
+        connection pool, JWT refresh thread) if this AsyncManager created it.
+        """
+        self._executor.shutdown(wait=True)
+        if self._owns_manager:
+            self.manager.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
 # ----------------------------------------------------------
 def get_manager_credentials_from_env():
     """
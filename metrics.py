@@ -0,0 +1,340 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# API call metrics
+#
+# Description:
+#   Per-endpoint request count, error count, latency percentiles,
+#   response size (decoded and on the wire, i.e. compression savings)
+#   and JSON decode time recorded by Manager.
+#   Endpoints are normalized into templates (IDs, UUIDs and IPs collapsed)
+#   so that /v1/config-group/<uuid>/device/associate is counted once.
+#   Exported as a Python dict, JSON or Prometheus text format.
+#
+# =========================================================================
+
+import atexit
+import json
+import logging
+import random
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import tabulate
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per endpoint (reservoir sampling beyond this)
+MAX_SAMPLES = 5000
+
+_ID_PATTERNS = [
+    re.compile(
+        r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+    ),  # UUID
+    re.compile(r"^\d{1,3}(\.\d{1,3}){3}$"),  # IPv4 (system-ip, device IP)
+    re.compile(r"^[0-9a-fA-F:]+:[0-9a-fA-F:]*$"),  # IPv6
+    re.compile(r"^\d+$"),  # numeric ID
+    re.compile(r"^[0-9a-fA-F]{16,}$"),  # long hex ID
+    re.compile(r"^[A-Z0-9]+-[A-Za-z0-9_-]{8,}$"),  # chassis / serial numbers
+]
+
+
+# ----------------------------------------------------------
+def normalize_endpoint(path: str) -> str:
+    """
+    Turns an API path into an endpoint template by collapsing IDs and dropping the query string.
+
+    Example:
+        /v1/config-group/6a1c.../device/variables?x=1 -> /v1/config-group/{id}/device/variables
+    """
+    path = path.split("?", 1)[0]
+    segments = []
+    for segment in path.split("/"):
+        if segment and any(pattern.match(segment) for pattern in _ID_PATTERNS):
+            segments.append("{id}")
+        else:
+            segments.append(segment)
+    return "/".join(segments) or "/"
+
+
+# ----------------------------------------------------------
+class EndpointMetrics:
+    """
+    Counters and latency samples for one (method, endpoint template).
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.response_bytes = 0
+        self.wire_bytes = 0  # Bytes received before gzip/deflate decoding
+        self.latency_sum = 0.0
+        self.decode_seconds = 0.0
+        self.samples: List[float] = []
+
+    def add_latency(self, seconds: float):
+        self.latency_sum += seconds
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(seconds)
+        else:
+            index = random.randrange(self.requests)
+            if index < MAX_SAMPLES:
+                self.samples[index] = seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "response_bytes": self.response_bytes,
+            "wire_bytes": self.wire_bytes,
+            "compression_saved_bytes": max(0, self.response_bytes - self.wire_bytes),
+            "latency_seconds": {
+                "sum": round(self.latency_sum, 6),
+                "p50": self.percentile(0.50),
+                "p95": self.percentile(0.95),
+                "p99": self.percentile(0.99),
+            },
+            "json_decode_seconds": round(self.decode_seconds, 6),
+        }
+
+
+# ----------------------------------------------------------
+class MetricsRegistry:
+    """
+    Thread-safe collection of EndpointMetrics, keyed by (method, endpoint template).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+
+    def _get(self, method: str, path: str) -> EndpointMetrics:
+        key = (method, normalize_endpoint(path))
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints[key] = EndpointMetrics()
+        return endpoint
+
+    def record_request(
+        self,
+        method: str,
+        path: str,
+        seconds: float,
+        response_bytes: int = 0,
+        error: bool = False,
+        wire_bytes: Optional[int] = None,
+    ):
+        """
+        Records one HTTP attempt (a retried call records one entry per attempt).
+        wire_bytes is the compressed size, when it differs from response_bytes.
+        """
+        with self._lock:
+            endpoint = self._get(method, path)
+            endpoint.requests += 1
+            endpoint.response_bytes += response_bytes
+            endpoint.wire_bytes += response_bytes if wire_bytes is None else wire_bytes
+            endpoint.add_latency(seconds)
+            if error:
+                endpoint.errors += 1
+
+    def record_retry(self, method: str, path: str):
+        with self._lock:
+            self._get(method, path).retries += 1
+
+    def record_bytes(
+        self, method: str, path: str, response_bytes: int, wire_bytes: Optional[int] = None
+    ):
+        """
+        Adds the size of a streamed body, read after the request was recorded.
+        """
+        with self._lock:
+            endpoint = self._get(method, path)
+            endpoint.response_bytes += response_bytes
+            endpoint.wire_bytes += response_bytes if wire_bytes is None else wire_bytes
+
+    def record_decode(self, method: str, path: str, seconds: float):
+        with self._lock:
+            self._get(method, path).decode_seconds += seconds
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Returns {"METHOD /endpoint/template": {...}} sorted by total latency.
+        """
+        with self._lock:
+            items = [
+                (f"{method} {endpoint}", metrics.to_dict())
+                for (method, endpoint), metrics in self._endpoints.items()
+            ]
+        items.sort(key=lambda item: item[1]["latency_seconds"]["sum"], reverse=True)
+        return dict(items)
+
+    def to_json(self, extra: Optional[dict] = None) -> str:
+        data = {"endpoints": self.summary()}
+        if extra:
+            data.update(extra)
+        return json.dumps(data, indent=4)
+
+    def to_prometheus(self, extra: Optional[Dict[str, dict]] = None) -> str:
+        """
+        Renders the metrics in Prometheus text exposition format.
+
+        Args:
+            extra (dict, optional): {section: {counter: value}} rendered as
+                sdwan_<section>_<counter> gauges (e.g. connection or retry stats).
+        """
+        lines = []
+        with self._lock:
+            snapshot = list(self._endpoints.items())
+
+        def label(method, endpoint):
+            endpoint = endpoint.replace("\\", "\\\\").replace('"', '\\"')
+            return f'method="{method}",endpoint="{endpoint}"'
+
+        counters = [
+            ("sdwan_api_requests_total", "HTTP requests sent", "requests"),
+            ("sdwan_api_errors_total", "HTTP requests that failed", "errors"),
+            ("sdwan_api_retries_total", "HTTP requests retried", "retries"),
+            ("sdwan_api_response_bytes_total", "Response body bytes", "response_bytes"),
+            ("sdwan_api_wire_bytes_total", "Response body bytes on the wire (compressed)", "wire_bytes"),
+            ("sdwan_api_json_decode_seconds_total", "Time spent decoding JSON", "decode_seconds"),
+        ]
+        for name, help_text, attribute in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (method, endpoint), metrics in snapshot:
+                lines.append(f"{name}{{{label(method, endpoint)}}} {getattr(metrics, attribute)}")
+
+        name = "sdwan_api_request_duration_seconds"
+        lines.append(f"# HELP {name} HTTP request latency")
+        lines.append(f"# TYPE {name} summary")
+        for (method, endpoint), metrics in snapshot:
+            for q in (0.5, 0.95, 0.99):
+                value = metrics.percentile(q)
+                if value is not None:
+                    lines.append(
+                        f'{name}{{{label(method, endpoint)},quantile="{q}"}} {value}'
+                    )
+            lines.append(f"{name}_sum{{{label(method, endpoint)}}} {metrics.latency_sum}")
+            lines.append(f"{name}_count{{{label(method, endpoint)}}} {metrics.requests}")
+
+        for section, values in (extra or {}).items():
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauge = f"sdwan_{section}_{key}"
+                    lines.append(f"# TYPE {gauge} gauge")
+                    lines.append(f"{gauge} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def print_summary(self, extra: Optional[Dict[str, dict]] = None):
+        """
+        Prints a per-endpoint table, slowest endpoints first.
+        """
+        headers = [
+            "Endpoint",
+            "Requests",
+            "Errors",
+            "Retries",
+            "p50 (ms)",
+            "p95 (ms)",
+            "p99 (ms)",
+            "Bytes",
+            "Wire bytes",
+            "Saved",
+            "JSON decode (ms)",
+        ]
+
+        def ms(value):
+            return round(value * 1000, 1) if value is not None else "N/A"
+
+        def saved(data):
+            if not data["response_bytes"]:
+                return "N/A"
+            return f"{100 * data['compression_saved_bytes'] / data['response_bytes']:.0f}%"
+
+        table = []
+        for endpoint, data in self.summary().items():
+            latency = data["latency_seconds"]
+            table.append(
+                [
+                    endpoint,
+                    data["requests"],
+                    data["errors"],
+                    data["retries"],
+                    ms(latency["p50"]),
+                    ms(latency["p95"]),
+                    ms(latency["p99"]),
+                    data["response_bytes"],
+                    data["wire_bytes"],
+                    saved(data),
+                    ms(data["json_decode_seconds"]),
+                ]
+            )
+
+        print("\n--- API Metrics ---")
+        if table:
+            print(tabulate.tabulate(table, headers, tablefmt="simple"))
+        else:
+            print("No API calls recorded.")
+        for section, values in (extra or {}).items():
+            print(f"\n{section}: {values}")
+
+
+# ----------------------------------------------------------
+def dump_metrics_at_exit(manager, path: str, fmt: str = "json"):
+    """
+    Writes the Manager metrics to `path` when the process exits.
+
+    Args:
+        manager (Manager): the Manager whose metrics are dumped.
+        path (str): output file.
+        fmt (str): "json" or "prometheus".
+    """
+
+    def _dump():
+        try:
+            if fmt == "prometheus":
+                content = manager.metrics.to_prometheus(manager.metrics_extra())
+            else:
+                content = manager.metrics.to_json(manager.metrics_extra())
+            with open(path, "w") as f:
+                f.write(content)
+        except Exception as e:
+            logger.error(f"Failed to write metrics to {path}: {e}")
+
+    atexit.register(_dump)
+
+
+# ----------------------------------------------------------
+def enable_cli_metrics(ctx, manager, show: bool = False, path: Optional[str] = None):
+    """
+    Wires the --metrics / --metrics-file options of the click CLIs.
+
+    Args:
+        ctx (click.Context): context of the CLI group.
+        manager (Manager): the Manager used by the commands.
+        show (bool): print the metrics summary once the command completes.
+        path (str, optional): file written at exit, Prometheus text format
+            when it ends with .prom, JSON otherwise.
+    """
+    if show:
+        ctx.call_on_close(manager.print_metrics)
+    if path:
+        fmt = "prometheus" if path.endswith(".prom") else "json"
+        dump_metrics_at_exit(manager, path, fmt)
@@ -0,0 +1,1170 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Local mock SD-WAN Manager with synthetic fleets
+#
+# Description:
+#   HTTPS server implementing the endpoints used by this project, serving a
+#   synthetic, deterministic fleet generated from a few parameters (devices,
+#   config groups, feature profiles, variables per device), for scale tests
+#   of config_groups.py, device.py and approute.py without a real manager.
+#
+#   Authentication:  /j_security_check, /dataservice/client/token,
+#                    /jwt/login, /jwt/refresh, /dataservice/client/about
+#   Devices:         /system/device/vedges, /system/device/controllers
+#   Config groups:   /v1/config-group/, .../device/associate, .../device/variables
+#   Feature profiles /v1/feature-profile/sdwan|sd-routing/[<type>/<id>]
+#   Statistics:      /statistics/approute/aggregation, /statistics/approute/fields,
+#                    /device/app-route/statistics, /device/dpi/application-mapping
+#   Users:           /admin/user (GET, POST, DELETE)
+#
+#   Per-endpoint fault injection (PATTERN is a regular expression searched
+#   in the path, without the /dataservice prefix): latency (fixed or drawn
+#   from a distribution), HTTP errors and dropped connections, plus forced
+#   session expiry every N API calls. See fault_injection.py for scenarios.
+#
+#   Example:
+#     python mock_manager.py serve --devices 50000 --groups 200 --latency "config-group=0.05"
+#     export manager_host=127.0.0.1 manager_port=8443 manager_username=admin manager_password=admin
+#     python config_groups_test.py
+#
+# =========================================================================
+
+import base64
+import gzip
+import json
+import logging
+import math
+import os
+import random
+import re
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+import json_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VERSION = "20.18.1"
+
+# First release serving /jwt/login, older versions answer it with the login page
+JWT_MIN_VERSION = (20, 18)
+
+PROFILE_TYPES = ["system", "transport", "service", "cli"]
+
+DEVICE_MODELS = ["vedge-C8000V", "vedge-C8300-1N1S-6T", "vedge-ISR-1100-4G", "vedge-C8500L-8S4X"]
+
+LOGIN_PAGE = b"<html><head><title>Cisco vManage</title></head><body>login</body></html>"
+
+# Fixed reference time, so that generated payloads are identical between runs
+EPOCH_MS = 1_735_689_600_000  # 2025-01-01T00:00:00Z
+
+
+# -----------------------------------------------------------------------------
+def _uuid(kind: str, index: int) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"sdwan-mock/{kind}/{index}"))
+
+
+# -----------------------------------------------------------------------------
+def _version_supports_jwt(version: str) -> bool:
+    parts = re.findall(r"\d+", version or "")[:2]
+    return tuple(int(part) for part in parts) >= JWT_MIN_VERSION
+
+
+# -----------------------------------------------------------------------------
+def _system_ip(index: int) -> str:
+    index += 1
+    return f"10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+
+
+# -----------------------------------------------------------------------------
+class SyntheticFleet:
+    """
+    Deterministic synthetic overlay: devices, config groups, feature profiles and users.
+    Records are generated from their index, nothing random, so two fleets built
+    with the same parameters serve byte-identical payloads.
+    """
+
+    def __init__(
+        self,
+        devices: int = 100,
+        groups: int = 10,
+        sdwan_profiles: int = 20,
+        sdrouting_profiles: int = 8,
+        variables_per_device: int = 10,
+        parcels_per_profile: int = 5,
+        devices_per_site: int = 2,
+        users: int = 5,
+        applications: int = 200,
+    ):
+        """
+        Args:
+            devices (int): number of WAN edges.
+            groups (int): number of config groups, devices are spread evenly across them.
+            sdwan_profiles (int): SD-WAN feature profiles (system/transport/service/cli).
+            sdrouting_profiles (int): SD-Routing feature profiles.
+            variables_per_device (int): deployment variables per device, besides
+                host_name, system_ip and site_id.
+            parcels_per_profile (int): parcels returned by a profile with details=true.
+            devices_per_site (int): WAN edges sharing a site-id.
+            users (int): local users returned by /admin/user.
+            applications (int): entries of /device/dpi/application-mapping.
+        """
+        self.devices = devices
+        self.groups = groups
+        self.sdwan_profiles = sdwan_profiles
+        self.sdrouting_profiles = sdrouting_profiles
+        self.variables_per_device = variables_per_device
+        self.parcels_per_profile = parcels_per_profile
+        self.devices_per_site = max(1, devices_per_site)
+        self.applications = applications
+        self.users: Dict[str, dict] = {
+            name: {"userName": name, "description": "", "group": groups_}
+            for name, groups_ in [("admin", ["netadmin"])]
+            + [(f"user{i:03d}", ["operator"]) for i in range(users)]
+        }
+        self._group_ids = {_uuid("config-group", g): g for g in range(groups)}
+        self._profile_ids = {
+            "sdwan": {_uuid("sdwan-profile", p): p for p in range(sdwan_profiles)},
+            "sd-routing": {_uuid("sd-routing-profile", p): p for p in range(sdrouting_profiles)},
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "devices": self.devices,
+            "groups": self.groups,
+            "sdwan_profiles": self.sdwan_profiles,
+            "sdrouting_profiles": self.sdrouting_profiles,
+            "variables_per_device": self.variables_per_device,
+            "parcels_per_profile": self.parcels_per_profile,
+        }
+
+    # ----- devices -----
+
+    def device(self, index: int) -> dict:
+        """
+        /system/device/vedges record.
+        """
+        return {
+            "uuid": f"C8K-{_uuid('device', index)}",
+            "deviceModel": DEVICE_MODELS[index % len(DEVICE_MODELS)],
+            "deviceType": "vedge",
+            "vedgeCertificateState": "certinstalled",
+            "host-name": f"edge-{index:06d}",
+            "configuredSystemIP": _system_ip(index),
+            "deviceIP": _system_ip(index),
+            "system-ip": _system_ip(index),
+            "siteId": str(self.site_id(index)),
+            "version": "17.15.1",
+            "reachability": "reachable",
+            "configStatusMessage": "In Sync",
+            "vmanageConnectionState": "connected",
+            "personality": "vedge",
+            "validity": "valid",
+        }
+
+    def site_id(self, index: int) -> int:
+        return index // self.devices_per_site + 1
+
+    def device_index(self, system_ip: str) -> Optional[int]:
+        try:
+            a, b, c, d = (int(x) for x in system_ip.split("."))
+        except ValueError:
+            return None
+        index = (b << 16) + (c << 8) + d - 1
+        return index if a == 10 and 0 <= index < self.devices else None
+
+    def group_devices(self, group: int) -> range:
+        return range(group, self.devices, self.groups)
+
+    def associated_device(self, index: int, group: int) -> dict:
+        """
+        /v1/config-group/{id}/device/associate record.
+        """
+        device = self.device(index)
+        return {
+            "id": device["uuid"],
+            "host-name": device["host-name"],
+            "site-id": device["siteId"],
+            "site-name": f"site-{device['siteId']}",
+            "deviceIP": device["deviceIP"],
+            "deviceModel": device["deviceModel"],
+            "tags": [{"id": _uuid("tag", group), "tag": f"cg-{group:04d}"}],
+            "device-lock": "No",
+            "addedByRule": False,
+            "configStatusMessage": "In Sync",
+            "configGroupLastUpdatedOn": EPOCH_MS + group * 1000,
+            "unsupportedFeatures": [],
+            "hierarchyNamePath": f"Global/site-{device['siteId']}",
+            "hierarchyTypePath": "global/site",
+            "groupTopologyLabel": "",
+            "configGroupUpToDate": "true",
+            "isDeployable": True,
+            "licenseStatus": "N/A",
+        }
+
+    def device_variables(self, index: int) -> dict:
+        device = self.device(index)
+        variables = [
+            {"name": "host_name", "value": device["host-name"]},
+            {"name": "system_ip", "value": device["system-ip"]},
+            {"name": "site_id", "value": int(device["siteId"])},
+        ]
+        variables.extend(
+            {"name": f"var_{k:03d}", "value": f"value-{index}-{k}"}
+            for k in range(self.variables_per_device)
+        )
+        return {"device-id": device["uuid"], "variables": variables}
+
+    # ----- config groups -----
+
+    def group_index(self, group_id: str) -> Optional[int]:
+        return self._group_ids.get(group_id)
+
+    def config_group(self, group: int) -> dict:
+        members = len(self.group_devices(group))
+        profiles = []
+        for profile_type_index, profile_type in enumerate(PROFILE_TYPES):
+            index = self._profile_of_type("sdwan", profile_type_index, group)
+            if index is not None:
+                summary = self.profile_summary("sdwan", index)
+                profiles.append(
+                    {
+                        "id": summary["profileId"],
+                        "name": summary["profileName"],
+                        "solution": "sdwan",
+                        "type": profile_type,
+                        "description": summary["description"],
+                        "lastUpdatedBy": "admin",
+                        "lastUpdatedOn": summary["lastUpdatedOn"],
+                        "createdBy": "admin",
+                        "createdOn": summary["createdOn"],
+                        "profileParcelCount": self.parcels_per_profile,
+                        "origin": "user",
+                    }
+                )
+        return {
+            "id": _uuid("config-group", group),
+            "name": f"cg-{group:04d}",
+            "description": f"Synthetic config group {group}",
+            "solution": "sdwan",
+            "source": "user",
+            "profiles": profiles,
+            "numberOfDevices": members,
+            "numberOfDevicesUpToDate": members,
+            "version": 1,
+            "state": "DEPLOYED",
+            "origin": "user",
+            "copyInfo": None,
+            "originInfo": {},
+            "topology": None,
+            "fullConfigCli": False,
+            "iosConfigCli": False,
+            "versionIncrementReason": None,
+            "createdBy": "admin",
+            "createdOn": EPOCH_MS,
+            "lastUpdatedBy": "admin",
+            "lastUpdatedOn": EPOCH_MS + group * 1000,
+        }
+
+    # ----- feature profiles -----
+
+    def _profile_of_type(self, solution: str, type_index: int, group: int) -> Optional[int]:
+        total = self.sdwan_profiles if solution == "sdwan" else self.sdrouting_profiles
+        per_type = len(range(type_index, total, len(PROFILE_TYPES)))
+        if per_type == 0:
+            return None
+        return type_index + (group % per_type) * len(PROFILE_TYPES)
+
+    def profile_ids(self, solution: str) -> Dict[str, int]:
+        return self._profile_ids[solution]
+
+    def profile_summary(self, solution: str, index: int) -> dict:
+        prefix = "sdwan" if solution == "sdwan" else "sdr"
+        profile_type = PROFILE_TYPES[index % len(PROFILE_TYPES)]
+        return {
+            "profileId": _uuid(f"{solution}-profile", index),
+            "profileName": f"{prefix}-{profile_type}-{index:04d}",
+            "solution": solution,
+            "profileType": profile_type,
+            "description": f"Synthetic {profile_type} profile {index}",
+            "createdBy": "admin",
+            "createdOn": EPOCH_MS,
+            "lastUpdatedBy": "admin",
+            "lastUpdatedOn": EPOCH_MS + index * 1000,
+            "profileParcelCount": self.parcels_per_profile,
+            "origin": "user",
+        }
+
+    def profile_detail(self, solution: str, index: int) -> dict:
+        detail = self.profile_summary(solution, index)
+        detail["associatedProfileParcels"] = [
+            {
+                "parcelId": _uuid(f"{solution}-parcel", index * 1000 + p),
+                "parcelType": f"parcel-{p}",
+                "createdBy": "admin",
+                "lastUpdatedBy": "admin",
+                "lastUpdatedOn": detail["lastUpdatedOn"],
+                "payload": {
+                    "name": f"parcel-{index}-{p}",
+                    "description": "",
+                    "data": {
+                        f"option_{o}": {"optionType": "global", "value": f"{index}-{p}-{o}"}
+                        for o in range(10)
+                    },
+                },
+                "subparcels": [],
+            }
+            for p in range(self.parcels_per_profile)
+        ]
+        return detail
+
+    # ----- statistics -----
+
+    def application(self, index: int) -> dict:
+        return {
+            "name": f"app-{index:05d}",
+            "family": f"family-{index % 20:02d}",
+            "appId": str(index),
+            "longName": f"Synthetic application {index}",
+        }
+
+    def approute_aggregation(self, rows: int = 8) -> List[dict]:
+        return [
+            {
+                "name": f"10.0.0.1:biz-internet-10.0.0.2:biz-internet-{i}",
+                "vqoe_score": 9.5 - i * 0.1,
+                "latency": 10 + i,
+                "loss_percentage": round(i * 0.05, 2),
+                "jitter": 1 + i % 3,
+                "count": 60,
+            }
+            for i in range(rows)
+        ]
+
+    def approute_statistics(self, rows: int = 8) -> List[dict]:
+        return [
+            {
+                "vdevice-host-name": "edge-000000",
+                "remote-system-ip": _system_ip(1),
+                "index": i,
+                "mean-latency": 10 + i,
+                "mean-jitter": 1 + i % 3,
+                "mean-loss": 0,
+                "average-latency": 10 + i,
+                "average-jitter": 1 + i % 3,
+                "loss": 0,
+            }
+            for i in range(rows)
+        ]
+
+
+# -----------------------------------------------------------------------------
+class LatencyDistribution:
+    """
+    Response delay model, in seconds:
+      "0.2"                   fixed 200 ms
+      "uniform:0.05:0.5"      between 50 and 500 ms
+      "exponential:0.1"       mean 100 ms
+      "lognormal:0.05:1.0"    median 50 ms, sigma 1.0 (heavy tail, p99 ~ 10x the median)
+    Samples are capped at `cap` seconds.
+    """
+
+    PARAMETERS = {"fixed": 1, "uniform": 2, "exponential": 1, "lognormal": 2}
+
+    def __init__(self, kind: str = "fixed", *params: float, cap: float = 60.0):
+        if kind not in self.PARAMETERS:
+            raise ValueError(f"Unknown latency distribution '{kind}'")
+        if len(params) != self.PARAMETERS[kind]:
+            raise ValueError(f"{kind} latency takes {self.PARAMETERS[kind]} parameter(s)")
+        self.kind = kind
+        self.params = params
+        self.cap = cap
+
+    @classmethod
+    def parse(cls, text: str) -> "LatencyDistribution":
+        kind, *params = text.split(":")
+        if not params:
+            return cls("fixed", float(kind))
+        return cls(kind, *(float(p) for p in params))
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            value = self.params[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(*self.params)
+        elif self.kind == "exponential":
+            value = rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        else:
+            median, sigma = self.params
+            value = rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        return min(max(value, 0.0), self.cap)
+
+    def is_zero(self) -> bool:
+        return self.kind == "fixed" and self.params[0] <= 0
+
+    def __str__(self):
+        return ":".join([self.kind, *(f"{p:g}" for p in self.params)])
+
+
+# -----------------------------------------------------------------------------
+class EndpointFault:
+    """
+    Latency, errors and/or dropped connections injected on the paths matching `pattern`.
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        latency: Union[float, LatencyDistribution] = 0.0,
+        error_rate: float = 0.0,
+        status: int = 500,
+        drop_rate: float = 0.0,
+    ):
+        """
+        Args:
+            pattern (str): regular expression searched in the request path.
+            latency (float or LatencyDistribution): seconds added before answering.
+            error_rate (float): probability (0-1) of answering with `status` instead.
+            status (int): HTTP status of injected errors.
+            drop_rate (float): probability (0-1) of closing the connection without answering.
+        """
+        self.pattern = pattern
+        self.regex = re.compile(pattern)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.status = status
+        self.drop_rate = drop_rate
+
+    @property
+    def latency(self) -> LatencyDistribution:
+        return self._latency
+
+    @latency.setter
+    def latency(self, value: Union[float, LatencyDistribution]):
+        if not isinstance(value, LatencyDistribution):
+            value = LatencyDistribution("fixed", float(value))
+        self._latency = value
+
+    def matches(self, path: str) -> bool:
+        return self.regex.search(path) is not None
+
+    def __str__(self):
+        return (
+            f"{self.pattern}: latency {self.latency}, error rate {self.error_rate} "
+            f"({self.status}), drop rate {self.drop_rate}"
+        )
+
+    @staticmethod
+    def parse(setting: str) -> Tuple[str, str]:
+        """
+        "PATTERN=VALUE" -> (PATTERN, VALUE), "VALUE" alone applies to every path.
+        """
+        pattern, sep, value = setting.rpartition("=")
+        if not sep:
+            pattern = ".*"
+        return pattern or ".*", value
+
+
+# -----------------------------------------------------------------------------
+class MockManager:
+    """
+    Request handling of the mock SD-WAN Manager: authentication, routing and fault injection.
+    Independent of the HTTP server, see MockManagerServer.
+    """
+
+    def __init__(
+        self,
+        fleet: SyntheticFleet,
+        user: str = "admin",
+        password: str = "admin",
+        version: str = DEFAULT_VERSION,
+        faults: Optional[List[EndpointFault]] = None,
+        token_duration: int = 1800,
+        seed: Optional[int] = None,
+        expire_every: int = 0,
+        tenants: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            fleet (SyntheticFleet): the data served.
+            user, password (str): accepted credentials.
+            version (str): version reported by /client/about. Below 20.18, /jwt/login
+                and /jwt/refresh are not served: like an older manager, they answer
+                with the HTML login page (status 200).
+            faults (list, optional): EndpointFault rules, the first matching rule applies.
+            token_duration (int): default JWT access token lifetime in seconds.
+            seed (int, optional): seed of the fault injection, for reproducible runs.
+            expire_every (int): invalidate every session and access token each time
+                this many API calls were served (0: never), to exercise re-login.
+            tenants (list, optional): tenant names of a multi-tenant manager, selected
+                with POST /tenant/{tenantId}/vsessionid. API calls are counted per
+                tenant in tenant_calls ("provider" without VSessionId).
+        """
+        self.fleet = fleet
+        self.user = user
+        self.password = password
+        self.version = version
+        self.jwt_enabled = _version_supports_jwt(version)
+        self.faults = faults or []
+        self.token_duration = token_duration
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, str] = {}  # JSESSIONID -> CSRF token
+        self._tokens: Dict[str, float] = {}  # JWT access token -> expiry (epoch seconds)
+        self._refresh_tokens: Dict[str, str] = {}  # refresh token -> user
+        self._cache: Dict[str, bytes] = {}  # Encoded bodies of the large, static payloads
+        self.request_counts: Dict[str, int] = {}
+        self.injected_errors = 0
+        self.dropped_connections = 0
+        self.expirations = 0
+        self.expire_every = expire_every
+        self._api_calls = 0
+        self.tenants = {_uuid("tenant", i): name for i, name in enumerate(tenants or [])}
+        self._vsessions: Dict[str, str] = {}  # VSessionId -> tenant id, dropped on expiry
+        self.tenant_calls: Dict[str, int] = {}
+        self._routes: List[Tuple[str, "re.Pattern[str]", Callable]] = [
+            ("GET", re.compile(r"^/client/about$"), self._about),
+            ("GET", re.compile(r"^/system/device/(vedges|controllers)$"), self._devices),
+            ("GET", re.compile(r"^/v1/config-group/?$"), self._config_groups),
+            ("GET", re.compile(r"^/v1/config-group/([^/]+)/device/associate$"), self._associate),
+            ("GET", re.compile(r"^/v1/config-group/([^/]+)/device/variables$"), self._variables),
+            ("GET", re.compile(r"^/v1/feature-profile/(sdwan|sd-routing)/?$"), self._profiles),
+            (
+                "GET",
+                re.compile(r"^/v1/feature-profile/(sdwan|sd-routing)/([a-z-]+)/([^/]+)$"),
+                self._profile,
+            ),
+            ("POST", re.compile(r"^/statistics/approute/aggregation$"), self._approute_aggregation),
+            ("GET", re.compile(r"^/statistics/approute/fields$"), self._approute_fields),
+            ("GET", re.compile(r"^/device/app-route/statistics$"), self._approute_statistics),
+            ("GET", re.compile(r"^/device/dpi/application-mapping$"), self._applications),
+            ("GET", re.compile(r"^/device/dpi/qosmos-static/applications$"), self._applications),
+            ("GET", re.compile(r"^/tenant$"), self._list_tenants),
+            ("POST", re.compile(r"^/tenant/([^/]+)/vsessionid$"), self._vsessionid),
+            ("GET", re.compile(r"^/admin/user$"), self._list_users),
+            ("POST", re.compile(r"^/admin/user$"), self._create_user),
+            ("DELETE", re.compile(r"^/admin/user/([^/]+)$"), self._delete_user),
+        ]
+
+    # ----- authentication -----
+
+    def _new_jwt(self, duration: int) -> Tuple[str, str]:
+        csrf = uuid.uuid4().hex
+        exp = int(time.time() + duration)
+
+        def encode(value: dict) -> str:
+            raw = json.dumps(value, separators=(",", ":")).encode()
+            return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+        token = ".".join(
+            [
+                encode({"alg": "none", "typ": "JWT"}),
+                encode({"sub": self.user, "exp": exp, "csrf": csrf, "jti": uuid.uuid4().hex}),
+                "mock",
+            ]
+        )
+        with self._lock:
+            self._tokens[token] = exp
+        return token, csrf
+
+    def expire_sessions(self):
+        """
+        Invalidates every session and access token (refresh tokens stay valid),
+        as a manager restart or an idle timeout would.
+        """
+        with self._lock:
+            self._sessions.clear()
+            self._tokens.clear()
+            self._vsessions.clear()
+
+    def is_authenticated(self, headers) -> bool:
+        authorization = headers.get("Authorization") or ""
+        with self._lock:
+            if authorization.startswith("Bearer "):
+                exp = self._tokens.get(authorization[len("Bearer ") :])
+                return exp is not None and exp > time.time()
+            cookies = headers.get("Cookie") or ""
+            for cookie in cookies.split(";"):
+                name, _, value = cookie.strip().partition("=")
+                if name == "JSESSIONID" and value in self._sessions:
+                    return True
+        return False
+
+    def _login(self, body: bytes):
+        fields = parse_qs(body.decode(errors="replace"))
+        username = fields.get("j_username", [""])[0]
+        password = fields.get("j_password", [""])[0]
+        if username != self.user or password != self.password:
+            return 200, "text/html", LOGIN_PAGE, {}
+        jsessionid = uuid.uuid4().hex
+        with self._lock:
+            self._sessions[jsessionid] = uuid.uuid4().hex
+        return 200, "text/html", b"", {"Set-Cookie": f"JSESSIONID={jsessionid}; Path=/; HttpOnly"}
+
+    def _client_token(self, headers):
+        cookies = headers.get("Cookie") or ""
+        for cookie in cookies.split(";"):
+            name, _, value = cookie.strip().partition("=")
+            with self._lock:
+                if name == "JSESSIONID" and value in self._sessions:
+                    return 200, "text/plain", self._sessions[value].encode(), {}
+        return 200, "text/html", LOGIN_PAGE, {}
+
+    def _jwt_login(self, body: bytes):
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "Invalid JSON"}})
+        if payload.get("username") != self.user or payload.get("password") != self.password:
+            return self._json(401, {"error": {"message": "Invalid credentials"}})
+        duration = int(payload.get("duration") or self.token_duration)
+        token, csrf = self._new_jwt(duration)
+        refresh = uuid.uuid4().hex
+        with self._lock:
+            self._refresh_tokens[refresh] = self.user
+        return self._json(200, {"token": token, "csrf": csrf, "refresh": refresh, "duration": duration})
+
+    def _jwt_refresh(self, body: bytes):
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "Invalid JSON"}})
+        with self._lock:
+            known = payload.get("refresh") in self._refresh_tokens
+        if not known:
+            return self._json(401, {"error": {"message": "Invalid refresh token"}})
+        duration = int(payload.get("duration") or self.token_duration)
+        token, csrf = self._new_jwt(duration)
+        return self._json(200, {"token": token, "csrf": csrf, "duration": duration})
+
+    # ----- dispatch -----
+
+    @staticmethod
+    def _json(status: int, payload: Any):
+        return status, "application/json", json_backend.dumps(payload, compact=True).encode(), {}
+
+    def _cached(self, key: str, build: Callable[[], Any]):
+        """
+        Encodes a static payload once; fleet-wide lists are expensive to rebuild.
+        """
+        body = self._cache.get(key)
+        if body is None:
+            body = json_backend.dumps(build(), compact=True).encode()
+            self._cache[key] = body
+        return 200, "application/json", body, {}
+
+    def _count(self, name: str):
+        with self._lock:
+            self.request_counts[name] = self.request_counts.get(name, 0) + 1
+
+    def fault_for(self, path: str) -> Optional[EndpointFault]:
+        for fault in self.faults:
+            if fault.matches(path):
+                return fault
+        return None
+
+    def _draw_fault(self, fault: Optional[EndpointFault]) -> Tuple[float, Optional[str]]:
+        """
+        Returns the delay to apply and the injected outcome ("drop", "error" or None).
+        """
+        if fault is None:
+            return 0.0, None
+        with self._lock:
+            delay = 0.0 if fault.latency.is_zero() else fault.latency.sample(self._random)
+            draw = self._random.random()
+            if draw < fault.drop_rate:
+                self.dropped_connections += 1
+                return delay, "drop"
+            if draw < fault.drop_rate + fault.error_rate:
+                self.injected_errors += 1
+                return delay, "error"
+        return delay, None
+
+    def _count_api_call(self):
+        """
+        Forced session expiry: every `expire_every` API calls, all sessions are dropped.
+        """
+        if not self.expire_every:
+            return
+        with self._lock:
+            self._api_calls += 1
+            expire = self._api_calls % self.expire_every == 0
+        if expire:
+            self.expire_sessions()
+            with self._lock:
+                self.expirations += 1
+
+    def handle(self, method: str, raw_path: str, headers, body: bytes):
+        """
+        Returns (status, content type, body, extra headers) for one request,
+        or None when the connection must be dropped without answering.
+        """
+        url = urlsplit(raw_path)
+        path = url.path
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        api_path = path[len("/dataservice") :] if path.startswith("/dataservice/") else path
+        fault = self.fault_for(api_path)
+        delay, outcome = self._draw_fault(fault)
+        if delay > 0:
+            time.sleep(delay)
+
+        self._count(f"{method} {path}")
+        if outcome == "drop":
+            return None
+        if outcome == "error" and fault is not None:
+            return self._json(fault.status, {"error": {"message": "Injected error"}})
+
+        if method == "POST" and path == "/j_security_check":
+            return self._login(body)
+        if path in ("/jwt/login", "/jwt/refresh") and not self.jwt_enabled:
+            return 200, "text/html", LOGIN_PAGE, {}  # Endpoint unknown before 20.18
+        if method == "POST" and path == "/jwt/login":
+            return self._jwt_login(body)
+        if method == "POST" and path == "/jwt/refresh":
+            return self._jwt_refresh(body)
+        if method == "GET" and path == "/dataservice/client/token":
+            return self._client_token(headers)
+
+        if not path.startswith("/dataservice/"):
+            return self._json(404, {"error": {"message": f"Unknown path {path}"}})
+        self._count_api_call()
+        if not self.is_authenticated(headers):
+            if (headers.get("Authorization") or "").startswith("Bearer "):
+                return self._json(401, {"error": {"message": "Invalid or expired token"}})
+            return 200, "text/html", LOGIN_PAGE, {}
+
+        vsessionid = headers.get("VSessionId")
+        with self._lock:
+            tenant_id = self._vsessions.get(vsessionid) if vsessionid else "provider"
+            if tenant_id is not None:
+                self.tenant_calls[tenant_id] = self.tenant_calls.get(tenant_id, 0) + 1
+        if tenant_id is None:
+            return self._json(403, {"error": {"message": "Invalid or expired VSessionId"}})
+
+        for route_method, regex, handler in self._routes:
+            match = regex.match(api_path)
+            if match and route_method == method:
+                return handler(*match.groups(), query=query, body=body)
+        return self._json(404, {"error": {"message": f"Unknown API {method} {api_path}"}})
+
+    # ----- endpoints -----
+
+    def _about(self, query, body):
+        return self._json(
+            200,
+            {
+                "data": {
+                    "version": self.version,
+                    "applicationVersion": f"{self.version}-mock",
+                    "applicationServer": "vmanage-mock",
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+                    "timeZone": "UTC",
+                }
+            },
+        )
+
+    def _devices(self, device_type, query, body):
+        fleet = self.fleet
+        if device_type == "controllers":
+            return self._json(200, {"header": {}, "data": []})
+        system_ip = query.get("deviceIP")
+        if system_ip:
+            index = fleet.device_index(system_ip)
+            data = [fleet.device(index)] if index is not None else []
+            return self._json(200, {"header": {}, "data": data})
+        return self._cached(
+            "vedges",
+            lambda: {"header": {}, "data": [fleet.device(i) for i in range(fleet.devices)]},
+        )
+
+    def _config_groups(self, query, body):
+        fleet = self.fleet
+        return self._cached(
+            "config-groups", lambda: [fleet.config_group(g) for g in range(fleet.groups)]
+        )
+
+    def _associate(self, group_id, query, body):
+        group = self.fleet.group_index(group_id)
+        if group is None:
+            return self._json(404, {"error": {"message": f"Config group {group_id} not found"}})
+        devices = [self.fleet.associated_device(i, group) for i in self.fleet.group_devices(group)]
+        return self._json(200, {"devices": devices})
+
+    def _variables(self, group_id, query, body):
+        group = self.fleet.group_index(group_id)
+        if group is None:
+            return self._json(404, {"error": {"message": f"Config group {group_id} not found"}})
+        devices = [self.fleet.device_variables(i) for i in self.fleet.group_devices(group)]
+        return self._json(200, {"family": "sdwan", "devices": devices, "groups": []})
+
+    def _profiles(self, solution, query, body):
+        fleet = self.fleet
+        return self._cached(
+            f"profiles-{solution}",
+            lambda: [fleet.profile_summary(solution, i) for i in fleet.profile_ids(solution).values()],
+        )
+
+    def _profile(self, solution, profile_type, profile_id, query, body):
+        index = self.fleet.profile_ids(solution).get(profile_id)
+        if index is None or PROFILE_TYPES[index % len(PROFILE_TYPES)] != profile_type:
+            return self._json(404, {"error": {"message": f"Profile {profile_id} not found"}})
+        if query.get("details") == "true":
+            return self._json(200, self.fleet.profile_detail(solution, index))
+        return self._json(200, self.fleet.profile_summary(solution, index))
+
+    def _list_tenants(self, query, body):
+        tenants = [
+            {"tenantId": tenant_id, "name": name, "orgName": f"{name}-org"}
+            for tenant_id, name in self.tenants.items()
+        ]
+        return self._json(200, tenants)
+
+    def _vsessionid(self, tenant_id, query, body):
+        if tenant_id not in self.tenants:
+            return self._json(404, {"error": {"message": f"Tenant {tenant_id} not found"}})
+        vsessionid = uuid.uuid4().hex
+        with self._lock:
+            self._vsessions[vsessionid] = tenant_id
+        return self._json(200, {"VSessionId": vsessionid})
+
+    def _approute_aggregation(self, query, body):
+        return self._json(200, {"header": {}, "data": self.fleet.approute_aggregation()})
+
+    def _approute_fields(self, query, body):
+        fields = ["entry_time", "local_system_ip", "remote_system_ip", "latency", "jitter", "loss_percentage"]
+        return self._json(200, [{"property": f, "dataType": "string"} for f in fields])
+
+    def _approute_statistics(self, query, body):
+        return self._json(200, {"header": {}, "data": self.fleet.approute_statistics()})
+
+    def _applications(self, query, body):
+        fleet = self.fleet
+        return self._cached(
+            "applications",
+            lambda: {"header": {}, "data": [fleet.application(i) for i in range(fleet.applications)]},
+        )
+
+    def _list_users(self, query, body):
+        with self._lock:
+            users = list(self.fleet.users.values())
+        return self._json(200, {"header": {}, "data": users})
+
+    def _create_user(self, query, body):
+        try:
+            user = json.loads(body or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "Invalid JSON"}})
+        name = user.get("userName")
+        if not name:
+            return self._json(400, {"error": {"message": "userName is required"}})
+        with self._lock:
+            if name in self.fleet.users:
+                return self._json(400, {"error": {"message": f"User {name} already exists"}})
+            self.fleet.users[name] = {
+                "userName": name,
+                "description": user.get("description", ""),
+                "group": user.get("group", []),
+            }
+        return self._json(200, {"userName": name})
+
+    def _delete_user(self, name, query, body):
+        with self._lock:
+            removed = self.fleet.users.pop(name, None)
+        if removed is None:
+            return self._json(404, {"error": {"message": f"User {name} not found"}})
+        return self._json(200, {})
+
+
+# -----------------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like SD-WAN Manager
+    # Headers and body leave in one segment, otherwise Nagle + delayed ACK add ~40 ms per call
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        response = self.server.mock.handle(method, self.path, self.headers, body)
+        if response is None:
+            self.close_connection = True  # Dropped: no response at all
+            return
+        status, content_type, payload, extra_headers = response
+
+        if (
+            self.server.gzip
+            and len(payload) > 1024
+            and "gzip" in (self.headers.get("Accept-Encoding") or "")
+        ):
+            payload = gzip.compress(payload, compresslevel=1)
+            extra_headers = dict(extra_headers, **{"Content-Encoding": "gzip"})
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if method != "HEAD":
+            self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+# -----------------------------------------------------------------------------
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+    mock: MockManager
+    gzip: bool
+
+
+# -----------------------------------------------------------------------------
+def self_signed_certificate(directory: str) -> Tuple[str, str]:
+    """
+    Creates a throw-away self-signed certificate with the openssl command.
+
+    Returns:
+        tuple: (certificate file, key file)
+    """
+    if shutil.which("openssl") is None:
+        raise RuntimeError("openssl not found, pass --cert and --key")
+    cert = os.path.join(directory, "mock_manager.crt")
+    key = os.path.join(directory, "mock_manager.key")
+    command = [
+        "openssl",
+        "req",
+        "-x509",
+        "-newkey",
+        "rsa:2048",
+        "-nodes",
+        "-keyout",
+        key,
+        "-out",
+        cert,
+        "-days",
+        "7",
+        "-subj",
+        "/CN=localhost",
+    ]
+    subprocess.run(command, check=True, capture_output=True)
+    return cert, key
+
+
+# -----------------------------------------------------------------------------
+class MockManagerServer:
+    """
+    Runs a MockManager over HTTPS in a background thread.
+
+    Example:
+        with MockManagerServer(MockManager(SyntheticFleet(devices=10000))) as server:
+            manager = Manager("127.0.0.1", server.port, "admin", "admin")
+    """
+
+    def __init__(
+        self,
+        mock: MockManager,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        cert: Optional[str] = None,
+        key: Optional[str] = None,
+        gzip: bool = True,
+    ):
+        """
+        Args:
+            mock (MockManager): request handling and data.
+            host (str): listening address.
+            port (int): listening port, 0 picks a free port (see self.port).
+            cert, key (str, optional): TLS certificate and key, self-signed if omitted.
+            gzip (bool): gzip large responses when the client accepts it.
+        """
+        self.mock = mock
+        self._tmpdir = None
+        if cert is None or key is None:
+            self._tmpdir = tempfile.mkdtemp(prefix="mock_manager_")
+            cert, key = self_signed_certificate(self._tmpdir)
+
+        self.httpd = _Server((host, port), _Handler)
+        self.httpd.mock = mock
+        self.httpd.gzip = gzip
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+        self.host = host
+        self.port = self.httpd.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "MockManagerServer":
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="mock-manager", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+# -----------------------------------------------------------------------------
+def build_faults(latency, error_rate, error_status, drop_rate=()) -> List[EndpointFault]:
+    """
+    Builds the fault rules from the --latency / --error-rate / --drop-rate CLI options
+    ("PATTERN=VALUE", or "VALUE" for every path).
+    """
+    rules: Dict[str, EndpointFault] = {}
+
+    def rule(pattern):
+        return rules.setdefault(pattern, EndpointFault(pattern, status=error_status))
+
+    for setting in latency:
+        pattern, value = EndpointFault.parse(setting)
+        rule(pattern).latency = LatencyDistribution.parse(value)
+    for setting in error_rate:
+        pattern, value = EndpointFault.parse(setting)
+        rule(pattern).error_rate = float(value)
+    for setting in drop_rate:
+        pattern, value = EndpointFault.parse(setting)
+        rule(pattern).drop_rate = float(value)
+    # Specific patterns first, the catch-all last
+    return sorted(rules.values(), key=lambda rule: rule.pattern == ".*")
+
+
+# -----------------------------------------------------------------------------
+@click.group()
+def cli():
+    """Local mock SD-WAN Manager."""
+    pass
+
+
+# -----------------------------------------------------------------------------
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8443, show_default=True)
+@click.option("--devices", default=100, show_default=True, help="WAN edges in the fleet.")
+@click.option("--groups", default=10, show_default=True, help="Config groups.")
+@click.option("--sdwan-profiles", default=20, show_default=True)
+@click.option("--sdrouting-profiles", default=8, show_default=True)
+@click.option("--variables", default=10, show_default=True, help="Variables per device.")
+@click.option("--parcels", default=5, show_default=True, help="Parcels per feature profile.")
+@click.option("--user", default="admin", show_default=True)
+@click.option("--password", default="admin", show_default=True)
+@click.option("--version", default=DEFAULT_VERSION, show_default=True, help="Reported version.")
+@click.option(
+    "--latency",
+    multiple=True,
+    help="PATTERN=SECONDS or PATTERN=DISTRIBUTION, e.g. 'config-group=lognormal:0.05:1'.",
+)
+@click.option("--error-rate", multiple=True, help="PATTERN=RATE, e.g. 'device/variables=0.05'.")
+@click.option("--error-status", default=500, show_default=True, help="Status of injected errors.")
+@click.option("--drop-rate", multiple=True, help="PATTERN=RATE of connections closed unanswered.")
+@click.option("--expire-every", default=0, show_default=True, help="Expire sessions every N API calls.")
+@click.option("--seed", type=int, help="Seed of the fault injection.")
+@click.option("--cert", type=click.Path(exists=True, dir_okay=False))
+@click.option("--key", type=click.Path(exists=True, dir_okay=False))
+@click.option("--no-gzip", is_flag=True, help="Never compress responses.")
+def serve(
+    host,
+    port,
+    devices,
+    groups,
+    sdwan_profiles,
+    sdrouting_profiles,
+    variables,
+    parcels,
+    user,
+    password,
+    version,
+    latency,
+    error_rate,
+    error_status,
+    drop_rate,
+    expire_every,
+    seed,
+    cert,
+    key,
+    no_gzip,
+):
+    """
+    Serve a synthetic fleet until interrupted.
+    """
+    fleet = SyntheticFleet(
+        devices=devices,
+        groups=groups,
+        sdwan_profiles=sdwan_profiles,
+        sdrouting_profiles=sdrouting_profiles,
+        variables_per_device=variables,
+        parcels_per_profile=parcels,
+    )
+    mock = MockManager(
+        fleet,
+        user=user,
+        password=password,
+        version=version,
+        faults=build_faults(latency, error_rate, error_status, drop_rate),
+        seed=seed,
+        expire_every=expire_every,
+    )
+    server = MockManagerServer(mock, host, port, cert, key, gzip=not no_gzip)
+    click.echo(f"Mock SD-WAN Manager on https://{host}:{server.port} ({fleet.to_dict()})")
+    for fault in mock.faults:
+        click.echo(f"  {fault}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        counts = sorted(mock.request_counts.items(), key=lambda item: -item[1])
+        click.echo(
+            f"\n{sum(mock.request_counts.values())} requests, {mock.injected_errors} injected errors, "
+            f"{mock.dropped_connections} dropped connections, {mock.expirations} session expirations"
+        )
+        for endpoint, count in counts[:20]:
+            click.echo(f"  {count:8d}  {endpoint}")
+
+
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(levelname)s (%(asctime)s): %(message)s"
+    )
+    cli.add_command(serve)
+    cli()
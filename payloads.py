@@ -0,0 +1,340 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Raw payload files
+#
+# Description:
+#   Write API response bodies to disk exactly as received (no decode and
+#   re-encode pass), and post-process them offline when needed:
+#     - pretty-print a saved payload
+#     - derive the "data-only" file from a saved payload
+#   Saved payloads can be compressed (.json.gz or .json.xz), the helpers
+#   below read either form transparently.
+#
+#   Environment variable:
+#     sdwan_payload_compression=gzip   (or xz) compress every saved payload
+#
+#   Example:
+#     python payloads.py pretty output/payloads/devices/devices_all.json
+#     python payloads.py derive output/payloads/devices/devices_all.json
+#     python payloads.py compress --format xz output/payloads
+#
+# =========================================================================
+
+import gzip
+import lzma
+import os
+import sys
+from typing import IO, Any, Iterable, Iterator, Optional
+
+import click
+
+import json_backend
+from json_stream import iter_json_items
+
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "xz": ".xz"}
+
+
+# -----------------------------------------------------------------------------
+def compression_from_env() -> Optional[str]:
+    """
+    Returns the compression selected with sdwan_payload_compression (None, "gzip" or "xz").
+    Read on every call, so the variable can be changed after import.
+
+    Raises:
+        ValueError: if the value is not a known compression.
+    """
+    setting = os.environ.get("sdwan_payload_compression", "").lower()
+    if setting in ("", "0", "none", "off", "false"):
+        return None
+    if setting in ("gz", "gzip", "1", "on", "true"):
+        return "gzip"
+    if setting in ("xz", "lzma"):
+        return "xz"
+    raise ValueError(f"Invalid sdwan_payload_compression value: {setting}, expected gzip or xz")
+
+
+# -----------------------------------------------------------------------------
+def check_compression_from_env():
+    """
+    Validates sdwan_payload_compression for the command line scripts:
+    prints the error and exits instead of failing on the first saved payload.
+    """
+    try:
+        compression_from_env()
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+
+# -----------------------------------------------------------------------------
+def compressed_path(filepath: str, compression: Optional[str] = None) -> str:
+    """
+    Appends the .gz/.xz suffix of `compression` (default: sdwan_payload_compression).
+    Pass compression="none" to force an uncompressed file.
+
+    Raises:
+        ValueError: if the compression (or sdwan_payload_compression) is unknown.
+    """
+    compression = compression or compression_from_env()
+    if compression in (None, "none"):
+        return filepath
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression '{compression}', expected gzip or xz")
+    return filepath + COMPRESSION_SUFFIXES[compression]
+
+
+# -----------------------------------------------------------------------------
+def open_payload(filepath: str, mode: str = "r") -> IO:
+    """
+    Opens a payload file, compressed or not depending on its extension (.gz, .xz).
+    Text modes use UTF-8.
+    """
+    encoding = None if "b" in mode else "utf-8"
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    if filepath.endswith(".gz"):
+        return gzip.open(filepath, mode, compresslevel=6, encoding=encoding)
+    if filepath.endswith(".xz"):
+        return lzma.open(filepath, mode, encoding=encoding)
+    return open(filepath, mode.replace("t", ""), encoding=encoding)
+
+
+# -----------------------------------------------------------------------------
+def find_payload(filepath: str) -> str:
+    """
+    Returns `filepath` if it exists, otherwise its .gz or .xz variant.
+
+    Raises:
+        FileNotFoundError: if no form of the payload exists.
+    """
+    for candidate in (filepath, filepath + ".gz", filepath + ".xz"):
+        if os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError(filepath)
+
+
+# -----------------------------------------------------------------------------
+def load_payload(filepath: str) -> Any:
+    """
+    Loads a saved payload, whether it was written as .json, .json.gz or .json.xz.
+    "devices_all.json" also finds "devices_all.json.gz".
+    """
+    with open_payload(find_payload(filepath), "rb") as f:
+        return json_backend.loads(f.read())
+
+
+# -----------------------------------------------------------------------------
+def _read_chunks(filepath: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    with open_payload(find_payload(filepath), "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+# -----------------------------------------------------------------------------
+class RawPayloadWriter:
+    """
+    Writes raw response chunks to `filepath` while they are being consumed.
+    The file is written under a temporary name and renamed once complete,
+    so a partially downloaded payload never replaces a good one.
+    Chunks are compressed on the fly when `filepath` ends with .gz or .xz.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.tmp_path = f"{filepath}.part"
+        self.bytes = 0
+        self._file = None
+
+    def __enter__(self):
+        directory = os.path.dirname(self.filepath)
+        if directory and not os.path.exists(directory):
+            print(f"Creating folder {directory}")
+            os.makedirs(directory, exist_ok=True)
+        if self.filepath.endswith(".gz"):
+            self._file = gzip.open(self.tmp_path, "wb", compresslevel=6)
+        elif self.filepath.endswith(".xz"):
+            self._file = lzma.open(self.tmp_path, "wb")
+        else:
+            self._file = open(self.tmp_path, "wb")
+        return self
+
+    def tee(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Yields the chunks unchanged after writing them to the file.
+        """
+        for chunk in chunks:
+            self.write(chunk)
+            yield chunk
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self.bytes += len(chunk)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.filepath)
+        else:
+            os.remove(self.tmp_path)
+        return False
+
+
+# -----------------------------------------------------------------------------
+def payload_path(
+    filename: str, directory: str = "./output/payloads/", compression: Optional[str] = None
+) -> str:
+    """
+    Builds the file path used for a saved payload, same naming as save_json
+    (with a .gz/.xz suffix when compression is enabled).
+    """
+    return compressed_path(os.path.join(directory, f"{filename}.json"), compression)
+
+
+# -----------------------------------------------------------------------------
+def pretty_print(filepath: str, output: Optional[str] = None):
+    """
+    Re-writes a saved payload with indentation (in place unless `output` is given).
+    """
+    payload = load_payload(filepath)
+    output = output or filepath
+    with open_payload(output, "w") as f:
+        json_backend.dump(payload, f, compact=False)
+    return output
+
+
+# -----------------------------------------------------------------------------
+def derive_data_file(
+    filepath: str, key: str = "data", output: Optional[str] = None
+) -> str:
+    """
+    Extracts the `key` array of a saved payload into its own file, record by record,
+    without loading the whole payload in memory.
+
+    Args:
+        filepath (str): saved payload, e.g. output/payloads/devices/devices_all.json.
+        key (str): top-level key holding the records (default "data").
+        output (str, optional): target file, defaults to <name>_<key>.json next to the payload.
+
+    Returns:
+        str: path of the derived file.
+    """
+    if output is None:
+        base, compression_ext = filepath, ""
+        for ext in (".gz", ".xz"):
+            if base.endswith(ext):
+                base, compression_ext = base[: -len(ext)], ext
+        base, ext = os.path.splitext(base)
+        if base.endswith("_all"):
+            base = base[: -len("_all")]
+        output = f"{base}_{key}{ext or '.json'}{compression_ext}"
+
+    with open_payload(output, "w") as out:
+        out.write("[")
+        for index, item in enumerate(iter_json_items(_read_chunks(filepath), f"{key}.item")):
+            if index:
+                out.write(",")
+            out.write("\n")
+            out.write(json_backend.dumps(item, compact=True))
+        out.write("\n]\n")
+    return output
+
+
+# -----------------------------------------------------------------------------
+def load_data(filepath: str, key: str = "data") -> Iterator:
+    """
+    Lazily iterates over the `key` records of a saved payload (compressed or not).
+    """
+    yield from iter_json_items(_read_chunks(filepath), f"{key}.item")
+
+
+# -----------------------------------------------------------------------------
+@click.group()
+def cli():
+    """Offline tools for saved API payloads."""
+    pass
+
+
+# -----------------------------------------------------------------------------
+@click.command()
+@click.argument("files", nargs=-1, type=click.Path(exists=True, dir_okay=False))
+def pretty(files):
+    """
+    Pretty-print saved payloads in place.
+    """
+    for filepath in files:
+        pretty_print(filepath)
+        click.echo(f"Pretty-printed {filepath}")
+
+
+# -----------------------------------------------------------------------------
+@click.command()
+@click.argument("files", nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option("--key", default="data", show_default=True, help="Key holding the records.")
+def derive(files, key):
+    """
+    Derive the data-only file (e.g. devices_data.json) from saved payloads.
+    """
+    for filepath in files:
+        output = derive_data_file(filepath, key)
+        click.echo(f"Derived {output} from {filepath}")
+
+
+# -----------------------------------------------------------------------------
+def compress_file(filepath: str, compression: str = "gzip", keep: bool = False) -> str:
+    """
+    Compresses an existing payload file, removing the original unless `keep`.
+    """
+    output = compressed_path(filepath, compression)
+    with open(filepath, "rb") as source, RawPayloadWriter(output) as writer:
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            writer.write(chunk)
+    if not keep:
+        os.remove(filepath)
+    return output
+
+
+# -----------------------------------------------------------------------------
+@click.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option(
+    "--format", "compression", type=click.Choice(["gzip", "xz"]), default="gzip", show_default=True
+)
+@click.option("--keep", is_flag=True, help="Keep the uncompressed files.")
+def compress(paths, compression, keep):
+    """
+    Compress saved .json payloads (files or folders).
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in names if n.endswith(".json"))
+        else:
+            files.append(path)
+
+    before = after = 0
+    for filepath in sorted(files):
+        size = os.path.getsize(filepath)
+        output = compress_file(filepath, compression, keep)
+        before += size
+        after += os.path.getsize(output)
+    if before:
+        click.echo(
+            f"Compressed {len(files)} files: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB "
+            f"({100 * (1 - after / before):.0f}% saved)"
+        )
+
+
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    cli.add_command(pretty)
+    cli.add_command(derive)
+    cli.add_command(compress)
+    cli()
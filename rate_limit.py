@@ -0,0 +1,223 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Client-side rate limiting
+#
+# Description:
+#   Token-bucket rate limiter and max-in-flight budget shared by every
+#   Manager API call. Limits can be tightened per endpoint prefix, e.g.
+#   realtime /device/ calls or /statistics/ queries, so that parallel
+#   collectors stay below SD-WAN Manager API rate limits (HTTP 429).
+#
+# =========================================================================
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second with bursts up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping until it is available.
+        Tokens are reserved under the lock, so waiting callers are served in order.
+
+        Returns:
+            float: seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# ----------------------------------------------------------
+class EndpointLimit:
+    """
+    Rate and concurrency limits applied to API paths starting with `prefix`.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        """
+        Args:
+            prefix (str): API path prefix, relative to /dataservice (e.g. "/statistics/").
+                Use "" for the global limit applied to every call.
+            rate (float, optional): requests per second, None for no rate limit.
+            burst (int, optional): bucket size, defaults to the rate rounded down (at least 1).
+            max_in_flight (int, optional): maximum concurrent requests, None for no limit.
+        """
+        self.prefix = prefix
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.semaphore = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def _record(self, waited: float):
+        with self._lock:
+            self.requests += 1
+            if waited > 0.001:  # Ignore lock/semaphore overhead
+                self.throttled += 1
+                self.wait_seconds += waited
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "max_in_flight": self.max_in_flight,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+# ----------------------------------------------------------
+class RateLimiter:
+    """
+    Combines a global limit with optional tighter limits per endpoint prefix.
+    A call is subject to the global limit and to the longest matching prefix limit.
+
+    Example:
+        limiter = RateLimiter(
+            rate=50,
+            max_in_flight=32,
+            endpoint_limits={
+                "/statistics/": {"rate": 10, "max_in_flight": 8},
+                "/device/": {"rate": 5, "max_in_flight": 4},
+            },
+        )
+        manager = Manager(host, port, user, password, rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        endpoint_limits: Optional[Dict[str, dict]] = None,
+    ):
+        """
+        Args:
+            rate (float, optional): global requests per second.
+            burst (int, optional): global bucket size.
+            max_in_flight (int, optional): global maximum of concurrent requests.
+            endpoint_limits (dict, optional): {prefix: {"rate", "burst", "max_in_flight"}}.
+        """
+        self.global_limit = EndpointLimit("", rate, burst, max_in_flight)
+        self.endpoint_limits: List[EndpointLimit] = []
+        for prefix, options in (endpoint_limits or {}).items():
+            self.add_endpoint_limit(prefix, **options)
+
+    @classmethod
+    def vmanage_defaults(cls):
+        """
+        Conservative starting point for a single SD-WAN Manager node: realtime
+        /device/ calls are relayed to the devices and /statistics/ queries hit
+        the statistics database, so both get a tighter budget than config APIs.
+        Bulk /device/ endpoints answered by the manager itself (DPI application
+        catalogs, app-route statistics) get an empty, more specific entry, so only
+        the global limit applies to them.
+        """
+        return cls(
+            rate=50,
+            max_in_flight=32,
+            endpoint_limits={
+                "/statistics/": {"rate": 10, "max_in_flight": 8},
+                "/device/": {"rate": 5, "max_in_flight": 4},
+                # Not realtime: longer prefixes win over "/device/"
+                "/device/dpi/": {},
+                "/device/app-route/statistics": {},
+            },
+        )
+
+    def add_endpoint_limit(
+        self,
+        prefix: str,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.endpoint_limits.append(EndpointLimit(prefix, rate, burst, max_in_flight))
+        # Longest prefix first, so the most specific limit wins
+        self.endpoint_limits.sort(key=lambda limit: len(limit.prefix), reverse=True)
+
+    def _match(self, path: str) -> Optional[EndpointLimit]:
+        for limit in self.endpoint_limits:
+            if path.startswith(limit.prefix):
+                return limit
+        return None
+
+    @contextmanager
+    def limit(self, path: str):
+        """
+        Context manager wrapping one HTTP request to `path`.
+        Waits for rate tokens and in-flight slots, and releases the slots on exit.
+        """
+        limits = [self.global_limit]
+        endpoint_limit = self._match(path)
+        if endpoint_limit:
+            limits.append(endpoint_limit)
+
+        acquired = []
+        try:
+            # Take concurrency slots most specific first, then rate tokens
+            for limit in reversed(limits):
+                waited = 0.0
+                if limit.semaphore:
+                    start = time.monotonic()
+                    limit.semaphore.acquire()
+                    acquired.append(limit)
+                    waited += time.monotonic() - start
+                if limit.bucket:
+                    waited += limit.bucket.acquire()
+                limit._record(waited)
+                if waited > 0.5:
+                    logger.info(f"Rate limiter delayed {path} by {waited:.2f}s")
+            yield
+        finally:
+            for limit in acquired:
+                limit.semaphore.release()
+
+    def stats(self):
+        """
+        Returns request, throttling and waiting counters per limit.
+        """
+        stats = {"global": self.global_limit.to_dict()}
+        for limit in self.endpoint_limits:
+            stats[limit.prefix] = limit.to_dict()
+        return stats
@@ -0,0 +1,161 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Persisted session cache
+#
+# Description:
+#   Stores JSESSIONID, X-XSRF-TOKEN and /client/about data on disk so that
+#   short-lived CLI invocations can reuse an existing SD-WAN Manager session
+#   instead of logging in again.
+#   Entries are keyed by host/port/user, written with 0600 permissions and
+#   discarded once older than max_age.
+#
+# =========================================================================
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import sys
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "python-sdwan")
+
+# SD-WAN Manager idle session timeout defaults to 30 minutes, stay below it
+DEFAULT_MAX_AGE = 25 * 60
+
+
+# ----------------------------------------------------------
+class SessionCache:
+    """
+    File-based cache of authenticated SD-WAN Manager sessions.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_age: int = DEFAULT_MAX_AGE):
+        """
+        Args:
+            directory (str): folder holding the cache files (created with 0700 permissions).
+            max_age (int): seconds after which a cached session is considered expired.
+        """
+        self.directory = directory
+        self.max_age = max_age
+
+    def _path(self, host, port, user) -> str:
+        key = hashlib.sha256(f"{host}:{port}:{user}".encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"session_{key}.json")
+
+    def _is_private(self, path: str) -> bool:
+        """
+        Rejects cache files readable by other users or owned by someone else.
+        """
+        if os.name == "nt":
+            return True
+        st = os.stat(path)
+        if st.st_uid != os.getuid():
+            return False
+        return not (st.st_mode & (stat.S_IRWXG | stat.S_IRWXO))
+
+    def load(self, host, port, user) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached session entry, or None if missing, expired or unsafe.
+        """
+        path = self._path(host, port, user)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            if not self._is_private(path):
+                logger.warning(
+                    f"Ignoring session cache {path}: file permissions are too open."
+                )
+                return None
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable session cache {path}: {e}")
+            return None
+
+        if entry.get("host") != host or entry.get("port") != port or entry.get("user") != user:
+            return None
+        if not entry.get("jsessionid"):
+            return None
+        if time.time() - entry.get("created", 0) > self.max_age:
+            logger.info(f"Session cache for {user}@{host}:{port} expired.")
+            self.clear(host, port, user)
+            return None
+
+        return entry
+
+    def save(self, host, port, user, jsessionid, token, about=None, created=None):
+        """
+        Writes (or refreshes) the session entry atomically with 0600 permissions.
+        """
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        path = self._path(host, port, user)
+        entry = {
+            "host": host,
+            "port": port,
+            "user": user,
+            "jsessionid": jsessionid,
+            "token": token,
+            "about": about,
+            "created": created or time.time(),
+        }
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write session cache {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self, host, port, user):
+        """
+        Removes the cached session, e.g. after SD-WAN Manager rejected it.
+        """
+        path = self._path(host, port, user)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove session cache {path}: {e}")
+
+
+# ----------------------------------------------------------
+def get_session_cache_from_env() -> Optional[SessionCache]:
+    """
+    Builds a SessionCache when enabled through environment variables.
+
+      manager_session_cache=1            enable with the default folder
+      manager_session_cache=/some/path   enable with a custom folder
+      manager_session_cache_max_age=600  optional max age in seconds
+    """
+    setting = os.environ.get("manager_session_cache")
+    if not setting or setting.lower() in ("0", "false", "no", "off"):
+        return None
+
+    directory = DEFAULT_CACHE_DIR
+    if setting.lower() not in ("1", "true", "yes", "on"):
+        directory = os.path.expanduser(setting)
+
+    max_age = DEFAULT_MAX_AGE
+    max_age_setting = os.environ.get("manager_session_cache_max_age")
+    if max_age_setting:
+        try:
+            max_age = int(max_age_setting)
+        except ValueError:
+            print(f"Invalid manager_session_cache_max_age value: {max_age_setting}")
+            sys.exit(1)
+
+    return SessionCache(directory, max_age)
@@ -0,0 +1,466 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Multi-tenant / multi-overlay session pool
+#
+# Description:
+#   Runs the same collection function against many SD-WAN Manager targets
+#   (separate overlays, or tenants of a multi-tenant manager) in parallel,
+#   with one authenticated Manager per target and a per-target timeout.
+#   Results and errors are aggregated into a single report.
+#
+#   Targets file (JSON):
+#     [
+#       {"name": "overlay-a", "host": "10.0.0.1", "port": 8443,
+#        "username": "admin", "password_env": "OVERLAY_A_PASSWORD"},
+#       {"name": "tenant-1", "host": "10.0.1.1", "port": 8443,
+#        "username": "provider", "password": "...", "tenant": "tenant-1"}
+#     ]
+#
+#   Example:
+#     python session_pool.py check targets.json --workers 10 --timeout 120
+#
+# =========================================================================
+
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+import tabulate
+
+import json_backend
+from auth import get_auth_from_env
+from manager import Manager
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------
+class Target:
+    """
+    One SD-WAN Manager (and optional tenant) to collect from.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        host: str,
+        port=443,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        tenant: Optional[str] = None,
+        validate_certs: bool = False,
+        timeout: int = 30,
+        options: Optional[dict] = None,
+    ):
+        """
+        Args:
+            name (str): label used in the report.
+            host (str): hostname or IP address of SD-WAN Manager
+            port (int): HTTPS port
+            username (str): username for authentication
+            password (str): password for authentication
+            tenant (str, optional): tenant name or ID, selected with a VSessionId
+                after a provider login on a multi-tenant manager.
+            validate_certs (bool): turn certificate validation on or off.
+            timeout (int): HTTP timeout of each API call, in seconds.
+            options (dict, optional): extra Manager options.
+        """
+        self.name = name
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.tenant = tenant
+        self.validate_certs = validate_certs
+        self.timeout = timeout
+        self.options = options or {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Target":
+        """
+        Builds a Target from a targets file entry. The password can be read from
+        the environment variable named by "password_env" instead of being stored in the file.
+        """
+        data = dict(data)
+        password_env = data.pop("password_env", None)
+        if password_env:
+            data["password"] = os.environ.get(password_env)
+            if data["password"] is None:
+                raise ValueError(f"Environment variable {password_env} is not set")
+        for key in ("host", "username", "password"):
+            if not data.get(key):
+                raise ValueError(f"Target {data.get('name', data.get('host'))}: '{key}' is required")
+        data.setdefault("name", f"{data['host']}:{data.get('port', 443)}")
+        known = {"name", "host", "port", "username", "password", "tenant", "validate_certs", "timeout"}
+        options = {key: value for key, value in data.items() if key not in known}
+        return cls(options=options, **{key: value for key, value in data.items() if key in known})
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "host": self.host,
+            "port": self.port,
+            "username": self.username,
+            "password": self.password,
+            "tenant": self.tenant,
+            "validate_certs": self.validate_certs,
+            "timeout": self.timeout,
+            **self.options,
+        }
+
+    def create_manager(self) -> Manager:
+        """
+        Builds the Manager for this target (authentication stays lazy).
+        """
+        options = dict(self.options)
+        options.setdefault("auth", get_auth_from_env())
+        manager = Manager(
+            self.host,
+            self.port,
+            self.username,
+            self.password,
+            validate_certs=self.validate_certs,
+            timeout=self.timeout,
+            **options,
+        )
+        if self.tenant:
+            manager.select_tenant(self.tenant)
+        return manager
+
+
+# ----------------------------------------------------------
+def load_targets(filepath: str) -> List[Target]:
+    """
+    Loads the targets file: a JSON list of targets, or {"targets": [...]}.
+
+    Raises:
+        ValueError: if the file content is invalid.
+    """
+    with open(filepath, "rb") as f:
+        data = json_backend.loads(f.read())
+    if isinstance(data, dict):
+        data = data.get("targets", [])
+    if not isinstance(data, list):
+        raise ValueError(f"{filepath}: expected a list of targets")
+
+    targets = [Target.from_dict(entry) for entry in data]
+    names = [target.name for target in targets]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"{filepath}: duplicate target names {sorted(duplicates)}")
+    return targets
+
+
+# ----------------------------------------------------------
+class TargetResult:
+    """
+    Outcome of the collection function for one target.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ok = False
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.seconds: Optional[float] = None
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "ok": self.ok,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+# ----------------------------------------------------------
+class CollectionReport:
+    """
+    Aggregated results and errors of a SessionPool run, in target order.
+    """
+
+    def __init__(self, results: List[TargetResult], seconds: float):
+        self.results = results
+        self.seconds = seconds
+
+    @property
+    def succeeded(self) -> List[TargetResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[TargetResult]:
+        return [result for result in self.results if not result.ok]
+
+    def to_dict(self):
+        return {
+            "targets": len(self.results),
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "seconds": round(self.seconds, 3),
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def save(self, filepath: str):
+        with open(filepath, "w") as f:
+            json_backend.dump(self.to_dict(), f)
+
+    def print_summary(self):
+        headers = ["Target", "Status", "Time (s)", "Error"]
+        table = [
+            [
+                result.name,
+                "OK" if result.ok else "FAILED",
+                round(result.seconds, 2) if result.seconds is not None else "N/A",
+                result.error or "",
+            ]
+            for result in self.results
+        ]
+        print(tabulate.tabulate(table, headers, tablefmt="fancy_grid"))
+        print(
+            f"{len(self.succeeded)}/{len(self.results)} targets succeeded in {self.seconds:.1f}s"
+        )
+
+
+# Managers built by process pool workers, one per target and process
+_worker_managers: Dict[str, Manager] = {}
+
+
+# ----------------------------------------------------------
+def _collect_in_worker(target_data: dict, collect: Callable, args: tuple):
+    """
+    Process pool entry point: Managers cannot be pickled, each worker builds its own.
+    """
+    target = Target.from_dict(target_data)
+    manager = _worker_managers.get(target.name)
+    if manager is None:
+        manager = _worker_managers[target.name] = target.create_manager()
+    return collect(manager, target, *args)
+
+
+# ----------------------------------------------------------
+class SessionPool:
+    """
+    Keeps one authenticated Manager per target and runs collection functions across all targets.
+
+    Example:
+        def inventory(manager, target):
+            return len(manager._api_get("/system/device/vedges")["data"])
+
+        pool = SessionPool(load_targets("targets.json"), max_workers=10, timeout=120)
+        report = pool.run(inventory)
+        report.print_summary()
+    """
+
+    def __init__(
+        self,
+        targets: List[Target],
+        max_workers: int = 8,
+        timeout: Optional[float] = 300,
+        use_processes: bool = False,
+    ):
+        """
+        Args:
+            targets (list): Target objects.
+            max_workers (int): targets collected in parallel.
+            timeout (float, optional): seconds allowed per target, counted from the
+                moment its collection starts. None for no limit.
+            use_processes (bool): run targets in a process pool (CPU-heavy collection
+                functions). The collection function must then be picklable (module level),
+                and Managers live in the worker processes.
+        """
+        self.targets = targets
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.use_processes = use_processes
+        self._managers: Dict[str, Manager] = {}
+        self._creating: Dict[str, Future] = {}  # Target name -> Manager being created
+        self._lock = threading.Lock()
+
+    def manager(self, target: Target) -> Manager:
+        """
+        Returns the Manager of a target, created on first use and then reused across runs.
+        The lock only reserves the target: logins and tenant selections of different
+        targets run in parallel, concurrent callers for the same target wait for it.
+        """
+        with self._lock:
+            manager = self._managers.get(target.name)
+            if manager is not None:
+                return manager
+            creating = self._creating.get(target.name)
+            if creating is None:
+                creating = self._creating[target.name] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return creating.result()
+
+        try:
+            manager = target.create_manager()
+        except BaseException as e:
+            with self._lock:
+                del self._creating[target.name]  # The next call tries again
+            creating.set_exception(e)
+            raise
+        with self._lock:
+            self._managers[target.name] = manager
+            del self._creating[target.name]
+        creating.set_result(manager)
+        return manager
+
+    def _collect(self, target: Target, collect: Callable, args: tuple, started: dict):
+        started[target.name] = time.monotonic()
+        return collect(self.manager(target), target, *args)
+
+    def run(self, collect: Callable, *args) -> CollectionReport:
+        """
+        Calls collect(manager, target, *args) for every target.
+
+        A target exceeding the timeout is reported as failed. Its thread cannot be
+        interrupted and finishes in the background (each API call is still bounded
+        by the target's HTTP timeout); with use_processes the late result is discarded.
+
+        Returns:
+            CollectionReport: one TargetResult per target, in target order.
+        """
+        start = time.monotonic()
+        results = {target.name: TargetResult(target.name) for target in self.targets}
+        started: Dict[str, float] = {}
+
+        if self.use_processes:
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="sdwan-pool"
+            )
+
+        futures: Dict[Future, Target] = {}
+        for target in self.targets:
+            if self.use_processes:
+                future = executor.submit(_collect_in_worker, target.to_dict(), collect, args)
+            else:
+                future = executor.submit(self._collect, target, collect, args, started)
+            futures[future] = target
+
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future in done:
+                    target = futures[future]
+                    result = results[target.name]
+                    result.seconds = now - started.get(target.name, start)
+                    try:
+                        result.result = future.result()
+                        result.ok = True
+                    except Exception as e:
+                        result.error = f"{type(e).__name__}: {e}"
+                        logger.error(f"Collection failed for {target.name}: {result.error}")
+
+                if self.timeout is None:
+                    continue
+                for future in list(pending):
+                    target = futures[future]
+                    if target.name not in started and future.running():
+                        # Process workers cannot report their start time
+                        started[target.name] = now
+                    begun = started.get(target.name)
+                    if begun is not None and now - begun > self.timeout:
+                        future.cancel()
+                        pending.discard(future)
+                        result = results[target.name]
+                        result.seconds = now - begun
+                        result.error = f"Timeout after {self.timeout}s"
+                        logger.error(f"Collection timed out for {target.name}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return CollectionReport(
+            [results[target.name] for target in self.targets], time.monotonic() - start
+        )
+
+    def close(self):
+        with self._lock:
+            for manager in self._managers.values():
+                manager.close()
+            self._managers.clear()
+
+
+# ----------------------------------------------------------
+def check_target(manager: Manager, target: Target) -> dict:
+    """
+    Collection function used by the "check" command: version and edge device count.
+    """
+    about = manager._api_get("/client/about").get("data") or {}
+    devices = manager._api_get("/system/device/vedges").get("data", [])
+    return {"version": about.get("version"), "devices": len(devices)}
+
+
+# -----------------------------------------------------------------------------
+@click.group()
+def cli():
+    """Run collections across several SD-WAN Manager targets."""
+    pass
+
+
+# -----------------------------------------------------------------------------
+@click.command()
+@click.argument("targets_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--workers", default=8, show_default=True, help="Targets collected in parallel.")
+@click.option("--timeout", default=300.0, show_default=True, help="Seconds allowed per target.")
+@click.option("--processes", is_flag=True, help="Use a process pool instead of threads.")
+@click.option("--report", "report_file", help="Save the report as JSON.")
+def check(targets_file, workers, timeout, processes, report_file):
+    """
+    Check connectivity to every target: version and edge device count.
+    """
+    try:
+        targets = load_targets(targets_file)
+    except (OSError, ValueError) as e:
+        print(f"Invalid targets file: {e}")
+        sys.exit(1)
+
+    pool = SessionPool(targets, max_workers=workers, timeout=timeout, use_processes=processes)
+    report = pool.run(check_target)
+    pool.close()
+
+    headers = ["Target", "Version", "Devices"]
+    table = [
+        [result.name, result.result["version"], result.result["devices"]]
+        for result in report.succeeded
+    ]
+    if table:
+        print(tabulate.tabulate(table, headers, tablefmt="fancy_grid"))
+    report.print_summary()
+    if report_file:
+        report.save(report_file)
+        print(f"Report saved to {report_file}")
+
+
+# -----------------------------------------------------------------------------
+if __name__ == "__main__":
+    logging.basicConfig(
+        filename="sdwan_api.log",
+        filemode="a",
+        format="%(levelname)s (%(asctime)s): %(message)s (Line: %(lineno)d [%(filename)s])",
+        datefmt="%d/%m/%Y %I:%M:%S %p",
+        level=logging.INFO,
+    )
+    cli.add_command(check)
+    cli()
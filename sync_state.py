@@ -0,0 +1,206 @@
+#! /usr/bin/env python3
+# =========================================================================
+# Cisco Catalyst SD-WAN Manager APIs
+# =========================================================================
+#
+# Local state store for incremental config-group / feature-profile sync
+#
+# Description:
+#   Remembers, per config group and feature profile, the summary fields that
+#   change when the item changes (lastUpdatedOn, version, device counts)
+#   together with the detail payloads collected for it. On the next run the
+#   collectors only call the detail endpoints for items whose summary
+#   differs; unchanged items are rebuilt from the store and items missing
+#   from the summary are reported as deleted and dropped.
+#
+#   Device variables edited without a group update are not visible in the
+#   summary; delete the store (or disable it) to force a full collection.
+#
+#   Example:
+#     state = SyncState("~/.cache/python-sdwan/sync/vmanage_443_admin")
+#     table = SDWANProfileTable(manager, sync_state=state)
+#
+#   Environment variables read by the scripts:
+#     sdwan_sync_state=1               enable with the default folder
+#     sdwan_sync_state=/some/path      enable with a custom folder
+#
+# =========================================================================
+
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import json_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "python-sdwan", "sync")
+
+# Summary fields compared between runs, per kind of item
+STAMP_FIELDS = {
+    "config_groups": ("version", "lastUpdatedOn", "state", "numberOfDevices", "numberOfDevicesUpToDate"),
+    "sdwan_profiles": ("lastUpdatedOn", "profileParcelCount"),
+    "sdrouting_profiles": ("lastUpdatedOn", "profileParcelCount"),
+}
+
+
+# ----------------------------------------------------------
+class SyncState:
+    """
+    Last-seen summary stamps and detail payloads of the collected items, kept on disk.
+    """
+
+    def __init__(self, directory: str = DEFAULT_STATE_DIR):
+        """
+        Args:
+            directory (str): folder holding state.json and the cached details (created on save).
+        """
+        self.directory = os.path.expanduser(directory)
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, dict]] = self._load()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _state_path(self) -> str:
+        return os.path.join(self.directory, "state.json")
+
+    def _detail_path(self, kind: str, item_id: str) -> str:
+        safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", str(item_id))
+        return os.path.join(self.directory, kind, f"{safe_id}.json")
+
+    def _load(self) -> Dict[str, Dict[str, dict]]:
+        try:
+            with open(self._state_path(), "rb") as f:
+                return json_backend.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync state {self._state_path()}: {e}")
+            return {}
+
+    def _count(self, kind: str, outcome: str, number: int = 1):
+        counts = self._counts.setdefault(
+            kind, {"unchanged": 0, "changed": 0, "added": 0, "deleted": 0}
+        )
+        counts[outcome] += number
+
+    def stamp(self, kind: str, item: dict) -> dict:
+        """
+        Returns the summary fields of `item` that are compared between runs.
+        """
+        return {field: item.get(field) for field in STAMP_FIELDS[kind]}
+
+    def lookup(self, kind: str, item_id: str, stamp: dict) -> Optional[Any]:
+        """
+        Returns the stored detail of an unchanged item, or None when it must be fetched.
+        """
+        with self._lock:
+            entry = self._state.get(kind, {}).get(item_id)
+            if entry is None:
+                self._count(kind, "added")
+                return None
+            if entry.get("stamp") != stamp:
+                self._count(kind, "changed")
+                return None
+        try:
+            with open(self._detail_path(kind, item_id), "rb") as f:
+                detail = json_backend.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Sync state detail of {kind} {item_id} unreadable, fetching it: {e}")
+            with self._lock:
+                self._count(kind, "changed")
+            return None
+        with self._lock:
+            self._count(kind, "unchanged")
+        return detail
+
+    def store(self, kind: str, item_id: str, name: str, stamp: dict, detail: Any):
+        """
+        Records the detail fetched for an item and the summary stamp it belongs to.
+        """
+        path = self._detail_path(kind, item_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json_backend.dump(detail, f, compact=True)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._state.setdefault(kind, {})[item_id] = {"name": name, "stamp": stamp}
+
+    def prune(self, kind: str, current_ids: Iterable[str]) -> List[dict]:
+        """
+        Drops the items no longer present in the summary.
+
+        Returns:
+            list: [{"id", "name"}, ...] of the deleted items.
+        """
+        current_ids = set(current_ids)
+        with self._lock:
+            entries = self._state.get(kind, {})
+            deleted = [item_id for item_id in entries if item_id not in current_ids]
+            removed = [{"id": item_id, "name": entries.pop(item_id).get("name")} for item_id in deleted]
+            if removed:
+                self._count(kind, "deleted", len(removed))
+        for item in removed:
+            try:
+                os.remove(self._detail_path(kind, item["id"]))
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def save(self):
+        """
+        Writes state.json atomically.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._state_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json_backend.dump(self._state, f, compact=True)
+        os.replace(tmp_path, path)
+
+    def report(self, kind: str) -> Dict[str, int]:
+        """
+        Returns the unchanged/changed/added/deleted counts of this run.
+        """
+        with self._lock:
+            return dict(
+                self._counts.get(kind, {"unchanged": 0, "changed": 0, "added": 0, "deleted": 0})
+            )
+
+    def print_report(self, kind: str, deleted: Optional[List[dict]] = None):
+        counts = self.report(kind)
+        print(
+            f"Incremental sync of {kind}: {counts['changed']} changed, {counts['added']} new, "
+            f"{counts['deleted']} deleted, {counts['unchanged']} unchanged"
+        )
+        for item in deleted or []:
+            print(f"    Deleted: {item['name']} ({item['id']})")
+
+
+# ----------------------------------------------------------
+def get_sync_state_from_env(
+    host: str, port, user: str, tenant: Optional[str] = None
+) -> Optional[SyncState]:
+    """
+    Builds the SyncState of this manager when enabled through sdwan_sync_state.
+
+      sdwan_sync_state=1            enable with the default folder
+      sdwan_sync_state=/some/path   enable with a custom folder
+
+    Each manager (host and port), user and tenant gets its own subfolder, since
+    they do not see the same config groups and feature profiles.
+    """
+    setting = os.environ.get("sdwan_sync_state")
+    if not setting or setting.lower() in ("0", "false", "no", "off"):
+        return None
+
+    directory = DEFAULT_STATE_DIR
+    if setting.lower() not in ("1", "true", "yes", "on"):
+        directory = os.path.expanduser(setting)
+
+    scope = f"{host}_{port}_{user}" + (f"_{tenant}" if tenant else "")
+    scope = re.sub(r"[^A-Za-z0-9_.-]", "_", scope)
+    return SyncState(os.path.join(directory, scope))